@@ -0,0 +1,154 @@
+"""
+Reading hand histories straight out of zip and tar archives, without extracting them to disk.
+
+Members are read in archive order while the archive is being walked, which keeps compressed tar files to a single
+sequential pass. Their content then travels with them, so workers never need to open the archive themselves.
+"""
+import calendar
+import fnmatch
+import tarfile
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Callable, Iterator
+
+ZIP_SUFFIXES = (".zip",)
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+ARCHIVE_SUFFIXES = ZIP_SUFFIXES + TAR_SUFFIXES
+
+
+def archive_suffix(path: Path) -> str | None:
+    name = path.name.lower()
+    # Longest first, so .tar.gz wins over a plain .gz
+    return next((suffix for suffix in sorted(ARCHIVE_SUFFIXES, key=len, reverse=True) if name.endswith(suffix)), None)
+
+
+def is_archive(path: Path) -> bool:
+    return archive_suffix(path) is not None and path.is_file()
+
+
+def archive_stem(path: Path) -> str:
+    """The archive name without its archive suffix, eg. 2025-02-08 for 2025-02-08.tar.gz."""
+    suffix = archive_suffix(path)
+    return path.name[:-len(suffix)] if suffix else path.stem
+
+
+def is_safe_member_name(name: str) -> bool:
+    """
+    False for member names that would land outside the output folder once joined to it: absolute paths,
+    Windows drives and '..' parts, with either kind of slash.
+    """
+    path = PurePosixPath(name.replace("\\", "/"))
+    if not path.parts or path.is_absolute() or ":" in path.parts[0]:
+        return False
+    return ".." not in path.parts
+
+
+@dataclass(frozen=True)
+class MemberStat:
+    """The part of os.stat_result the conversion uses, taken from the archive's member header."""
+    st_size: int
+    st_mtime_ns: int
+
+
+class ArchiveMember:
+    """
+    A file inside an archive that can stand in for a Path during the conversion:
+    it has a name, stem and suffix, stat() and read_bytes(), and relative_to() the data folder.
+
+    The content can only be read while the archive is being walked by iter_archive. Members read before they
+    are sent to a worker process carry their content with them.
+    """
+
+    def __init__(self, archive: Path, name: str, stat: MemberStat, reader: Callable[[], bytes] = None):
+        self.archive = Path(archive)
+        self.member_name = name
+        self.path = PurePosixPath(name)
+        self._stat = stat
+        self._reader = reader
+        self._content = None
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    @property
+    def stem(self) -> str:
+        return self.path.stem
+
+    @property
+    def suffix(self) -> str:
+        return self.path.suffix
+
+    def stat(self) -> MemberStat:
+        return self._stat
+
+    def read_bytes(self) -> bytes:
+        if self._content is None:
+            if self._reader is None:
+                raise ValueError(f"{self} can only be read while its archive is open")
+            self._content = self._reader()
+        return self._content
+
+    def relative_to(self, data_folder: Path) -> PurePosixPath:
+        """The member's path below the data folder, with the archive name as a folder when the archive is inside it."""
+        data_folder = Path(data_folder)
+        if self.archive == data_folder:
+            return self.path
+        return PurePosixPath(self.archive.relative_to(data_folder).as_posix()) / self.path
+
+    def __getstate__(self):
+        # The reader belongs to an open archive in this process; only the content can be sent to a worker
+        state = self.__dict__.copy()
+        state["_reader"] = None
+        return state
+
+    def __str__(self):
+        return f"{self.archive}/{self.member_name}"
+
+    def __repr__(self):
+        return f"ArchiveMember({str(self.archive)!r}, {self.member_name!r})"
+
+
+def iter_archive(archive: Path, pattern: str = "*.html") -> Iterator[ArchiveMember]:
+    """
+    Yields the regular files of a zip or tar archive whose file name matches the pattern, in archive order.
+    A member has to be read before the iteration moves on to the next one, or it is read again from the start
+    of a compressed tar.
+
+    Returns:
+    - An iterator of ArchiveMember objects.
+    """
+    archive = Path(archive)
+    if archive_suffix(archive) in ZIP_SUFFIXES:
+        yield from _iter_zip(archive, pattern)
+    else:
+        yield from _iter_tar(archive, pattern)
+
+
+def _iter_zip(archive: Path, pattern: str) -> Iterator[ArchiveMember]:
+    with zipfile.ZipFile(archive) as zip_file:
+        for info in zip_file.infolist():
+            if info.is_dir() or not fnmatch.fnmatch(PurePosixPath(info.filename).name, pattern):
+                continue
+            if not is_safe_member_name(info.filename):
+                print(f"Skipping '{info.filename}' in '{archive}': the name points outside the archive")
+                continue
+
+            # Zip files store a local time without a timezone, it's only used to notice changes
+            mtime = calendar.timegm(info.date_time + (0, 0, 0))
+            stat = MemberStat(st_size=info.file_size, st_mtime_ns=mtime * 10 ** 9)
+            yield ArchiveMember(archive, info.filename, stat, lambda info=info: zip_file.read(info))
+
+
+def _iter_tar(archive: Path, pattern: str) -> Iterator[ArchiveMember]:
+    with tarfile.open(archive, "r:*") as tar_file:
+        for info in tar_file:
+            if not info.isfile() or not fnmatch.fnmatch(PurePosixPath(info.name).name, pattern):
+                continue
+            if not is_safe_member_name(info.name):
+                print(f"Skipping '{info.name}' in '{archive}': the name points outside the archive")
+                continue
+
+            stat = MemberStat(st_size=info.size, st_mtime_ns=int(info.mtime) * 10 ** 9)
+            yield ArchiveMember(archive, info.name, stat, lambda info=info: tar_file.extractfile(info).read())
@@ -0,0 +1,85 @@
+"""
+Benchmark of input discovery: os.walk with a stat per file, as find_files used to be used, against scan_files.
+
+Usage:
+    python benchmarks/bench_discovery.py [--folders N] [--files N] [--workers N] [--path DIR]
+
+Without --path a temporary tree of empty .html files (plus some other files to filter out) is created.
+A local disk hides most of what parallel scanning gains on a network mount, where each listing is a round-trip.
+"""
+import argparse
+import fnmatch
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from discovery import largest_first, scan_files
+
+
+def walk_and_stat(directory):
+    """The previous discovery, plus the stat the manifest check needed for every file."""
+    files = []
+    for root, _, names in os.walk(directory):
+        for name in fnmatch.filter(names, "*.html"):
+            path = Path(root) / name
+            path.stat()
+            files.append(path)
+    return files
+
+
+def build_tree(directory, folders, files):
+    for folder in range(folders):
+        subfolder = Path(directory) / f"day{folder // 10:03d}" / f"table{folder % 10}"
+        subfolder.mkdir(parents=True)
+        for index in range(files):
+            (subfolder / f"hand{index:05d}_2025-02-08T20-57-51.html").write_bytes(b"x" * (index % 7))
+            if index % 5 == 0:
+                (subfolder / f"hand{index:05d}.png").touch()
+
+
+def time_it(fn, repeat=3):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--folders", type=int, default=200, help="Folders in the generated tree")
+    parser.add_argument("--files", type=int, default=100, help="Hand files per generated folder")
+    parser.add_argument("--workers", type=int, default=4, help="Threads for the parallel scan")
+    parser.add_argument("--path", type=Path, help="Scan this folder instead of a generated tree")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        directory = args.path or Path(temp_dir)
+        if args.path is None:
+            build_tree(directory, args.folders, args.files)
+
+        candidates = [
+            ("os.walk + stat", lambda: walk_and_stat(directory)),
+            ("scan_files", lambda: list(scan_files(directory, archives=False))),
+            (f"scan_files x{args.workers}", lambda: list(scan_files(directory, archives=False, workers=args.workers))),
+            ("+ largest_first", lambda: largest_first(scan_files(directory, archives=False, workers=args.workers))),
+        ]
+
+        counts = set()
+        for name, fn in candidates:
+            elapsed, files = time_it(fn)
+            counts.add(len(files))
+            print(f"{name:>18}: {elapsed * 1000:>8.1f} ms ({len(files)} files)")
+
+        if len(counts) != 1:
+            raise SystemExit("The candidates found different files")
+
+
+if __name__ == "__main__":
+    main()
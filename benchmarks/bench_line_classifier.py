@@ -0,0 +1,142 @@
+"""
+Microbenchmark for individual_history_parser.parse_hand_history in lines per second.
+
+Usage:
+    python benchmarks/bench_line_classifier.py [--repeat N] [--baseline GIT_REV]
+
+With --baseline the module is also loaded from that git revision, checked to produce the same
+entries and timed alongside the working tree version.
+"""
+import argparse
+import locale
+import subprocess
+import sys
+import time
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import individual_history_parser
+from cards import from_korean, from_pokerstars
+from html_parser import StreamingBackend
+
+
+def load_hand_histories():
+    """Returns the raw betting action text of every player in tests/data."""
+    histories = []
+    for file in sorted((ROOT / "tests" / "data").glob("*.html")):
+        for row in StreamingBackend().iter_rows(file.read_text(encoding="utf-8")):
+            histories.extend(player_row[1] for player_row in row.player_rows)
+    return histories
+
+
+def import_side_effect_stubs():
+    """
+    Stand-ins for what older revisions of the parser did on import: set an en_US.UTF-8 locale, which not every
+    host has, and import tkinter for a message box. Parsing uses neither.
+    """
+    stub_locale = types.ModuleType("locale")
+    stub_locale.__dict__.update(vars(locale))
+    stub_locale.setlocale = lambda category, value=None: locale.setlocale(category)
+
+    messagebox = types.ModuleType("tkinter.messagebox")
+    messagebox.showinfo = lambda *args, **kwargs: None
+    tkinter = types.ModuleType("tkinter")
+    tkinter.messagebox = messagebox
+    return {"locale": stub_locale, "tkinter": tkinter, "tkinter.messagebox": messagebox}
+
+
+def load_module_at(revision, name="individual_history_parser", dependencies=("models",)):
+    """Loads a module as it was at a git revision, along with the modules it needs from the same revision."""
+    # The revision's own entry classes and the stubs, swapped in while its module body runs its imports
+    swapped = import_side_effect_stubs()
+    swapped.update({dependency: load_module_at(revision, dependency, ()) for dependency in dependencies})
+    current = {module_name: sys.modules.get(module_name) for module_name in swapped}
+
+    source = subprocess.run(["git", "show", f"{revision}:{name}.py"], cwd=ROOT, check=True,
+                            capture_output=True, text=True, encoding="utf-8").stdout
+    module = types.ModuleType(f"{name}_{revision}")
+    sys.modules.update(swapped)
+    try:
+        exec(compile(source, f"{revision}:{name}.py", "exec"), module.__dict__)
+    finally:
+        for module_name, previous in current.items():
+            if previous is None:
+                sys.modules.pop(module_name, None)
+            else:
+                sys.modules[module_name] = previous
+    return module
+
+
+def normalize_cards(cards):
+    """Cards as the cards module encodes them, whether a revision kept them as integers or as text."""
+    if isinstance(cards, str):
+        # Hole cards joined in PokerStars notation, eg. "Jc 9c"
+        return tuple(from_pokerstars(card) for card in cards.split())
+    return tuple(card if isinstance(card, int) else from_korean(card) for card in cards)
+
+
+def fields_of(entry):
+    # Entries either have __slots__ or keep their fields in __dict__; unset fields count as None
+    names = getattr(entry, "__slots__", None) or vars(entry)
+    values = {name: getattr(entry, name, None) for name in names}
+    fields = {name: value for name, value in values.items() if value is not None}
+    if "hole_cards" in fields:
+        fields["hole_cards"] = normalize_cards(fields["hole_cards"])
+    if "community_cards" in fields:
+        fields["community_cards"] = [normalize_cards(street) for street in fields["community_cards"]]
+    return fields
+
+
+def snapshot(result):
+    entries, win_money = result
+    if win_money is not None:
+        # Older revisions stored the credit after the win as remaining_stack
+        win_money = fields_of(win_money)
+        win_money.setdefault("final_stack", win_money.pop("remaining_stack", None))
+    return [(type(entry).__name__, fields_of(entry)) for entry in entries], win_money
+
+
+def time_parsers(candidates, histories, repeat):
+    """Times the candidates in alternating passes so machine noise hits them equally, keeping the best pass."""
+    best = {name: float("inf") for name, _ in candidates}
+    for _ in range(repeat):
+        for name, parse in candidates:
+            start = time.perf_counter()
+            for history in histories:
+                parse(history)
+            best[name] = min(best[name], time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20, help="Timed passes over the corpus, the best one is reported")
+    parser.add_argument("--baseline", help="Git revision to compare against, eg. HEAD~1")
+    args = parser.parse_args(argv)
+
+    histories = load_hand_histories()
+    lines = sum(len(history.strip().split("\n")) for history in histories)
+    candidates = [("current", individual_history_parser.parse_hand_history)]
+
+    if args.baseline:
+        baseline = load_module_at(args.baseline)
+        for history in histories:
+            if snapshot(baseline.parse_hand_history(history)) != snapshot(individual_history_parser.parse_hand_history(history)):
+                raise SystemExit(f"Parsers disagree on:\n{history}")
+        candidates.insert(0, (args.baseline, baseline.parse_hand_history))
+
+    print(f"{len(histories)} hand histories, {lines} lines")
+    rates = {}
+    for name, elapsed in time_parsers(candidates, histories, args.repeat).items():
+        rates[name] = lines / elapsed
+        print(f"{name:>12}: {rates[name]:>12,.0f} lines/sec")
+
+    if args.baseline:
+        print(f"{'speedup':>12}: {rates['current'] / rates[args.baseline]:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
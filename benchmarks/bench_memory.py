@@ -0,0 +1,63 @@
+"""
+Memory benchmark: how many bytes a parsed PokerHand (with its players and entries) keeps alive.
+
+Usage:
+    python benchmarks/bench_memory.py [--hands N]
+
+The tests/data pages are extracted once, then hands are built from copies of the raw rows
+until N hands are held in memory. Allocations are measured with tracemalloc.
+"""
+import argparse
+import gc
+import sys
+import tracemalloc
+from itertools import cycle, islice
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from html_parser import RawHandRow, StreamingBackend, build_hand
+
+
+def load_rows():
+    rows = []
+    for file in sorted((ROOT / "tests" / "data").glob("*.html")):
+        rows.extend(StreamingBackend().iter_rows(file.read_text(encoding="utf-8")))
+    return rows
+
+
+def copy_row(row: RawHandRow) -> RawHandRow:
+    # Fresh string objects, as if every hand had been read from its own page
+    copy = lambda text: text.encode("utf-8").decode("utf-8")
+    return RawHandRow(
+        cells=[copy(cell) for cell in row.cells],
+        player_rows=[[copy(cell) for cell in player_row] for player_row in row.player_rows]
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hands", type=int, default=5000, help="Number of hands to keep in memory")
+    args = parser.parse_args(argv)
+
+    rows = [copy_row(row) for row in islice(cycle(load_rows()), args.hands)]
+    raw_text = sum(sys.getsizeof(text) for row in rows for text in row.cells + [c for p in row.player_rows for c in p])
+
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    hands = [build_hand(row) for row in rows]
+    gc.collect()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    players = sum(len(hand.players) for hand in hands)
+    print(f"{len(hands)} hands, {players} players")
+    print(f"parsed objects: {(after - before) / len(hands):>10,.0f} bytes/hand")
+    print(f"raw cell text:  {raw_text / len(hands):>10,.0f} bytes/hand (not included above)")
+    print(f"peak while parsing: {(peak - before) / 2 ** 20:,.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Benchmark suite of the conversion stages over the tests/data corpus, with a saved baseline to compare against.
+
+Usage:
+    python benchmarks/bench_suite.py [--repeat N] [--only CASE ...] [--tolerance [CASE=]FRACTION ...]
+                                     [--output PATH] [--baseline PATH] [--save-baseline]
+
+Each case runs a stage over the whole corpus: extracting the hands of every page, parse_hand_history of every
+player's betting actions, converting every hand, the end-to-end hand_parser.parse of every page, and main.py over
+a copy of the data folder. A pass repeats the case until it takes at least --min-time, and the best of --repeat
+passes is kept, which is the figure least disturbed by the rest of the machine.
+
+Results are written as JSON to --output. When the baseline file exists, every case is compared with it and the
+exit status is 1 if one got slower than its tolerance allows. --save-baseline stores the results as the new
+baseline. Baselines are only comparable on the machine that recorded them.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import hand_parser
+import main as converter_main
+from html_parser import extract_hand_histories_from_html
+from individual_history_parser import parse_hand_history
+from pokerstars_converter import PokerStarsConverter
+
+DATA = ROOT / "tests" / "data"
+RESULTS = ROOT / "benchmarks" / "results"
+# Bumped when a case changes what it measures, baselines of another version are not compared with
+RESULTS_VERSION = 2
+
+DEFAULT_TOLERANCE = 0.10  # A case may be 10% slower than the baseline
+# Cases that touch the disk and the manifest vary more between runs
+DEFAULT_TOLERANCES = {"main": 0.25}
+
+
+@dataclass
+class Case:
+    name: str
+    items: int  # Pages, betting actions or hands handled by one run
+    unit: str
+    run: Callable[[], None]
+
+
+def load_corpus():
+    pages = [file.read_text(encoding="utf-8") for file in sorted(DATA.glob("*.html"))]
+    hands = [extract_hand_histories_from_html(page) for page in pages]
+    actions = [player.raw_betting_action for hand in hands for player in hand.players]
+    return pages, hands, actions
+
+
+def build_cases(data_folder: Path) -> List[Case]:
+    pages, hands, actions = load_corpus()
+    converter = PokerStarsConverter()
+
+    def extract():
+        for page in pages:
+            extract_hand_histories_from_html(page)
+
+    def parse_actions():
+        for action in actions:
+            parse_hand_history(action)
+
+    def convert():
+        for hand in hands:
+            converter.convert_to_pokerstars_format(hand)
+
+    def end_to_end():
+        for page in pages:
+            hand_parser.parse(page)
+
+    def run_main():
+        # Without the raw row cache, every run after the first would skip the HTML parsing
+        with contextlib.redirect_stdout(io.StringIO()):
+            converter_main.main([str(data_folder), "--force", "--no-raw-cache", "--executor", "serial"])
+
+    return [
+        Case("extract_hand_histories_from_html", len(pages), "page", extract),
+        Case("parse_hand_history", len(actions), "action", parse_actions),
+        Case("convert_to_pokerstars_format", len(hands), "hand", convert),
+        Case("hand_parser.parse", len(pages), "page", end_to_end),
+        Case("main", len(pages), "file", run_main),
+    ]
+
+
+def measure(case: Case, repeat: int, min_time: float) -> dict:
+    # The untimed first run warms the caches and tells how many runs make a pass of at least min_time
+    start = time.perf_counter()
+    case.run()
+    loops = max(1, int(min_time / max(time.perf_counter() - start, 1e-9)) + 1)
+
+    passes = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            case.run()
+        passes.append((time.perf_counter() - start) / loops)
+
+    best = min(passes)
+    return {
+        "items": case.items,
+        "unit": case.unit,
+        "loops": loops,
+        "best_s": best,
+        "median_s": statistics.median(passes),
+        "per_item_us": best / case.items * 1e6,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict, tolerances: dict) -> Tuple[List[str], List[str]]:
+    """
+    Returns:
+    - A line per case found in both results, and the names of the cases that regressed past their tolerance.
+    """
+    lines, regressions = [], []
+    for name, current in results["cases"].items():
+        previous = baseline.get("cases", {}).get(name)
+        if previous is None:
+            lines.append(f"{name:<34} new case")
+            continue
+
+        ratio = current["best_s"] / previous["best_s"]
+        tolerance = tolerances.get(name, tolerances.get(None, DEFAULT_TOLERANCE))
+        status = "REGRESSION" if ratio > 1 + tolerance else "ok"
+        if status != "ok":
+            regressions.append(name)
+        lines.append(f"{name:<34} {previous['per_item_us']:>10.1f} -> {current['per_item_us']:>10.1f} us/{current['unit']}"
+                     f"  {ratio - 1:>+7.1%} (tolerance {tolerance:.0%})  {status}")
+    return lines, regressions
+
+
+def tolerance_arg(value):
+    name, _, fraction = value.rpartition("=")
+    try:
+        return name or None, float(fraction)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected FRACTION or CASE=FRACTION, got '{value}'")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=7, help="Timed passes per case, the best one is kept")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds of a pass")
+    parser.add_argument("--only", nargs="+", metavar="CASE", help="Run only these cases")
+    parser.add_argument("--tolerance", type=tolerance_arg, action="append", default=[],
+                        help=f"Allowed slowdown against the baseline, for every case or one, eg. 0.15 or main=0.3 "
+                             f"(default: {DEFAULT_TOLERANCE}, {', '.join(f'{k}={v}' for k, v in DEFAULT_TOLERANCES.items())})")
+    parser.add_argument("--output", type=Path, default=RESULTS / "latest.json", help="Where to write the results")
+    parser.add_argument("--baseline", type=Path, default=RESULTS / "baseline.json", help="Results to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the baseline")
+    args = parser.parse_args(argv)
+
+    tolerances = {**DEFAULT_TOLERANCES, **dict(args.tolerance)}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        data_folder = Path(temp_dir) / "data"
+        shutil.copytree(DATA, data_folder)
+
+        cases = build_cases(data_folder)
+        if args.only:
+            unknown = set(args.only) - {case.name for case in cases}
+            if unknown:
+                parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+            cases = [case for case in cases if case.name in args.only]
+
+        results = {
+            "version": RESULTS_VERSION,
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "cases": {},
+        }
+        for case in cases:
+            results["cases"][case.name] = result = measure(case, args.repeat, args.min_time)
+            print(f"{case.name:<34} {result['per_item_us']:>10.1f} us/{case.unit}"
+                  f"  (best of {args.repeat} x {result['loops']} runs of {case.items} {case.unit}s)")
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+    regressions = []
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline.get("version") != RESULTS_VERSION:
+            print(f"\nThe baseline was recorded by version {baseline.get('version')} of the suite, not {RESULTS_VERSION}. "
+                  f"Record a new one with --save-baseline")
+        else:
+            print(f"\nAgainst the baseline of revision {baseline.get('revision')} ({baseline.get('created')}):")
+            lines, regressions = compare(results, baseline, tolerances)
+            print("\n".join(lines))
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(args.output, args.baseline)
+        print(f"\nSaved as the baseline in {args.baseline}")
+
+    if regressions:
+        raise SystemExit(f"\n{len(regressions)} case(s) slower than their tolerance: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark of the KST timestamp functions in utils against the strptime and pytz versions they replaced.
+
+Usage:
+    python benchmarks/bench_timestamps.py [--count N] [--repeat N]
+
+Timestamps are generated over a few sessions, so most hands share their date prefix like real exports do.
+Both versions are checked to give the same output before they are timed.
+"""
+import argparse
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import utils
+
+
+def reference_format_korean_date(dt_obj):
+    import pytz
+    return pytz.timezone("Asia/Seoul").localize(dt_obj).strftime("%Y/%m/%d %H:%M:%S %Z")
+
+
+def reference_convert_korean_datetime_with_timezone(datetime_str):
+    datetime_str = re.sub(r"오전", "AM", datetime_str)
+    datetime_str = re.sub(r"오후", "PM", datetime_str)
+    return reference_format_korean_date(datetime.strptime(datetime_str, "%Y-%m-%d %p %I:%M:%S"))
+
+
+def reference_extract_datetime_from_filename(filename):
+    try:
+        return datetime.strptime(filename.stem.split("_")[-1], "%Y-%m-%dT%H-%M-%S")
+    except ValueError:
+        return None
+
+
+def site_timestamp(dt_obj):
+    meridiem = "오전" if dt_obj.hour < 12 else "오후"
+    return f"{dt_obj:%Y-%m-%d} {meridiem} {(dt_obj.hour - 1) % 12 + 1}:{dt_obj:%M:%S}"
+
+
+def generate(count):
+    """Hands roughly every 37 seconds over sessions that start a few days apart."""
+    start = datetime(2024, 7, 5, 20, 0, 0)
+    moments = [start + timedelta(days=3 * (i // 2000), seconds=37 * i) for i in range(count)]
+    timestamps = [site_timestamp(moment) for moment in moments]
+    filenames = [Path(f"hand_{moment:%Y-%m-%dT%H-%M-%S}.html") for moment in moments]
+    return moments, timestamps, filenames
+
+
+def best_of(repeat, fn, values):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for value in values:
+            fn(value)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=20000, help="Number of timestamps")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed passes, the best one is reported")
+    args = parser.parse_args(argv)
+
+    moments, timestamps, filenames = generate(args.count)
+    cases = [
+        ("convert_korean_datetime_with_timezone", timestamps,
+         reference_convert_korean_datetime_with_timezone, utils.convert_korean_datetime_with_timezone),
+        ("format_korean_date", moments, reference_format_korean_date, utils.format_korean_date),
+        ("extract_datetime_from_filename", filenames,
+         reference_extract_datetime_from_filename, utils.extract_datetime_from_filename),
+    ]
+
+    for name, values, reference, current in cases:
+        for value in values:
+            if reference(value) != current(value):
+                raise SystemExit(f"{name} disagrees on {value!r}: {reference(value)!r} != {current(value)!r}")
+
+        before = best_of(args.repeat, reference, values)
+        after = best_of(args.repeat, current, values)
+        print(f"{name}:")
+        print(f"  strptime/pytz: {before / len(values) * 1e6:>6.2f} us/call")
+        print(f"  kst:           {after / len(values) * 1e6:>6.2f} us/call ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
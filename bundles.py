@@ -0,0 +1,145 @@
+"""
+Bundled output: many converted hands per file instead of one .txt per input file.
+
+Workers only convert; the hands they return are written by a single BundleWriter in the main process,
+so parallel workers never interleave output. Bundles roll over to a new part after a number of hands or bytes.
+"""
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import sinks
+from kst import parse_korean_timestamp
+from models import PokerHand
+from pokerstars_converter import HAND_SEPARATOR
+
+FILES = "files"  # One output file per input file, mirroring the data folder
+DAY = "day"  # One bundle per day the hands were played (KST)
+STAKE = "stake"  # One bundle per small blind/big blind
+ROLLING = "rolling"  # One bundle for everything, split every N hands or MB
+OUTPUT_MODES = [FILES, DAY, STAKE, ROLLING]
+
+# A rolling bundle without an explicit limit is split every this many hands
+DEFAULT_ROLLING_HANDS = 10000
+# Bundles without a write for the longest time are closed once this many are open, and reopened when needed
+MAX_OPEN_BUNDLES = 64
+
+_SEPARATOR = HAND_SEPARATOR.encode("utf-8")
+
+
+@dataclass
+class BundledHand:
+    """A converted hand on its way from a worker to the bundle writer."""
+    key: str  # Name of the bundle the hand belongs to
+    data: bytes  # The hand in PokerStars format, UTF-8 encoded
+
+
+def bundle_key(mode: str, poker_hand: PokerHand, correct_datetime: datetime = None) -> str:
+    if mode == DAY:
+        played = correct_datetime or parse_korean_timestamp(poker_hand.timestamp)
+        return played.strftime("%Y-%m-%d")
+    if mode == STAKE:
+        return f"{poker_hand.get_small_blind_amount()}-{poker_hand.get_big_blind_amount()}"
+    if mode == ROLLING:
+        return "hands"
+    raise ValueError(f"Output mode '{mode}' does not bundle hands")
+
+
+@dataclass
+class _Bundle:
+    part: int
+    path: Path
+    hands: int = 0
+    size: int = 0
+
+
+class BundleWriter:
+    """
+    Appends hands to <output_folder>/<mode>/<key>_<part>.txt, compressed while they are written if asked to.
+
+    A run never appends to the parts of an earlier run: the first hand of a key starts the part after the last
+    one on disk. A part is closed and the next one started when it reaches max_hands or max_bytes.
+    """
+
+    def __init__(self, output_folder: Path, mode: str, max_hands: int = None, max_bytes: int = None,
+                 compression: str = sinks.NONE):
+        if mode not in OUTPUT_MODES or mode == FILES:
+            raise ValueError(f"Output mode '{mode}' does not bundle hands")
+        if mode == ROLLING and max_hands is None and max_bytes is None:
+            max_hands = DEFAULT_ROLLING_HANDS
+
+        self.folder = Path(output_folder) / mode
+        self.max_hands = max_hands
+        self.max_bytes = max_bytes  # Of uncompressed text
+        self.compression = compression
+        self.extension = ".txt" + sinks.EXTENSIONS[compression]
+        self.hands_written = 0
+        self._bundles: dict[str, _Bundle] = {}
+        self._handles = OrderedDict()  # key -> open file, least recently written first
+
+    def write(self, hand: BundledHand):
+        bundle = self._bundles.get(hand.key)
+        if bundle is None:
+            bundle = self._bundles[hand.key] = self._new_bundle(hand.key, self._last_part_on_disk(hand.key) + 1)
+        elif self._is_full(bundle, len(hand.data)):
+            self._close_handle(hand.key)
+            bundle = self._bundles[hand.key] = self._new_bundle(hand.key, bundle.part + 1)
+
+        handle = self._handle(hand.key, bundle)
+        if bundle.hands:
+            handle.write(_SEPARATOR)
+            bundle.size += len(_SEPARATOR)
+        handle.write(hand.data)
+        bundle.size += len(hand.data)
+        bundle.hands += 1
+        self.hands_written += 1
+
+    def _is_full(self, bundle: _Bundle, next_size: int) -> bool:
+        if not bundle.hands:
+            return False
+        if self.max_hands is not None and bundle.hands >= self.max_hands:
+            return True
+        return self.max_bytes is not None and bundle.size + len(_SEPARATOR) + next_size > self.max_bytes
+
+    def _new_bundle(self, key: str, part: int) -> _Bundle:
+        return _Bundle(part=part, path=self.folder / f"{key}_{part:04d}{self.extension}")
+
+    def _last_part_on_disk(self, key: str) -> int:
+        pattern = re.compile(rf"{re.escape(key)}_(\d+){re.escape(self.extension)}")
+        last = 0
+        for path in self.folder.glob(f"{key}_*{self.extension}"):
+            match = pattern.fullmatch(path.name)
+            if match:
+                last = max(last, int(match.group(1)))
+        return last
+
+    def _handle(self, key: str, bundle: _Bundle):
+        handle = self._handles.get(key)
+        if handle is not None:
+            self._handles.move_to_end(key)
+            return handle
+
+        if len(self._handles) >= MAX_OPEN_BUNDLES:
+            self._close_handle(next(iter(self._handles)))
+
+        bundle.path.parent.mkdir(parents=True, exist_ok=True)
+        # A bundle reopened after being closed gets a new compressed stream appended, which reads back as one
+        handle = self._handles[key] = sinks.open_sink(bundle.path, self.compression, append=True)
+        return handle
+
+    def _close_handle(self, key: str):
+        handle = self._handles.pop(key, None)
+        if handle is not None:
+            handle.close()
+
+    def close(self):
+        while self._handles:
+            self._close_handle(next(iter(self._handles)))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,77 @@
+"""
+Cards encoded as small integers, with lookup tables for the Korean site notation and PokerStars notation.
+
+A card is rank * 4 + suit: 0 is the deuce of clubs, 51 the ace of spades.
+The Korean site writes the suit first (♥K, ◆10), PokerStars writes the rank first (Kh, Td).
+"""
+from functools import lru_cache
+from typing import Iterable, Tuple
+
+RANKS = "23456789TJQKA"
+SUITS = "cdhs"
+KOREAN_SUITS = "♣◆♥♠"  # In the same order as SUITS, the site uses ◆ instead of ♦
+KOREAN_RANKS = tuple("10" if rank == "T" else rank for rank in RANKS)
+
+DECK = range(len(RANKS) * len(SUITS))
+
+# Card to text
+POKERSTARS: Tuple[str, ...] = tuple(rank + suit for rank in RANKS for suit in SUITS)
+KOREAN: Tuple[str, ...] = tuple(suit + rank for rank in KOREAN_RANKS for suit in KOREAN_SUITS)
+
+# Text to card, the Korean table also accepts T for 10
+_FROM_POKERSTARS = {text: card for card, text in enumerate(POKERSTARS)}
+_FROM_KOREAN = {text: card for card, text in enumerate(KOREAN)}
+_FROM_KOREAN.update({text.replace("10", "T"): card for text, card in list(_FROM_KOREAN.items())})
+
+
+def card(rank: str, suit: str) -> int:
+    return RANKS.index(rank) * len(SUITS) + SUITS.index(suit)
+
+
+def rank_of(card: int) -> str:
+    return RANKS[card // len(SUITS)]
+
+
+def suit_of(card: int) -> str:
+    return SUITS[card % len(SUITS)]
+
+
+def from_korean(text: str) -> int:
+    try:
+        return _FROM_KOREAN[text]
+    except KeyError:
+        raise ValueError(f"Unknown card '{text}'")
+
+
+def from_pokerstars(text: str) -> int:
+    try:
+        return _FROM_POKERSTARS[text]
+    except KeyError:
+        raise ValueError(f"Unknown card '{text}'")
+
+
+def to_pokerstars(card: int) -> str:
+    return POKERSTARS[card]
+
+
+def to_korean(card: int) -> str:
+    return KOREAN[card]
+
+
+@lru_cache(maxsize=4096)
+def parse_korean_cards(section: str) -> Tuple[int, ...]:
+    """
+    Parses cards written back to back in the site notation, eg. "♥K◆4◆10".
+    Every player's line repeats the same board, so results are cached and shared.
+
+    Returns:
+    - A tuple of cards, empty for an empty section.
+    """
+    section = section.replace("10", "T")
+    if len(section) % 2:
+        raise ValueError(f"Unknown cards '{section}'")
+    return tuple(from_korean(section[i:i + 2]) for i in range(0, len(section), 2))
+
+
+def format_pokerstars(cards: Iterable[int]) -> str:
+    return " ".join([POKERSTARS[card] for card in cards])
@@ -32,3 +32,6 @@ class BetType(Enum):
     FOLD = "fold"
 
 
+
+# Bump whenever the parser or converter output changes so previously converted files are redone
+CONVERTER_VERSION = "2"
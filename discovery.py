@@ -0,0 +1,155 @@
+"""
+Finding the input files with os.scandir.
+
+Every file comes with the stat result of the scan, so the manifest check and the conversion don't stat it again.
+Names are matched before anything is stat'ed, and subtrees can be scanned by several threads at once,
+which is what makes the difference on network mounts where every directory listing is a round-trip.
+"""
+import fnmatch
+import os
+import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Tuple
+
+from archives import ARCHIVE_SUFFIXES
+
+WALK = "walk"  # As the directories are scanned, the first files are converted while the scan goes on
+LARGEST_FIRST = "largest"  # Scan everything first, then the largest files first so the slowest ones don't end up last
+ORDERS = [WALK, LARGEST_FIRST]
+
+
+class DiscoveredFile:
+    """
+    A file found by scan_files. Stands in for its Path during the conversion, with the stat result of the scan.
+    Archives are discovered too, so that they can be ordered with the other files before their members are read.
+    """
+    __slots__ = ("_path", "_fspath", "_stat", "is_archive")
+
+    def __init__(self, path: str | Path, stat: os.stat_result, is_archive: bool = False):
+        # The Path is only built when it's needed, most files only need their name, stat and content
+        self._path = path if isinstance(path, Path) else None
+        self._fspath = os.fspath(path)
+        self._stat = stat
+        self.is_archive = is_archive
+
+    @property
+    def path(self) -> Path:
+        if self._path is None:
+            self._path = Path(self._fspath)
+        return self._path
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self._fspath)
+
+    @property
+    def stem(self) -> str:
+        return self.path.stem
+
+    @property
+    def suffix(self) -> str:
+        return self.path.suffix
+
+    @property
+    def size(self) -> int:
+        return self._stat.st_size
+
+    def stat(self) -> os.stat_result:
+        return self._stat
+
+    def read_bytes(self) -> bytes:
+        with open(self._fspath, "rb") as file:
+            return file.read()
+
+    def relative_to(self, folder: Path) -> Path:
+        return self.path.relative_to(folder)
+
+    def __fspath__(self):
+        return self._fspath
+
+    def __str__(self):
+        return self._fspath
+
+    def __repr__(self):
+        return f"DiscoveredFile({self._fspath!r}, size={self.size})"
+
+    def __eq__(self, other):
+        return isinstance(other, DiscoveredFile) and self._fspath == other._fspath
+
+    def __hash__(self):
+        return hash(self._fspath)
+
+
+def _name_matcher(pattern: str) -> Callable[[str], bool]:
+    """A compiled fnmatch.fnmatch for one pattern, case-insensitive where the file system is."""
+    match = re.compile(fnmatch.translate(os.path.normcase(pattern))).match
+    if os.path.normcase("A") == "A":
+        return lambda name: match(name) is not None
+    return lambda name: match(os.path.normcase(name)) is not None
+
+
+def _scan_directory(directory: str, matches: Callable[[str], bool], archives: bool) -> Tuple[List[DiscoveredFile], List[str]]:
+    """
+    Lists one directory, like a single step of os.walk: unreadable directories and entries are skipped,
+    and symlinks to directories are not followed.
+
+    Returns:
+    - The matching files (and archives) of the directory, and its subdirectories to scan next.
+    """
+    files, subdirectories = [], []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            subdirectories.append(entry.path)
+                        continue
+
+                    # Match the name first, only the files we keep are stat'ed
+                    if matches(entry.name):
+                        files.append(DiscoveredFile(entry.path, entry.stat()))
+                    elif archives and entry.name.lower().endswith(ARCHIVE_SUFFIXES):
+                        files.append(DiscoveredFile(entry.path, entry.stat(), is_archive=True))
+                except OSError:
+                    continue
+    except OSError:
+        pass
+
+    # Sorted, so a scan gives the same order on every run and platform
+    files.sort(key=lambda file: file.name)
+    subdirectories.sort()
+    return files, subdirectories
+
+
+def scan_files(directory: Path, pattern: str = "*.html", archives: bool = True, workers: int = 1) -> Iterator[DiscoveredFile]:
+    """
+    Yields the files below a directory whose name matches the pattern, and the archives when asked to.
+
+    With one worker the tree is scanned depth first in name order. With more, subdirectories are scanned
+    by a thread pool and their files are yielded as soon as each listing completes.
+    """
+    directory = str(directory)
+    matches = _name_matcher(pattern)
+    if workers <= 1:
+        pending = [directory]
+        while pending:
+            files, subdirectories = _scan_directory(pending.pop(), matches, archives)
+            yield from files
+            pending.extend(reversed(subdirectories))
+        return
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scan") as executor:
+        in_flight = {executor.submit(_scan_directory, directory, matches, archives)}
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirectories = future.result()
+                for subdirectory in subdirectories:
+                    in_flight.add(executor.submit(_scan_directory, subdirectory, matches, archives))
+                yield from files
+
+
+def largest_first(files: Iterable[DiscoveredFile]) -> List[DiscoveredFile]:
+    return sorted(files, key=lambda file: file.size, reverse=True)
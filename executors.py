@@ -0,0 +1,66 @@
+"""
+Execution backends that main.py can run the conversion on
+"""
+import multiprocessing
+import os
+import sys
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+EXECUTOR_CHOICES = ["serial", "thread", "process", "forkserver"]
+
+# Imported once by the fork server so every forked worker starts with them already loaded
+PRELOAD_MODULES = ["bs4", "pytz", "individual_history_parser", "html_parser", "hand_parser", "pokerstars_converter"]
+
+# ProcessPoolExecutor refuses more than 61 workers on Windows
+WINDOWS_MAX_WORKERS = 61
+
+
+class SerialExecutor(Executor):
+    """Runs every task inline in the calling thread. Useful for profiling and debugging."""
+
+    def submit(self, fn, /, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        pass
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def create_executor(kind: str, workers: int = None) -> Executor:
+    """
+    Creates the executor for the given backend:
+    - serial: no concurrency at all
+    - thread: a thread pool, only worthwhile on free-threaded Python builds
+    - process: a process pool using the platform's default start method
+    - forkserver: a process pool whose workers fork from a server that has already imported PRELOAD_MODULES
+    """
+    workers = workers or default_workers()
+    if sys.platform == "win32":
+        workers = min(workers, WINDOWS_MAX_WORKERS)
+
+    if kind == "serial":
+        return SerialExecutor()
+
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=workers)
+
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=workers)
+
+    if kind == "forkserver":
+        if "forkserver" not in multiprocessing.get_all_start_methods():
+            raise ValueError("The forkserver executor is not supported on this platform")
+
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(PRELOAD_MODULES)
+        return ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+    raise ValueError(f"Unknown executor '{kind}', expected one of {', '.join(EXECUTOR_CHOICES)}")
@@ -2,17 +2,67 @@
 Ties together the hand history reading with the pokerstars converter
 """
 from datetime import datetime
+from itertools import chain
+from typing import Iterable, Iterator, List, Tuple
 
-from html_parser import extract_hand_histories_from_html
+from html_parser import RawHandRow, build_hand, extract_hand_histories_from_html, iter_hands_from_html
 from models import PokerHand
 from pokerstars_converter import PokerStarsConverter
 
-def parse(html_content: str, correct_datetime: datetime = None, currency_symbol = None):
+def parse(html_content: str, correct_datetime: datetime = None, currency_symbol = None, html_backend: str = None):
     # Read the hand from HTML
-    hand_history_raw: PokerHand = extract_hand_histories_from_html(html_content)
+    hand_history_raw: PokerHand = extract_hand_histories_from_html(html_content, html_backend)
 
     converter = PokerStarsConverter(currency_symbol)
     # Convert to Pokerstars format
     pokerstars_format = converter.convert_to_pokerstars_format(hand_history_raw, correct_datetime)
 
-    return pokerstars_format
\ No newline at end of file
+    return pokerstars_format
+
+def parse_many(html_content: str, correct_datetime: datetime = None, currency_symbol = None, html_backend: str = None) -> Iterator[str]:
+    """
+    Converts every hand on a page to PokerStars format, in page order.
+
+    The corrected datetime (usually taken from the file name) describes a single hand,
+    so it is only applied when the page holds exactly one hand.
+    """
+    hands, correct_datetime = page_hands(html_content, correct_datetime, html_backend)
+
+    converter = PokerStarsConverter(currency_symbol)
+    for hand in hands:
+        yield converter.convert_to_pokerstars_format(hand, correct_datetime)
+
+def write_many(html_content: str, fp, correct_datetime: datetime = None, currency_symbol = None, html_backend: str = None) -> int:
+    """
+    Streams every hand on a page to fp in PokerStars format, separated like a PokerStars hand history file.
+    The corrected datetime is applied like in parse_many.
+
+    Returns:
+    - The number of hands written.
+    """
+    hands, correct_datetime = page_hands(html_content, correct_datetime, html_backend)
+    return PokerStarsConverter(currency_symbol).convert_many(hands, fp, correct_datetime)
+
+def page_hands(html_content: str, correct_datetime: datetime = None, html_backend: str = None) -> Tuple[Iterable[PokerHand], datetime | None]:
+    """
+    Reads the hands of a page, looking ahead just far enough to know whether there is more than one.
+
+    Returns:
+    - The hands in page order (empty if there are none) and the corrected datetime to apply to them.
+    """
+    return _lookahead(iter_hands_from_html(html_content, html_backend), correct_datetime)
+
+def row_hands(rows: List[RawHandRow], correct_datetime: datetime = None) -> Tuple[Iterable[PokerHand], datetime | None]:
+    """Like page_hands, for the rows of a page that were already extracted, eg. by the raw row cache."""
+    return _lookahead(map(build_hand, rows), correct_datetime)
+
+def _lookahead(hands: Iterator[PokerHand], correct_datetime: datetime | None) -> Tuple[Iterable[PokerHand], datetime | None]:
+    first = next(hands, None)
+    if first is None:
+        return [], correct_datetime
+
+    second = next(hands, None)
+    if second is None:
+        return [first], correct_datetime
+
+    return chain([first, second], hands), None
@@ -1,48 +1,247 @@
-from bs4 import BeautifulSoup
-from typing import List, Any
+import re
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import TYPE_CHECKING, Iterator, List, Any
 
 import individual_history_parser
 from individual_history_parser import parse_hand_history
 
 from models import PlayerAction, PokerHand
+from timings import DETAILED_INFO, HAND_HISTORY, HTML, stage
 
+# bs4 is only imported by the bs4 backend, the default streaming backend doesn't need it
+if TYPE_CHECKING:
+    from bs4 import Tag
 
-def extract_hand_histories_from_html(html_content: str) -> PokerHand | None:
+# Start of the table-area div, used by the streaming backend to skip the page header without tokenizing it
+TABLE_AREA_START = re.compile(r"""<div\b[^>]*\bclass\s*=\s*["']?[^"'>]*\btable-area\b""", re.IGNORECASE)
+
+
+@dataclass
+class RawHandRow:
+    """The stripped cell text of one hand history row, before any hand history parsing."""
+    cells: List[str]  # 라운드ID, 시각, 게임 종류, 승자(족보), 이긴금액
+    player_rows: List[List[str]] = field(default_factory=list)  # 참가자, 족보, 변동 금액, 남은 잔액 per player
+
+
+class Bs4Backend:
+    """Reference backend that builds a BeautifulSoup tree of the table-area."""
+    name = "bs4"
+
+    def iter_rows(self, html_content: str) -> Iterator[RawHandRow]:
+        from bs4 import BeautifulSoup, SoupStrainer
+
+        # Only the hand history table is needed, so skip building the tree for the scripts and styles around it
+        soup = BeautifulSoup(html_content, "html.parser", parse_only=SoupStrainer("div", class_="table-area"))
+
+        # Locate the main table that contains hand histories
+        table_area = soup.find("div", class_="table-area")
+        if table_area:
+            hand_history_table = table_area.find("table")
+        else:
+            hand_history_table = None
+
+        if hand_history_table is None:
+            return
+
+        # Extract the rows of the table itself (excluding the header row and the rows of the nested tables)
+        hand_history_rows = [row for row in hand_history_table.find_all("tr")
+                             if row.find_parent("table") is hand_history_table]
+
+        for row in hand_history_rows[1:]:
+            columns = row.find_all("td")
+            if len(columns) < 6:  # Ensure we have the correct number of columns
+                continue
+
+            yield RawHandRow(
+                cells=[column.text.strip() for column in columns[:5]],
+                player_rows=_bs4_player_rows(columns[5])  # Walk the nested table without parsing it again
+            )
+
+    def extract_row(self, html_content: str) -> RawHandRow | None:
+        return next(self.iter_rows(html_content), None)
+
+
+class _TableAreaParser(HTMLParser):
+    """
+    Event based extractor that only tracks the rows and cells of the hand history table.
+
+    Mirrors what the bs4 backend reads: the first table inside div.table-area, the text of each cell
+    of its rows, and the rows of the first nested table inside the sixth cell (the detailed info).
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.rows: List[RawHandRow] = []  # Every outer row, including the header row
+        self._div_depth = None  # Nesting depth inside div.table-area, None until it starts
+        self._table_depth = 0
+        self._finished = False
+        self._row = None  # The outer row currently open
+        self._outer_text = None  # Text parts of the outer cell currently open
+        self._nested_table = False  # Inside the nested table of the detailed info cell
+        self._nested_rows = None
+        self._nested_text = None  # Text parts of the nested cell currently open
+
+    def handle_starttag(self, tag, attrs):
+        if self._finished:
+            return
+
+        if self._div_depth is None:
+            if tag == "div" and "table-area" in (dict(attrs).get("class") or "").split():
+                self._div_depth = 1
+            return
+
+        if tag == "div":
+            self._div_depth += 1
+
+        elif tag == "table":
+            self._table_depth += 1
+            if (self._table_depth == 2 and self._row is not None and len(self._row.cells) == 6
+                    and self._nested_rows is None):
+                self._nested_table = True
+                self._nested_rows = []
+
+        elif tag == "tr":
+            if self._table_depth == 1:
+                self._row = RawHandRow(cells=[])
+                self.rows.append(self._row)
+            elif self._table_depth == 2 and self._nested_table:
+                self._nested_rows.append([])
+
+        elif tag == "td":
+            if self._table_depth == 1 and self._row is not None:
+                self._row.cells.append([])
+                self._outer_text = self._row.cells[-1] if len(self._row.cells) <= 5 else None
+            elif self._table_depth == 2 and self._nested_table and self._nested_rows:
+                self._nested_rows[-1].append([])
+                self._nested_text = self._nested_rows[-1][-1]
+
+    def handle_endtag(self, tag):
+        if self._finished or self._div_depth is None:
+            return
+
+        if tag == "div":
+            self._div_depth -= 1
+            if self._div_depth == 0:
+                self._finished = True
+
+        elif tag == "table":
+            if self._table_depth == 2 and self._nested_table:
+                self._nested_table = False
+            self._table_depth -= 1
+            if self._table_depth == 0:
+                # Only the first table of the table-area holds hands
+                self._finished = True
+
+        elif tag == "tr":
+            if self._table_depth == 1 and self._row is not None:
+                self._close_row()
+
+        elif tag == "td":
+            if self._table_depth == 1:
+                self._outer_text = None
+            elif self._table_depth == 2:
+                self._nested_text = None
+
+    def handle_data(self, data):
+        if self._nested_text is not None:
+            self._nested_text.append(data)
+        elif self._outer_text is not None:
+            self._outer_text.append(data)
+
+    def close(self):
+        super().close()
+        if self._row is not None:
+            self._close_row()
+
+    def _close_row(self):
+        row = self._row
+        row.cells = ["".join(parts).strip() for parts in row.cells]
+        # Skip the header row, and any player row without the expected columns
+        row.player_rows = [
+            ["".join(parts).strip() for parts in columns[:4]]
+            for columns in (self._nested_rows or [])[1:]
+            if len(columns) >= 4
+        ]
+        self._row = None
+        self._outer_text = None
+        self._nested_table = False
+        self._nested_rows = None
+        self._nested_text = None
+
+
+class StreamingBackend:
+    """Backend built on the standard library HTMLParser that never builds a DOM."""
+    name = "stream"
+
+    def iter_rows(self, html_content: str) -> Iterator[RawHandRow]:
+        parser = _TableAreaParser()
+        start = TABLE_AREA_START.search(html_content)
+        parser.feed(html_content[start.start():] if start else html_content)
+        parser.close()
+
+        # The first row is the header
+        for row in parser.rows[1:]:
+            if len(row.cells) < 6:
+                continue
+
+            # Only the first five cells are kept, the sixth holds the player rows
+            row.cells = row.cells[:5]
+            yield row
+
+    def extract_row(self, html_content: str) -> RawHandRow | None:
+        return next(self.iter_rows(html_content), None)
+
+
+BACKENDS = {
+    Bs4Backend.name: Bs4Backend,
+    StreamingBackend.name: StreamingBackend,
+}
+
+DEFAULT_BACKEND = StreamingBackend.name
+
+
+def get_backend(name: str = None):
+    try:
+        return BACKENDS[name or DEFAULT_BACKEND]()
+    except KeyError:
+        raise ValueError(f"Unknown HTML parser backend '{name}', expected one of {', '.join(BACKENDS)}")
+
+
+def extract_hand_histories_from_html(html_content: str, backend: str = None) -> PokerHand | None:
     """
     Extracts structured poker hand history metadata from an HTML file.
 
     Returns:
-    - A list of RawPokerHand objects.
+    - The first PokerHand on the page, or None if there isn't one.
     """
-    soup = BeautifulSoup(html_content, "html.parser")
-
-    # Locate the main table that contains hand histories
-    table_area = soup.find("div", class_="table-area")
-    if table_area:
-        hand_history_table = table_area.find("table")
-    else:
-        hand_history_table = None
-
-    # Extract all rows from the table (excluding the header row)
-    hand_history_rows = hand_history_table.find_all("tr") if hand_history_table else []
-    row = hand_history_rows[1] if len(hand_history_rows) > 1 else None
-
-    if (row is None):
-        return None
-    columns = row.find_all("td")
-    if row is None or len(columns) < 6:  # Ensure we have the correct number of columns
-        return None
-
-    hand_data = PokerHand(
-        round_id=columns[0].text.strip(), # 라운드ID
-        timestamp=columns[1].text.strip(), # 시각
-        game_type=columns[2].text.strip(), # 게임 종류 (e.g., 홀덤)
-        winner=extract_winner(columns[3].text.strip()), # 승자(족보)
-        winning_amount=columns[4].text.strip().replace(",", ""), # 이긴금액
-        players=parse_detailed_info(str(columns[5]))  # Pass nested HTML for parsing
-    )
+    return next(iter_hands_from_html(html_content, backend), None)
+
+def iter_hands_from_html(html_content: str, backend: str = None) -> Iterator[PokerHand]:
+    """
+    Extracts every hand on a page, in page order. Bulk exports can hold many rounds per page.
 
-    return hand_data
+    Returns:
+    - An iterator of PokerHand objects, one per row of the table-area.
+    """
+    rows = get_backend(backend).iter_rows(html_content)
+    while True:
+        with stage(HTML):
+            row = next(rows, None)
+        if row is None:
+            return
+        yield build_hand(row)
+
+def build_hand(row: RawHandRow) -> PokerHand:
+    with stage(DETAILED_INFO):
+        return PokerHand(
+            round_id=row.cells[0], # 라운드ID
+            timestamp=row.cells[1], # 시각
+            game_type=row.cells[2], # 게임 종류 (e.g., 홀덤)
+            winner=extract_winner(row.cells[3]), # 승자(족보)
+            winning_amount=row.cells[4].replace(",", ""), # 이긴금액
+            players=[build_player(player_row) for player_row in row.player_rows]
+        )
 
 def extract_winner(winner: str):
     split = winner.split(' ')
@@ -51,21 +250,30 @@ def extract_winner(winner: str):
     return winner
 
 
-def parse_detailed_info(detailed_info_html: str) -> List[PlayerAction]:
-    """
-    Parses the nested table inside the 'detailed_info' column.
+def build_player(columns: List[str]) -> PlayerAction:
+    betting_action = columns[1]
+
+    # This might not belong here but it's easier if it can stay here
+    with stage(HAND_HISTORY):
+        parsed_betting_action, win_money = individual_history_parser.parse_hand_history(betting_action)
+
+    return PlayerAction(
+        player=columns[0], # 참가자 Player name
+        raw_betting_action=betting_action, # 족보 Betting action
+        amount_won_lost=int(columns[2].replace(",", "")), # 변동 금액 Won/lost
+        final_stack=int(columns[3].replace(",", "")), # 남은 잔액 Final stack size
+        betting_actions=parsed_betting_action,
+        win_money=win_money
+    )
 
-    Returns:
-    - A list of RawPlayerAction objects for each player in the hand.
-    """
-    soup = BeautifulSoup(detailed_info_html, "html.parser")
 
+def _bs4_player_rows(detailed_info: "Tag") -> List[List[str]]:
     # Find the nested table inside detailed_info
-    nested_table = soup.find("table")
+    nested_table = detailed_info.find("table")
     if not nested_table:
         return []
 
-    parsed_players = []
+    player_rows = []
 
     # Extract rows from the nested table
     rows = nested_table.find_all("tr")
@@ -75,20 +283,21 @@ def parse_detailed_info(detailed_info_html: str) -> List[PlayerAction]:
         if len(columns) < 4:  # Ensure correct number of columns
             continue
 
-        betting_action = columns[1].text.strip()
+        player_rows.append([column.text.strip() for column in columns[:4]])
 
-        # This might not belong here but it's easier if it can stay here
-        parsed_betting_action, win_money = individual_history_parser.parse_hand_history(betting_action)
+    return player_rows
 
-        player_data = PlayerAction(
-            player=columns[0].text.strip(), # 참가자 Player name
-            raw_betting_action=betting_action, # 족보 Betting action
-            amount_won_lost=int(columns[2].text.strip().replace(",", "")), # 변동 금액 Won/lost
-            final_stack=int(columns[3].text.strip().replace(",", "")), # 남은 잔액 Final stack size
-            betting_actions=parsed_betting_action,
-            win_money=win_money
-        )
 
-        parsed_players.append(player_data)
+def parse_detailed_info(detailed_info: "str | Tag") -> List[PlayerAction]:
+    """
+    Parses the nested table inside the 'detailed_info' column.
+    Accepts either the already parsed column or its HTML.
+
+    Returns:
+    - A list of RawPlayerAction objects for each player in the hand.
+    """
+    if isinstance(detailed_info, str):
+        from bs4 import BeautifulSoup
+        detailed_info = BeautifulSoup(detailed_info, "html.parser")
 
-    return parsed_players
+    return [build_player(player_row) for player_row in _bs4_player_rows(detailed_info)]
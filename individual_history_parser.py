@@ -1,15 +1,74 @@
 # Parses the Korean HH to a normalized structure
 import re
-from tkinter.messagebox import showinfo
 
 import constants
+from cards import from_korean, parse_korean_cards
 from constants import BetType, ALL_IN, CHECK, RAISE, CALL, FOLD, BIG_BLIND, SMALL_BLIND, QUARTER_POT, HALF_POT, \
     FULL_POT, \
     MoneyUnit, GENERIC
 from models import ParsedHandHistory, StartEntry, HistoryLine, PlayerEntry, AnteEntry, CommunityCardsEntry, ActionEntry, \
     PostBlindEntry, ResultsEntry, HoleCardsEntry, EntryFeeEntry, WinMoneyEntry
-import locale
-locale.setlocale(locale.LC_ALL, 'en_US.UTF-8')
+
+# Line markers, in the order they were historically checked
+START = "시작 :"
+NICKNAME = "NICKNAME:["
+ANTE = "앤티:"
+HOLE_CARDS = "홀 카드딜:"
+COMMUNITY_CARDS = "커뮤니티 카드 딜:"
+BETTING = "베팅:"
+UNCALLED_BET = "# 공베팅 반환"
+RESULT = "결과:"
+ENTRY_FEE = constants.ENTRY_FEE
+END = "종료:"
+
+LINE_MARKERS = [START, NICKNAME, ANTE, HOLE_CARDS, COMMUNITY_CARDS, BETTING, UNCALLED_BET, RESULT, ENTRY_FEE]
+
+# Almost every line is "* <marker>", so one anchored match classifies it.
+# Lines known to carry nothing we need (turn starts, bet timings, the card summary) match without a marker.
+_LINE_PREFIX = re.compile(
+    r"\s*(?:\* (" + "|".join(re.escape(marker) for marker in [START, NICKNAME, ANTE, HOLE_CARDS, COMMUNITY_CARDS,
+                                                                  BETTING, RESULT, ENTRY_FEE, END]) + r")"
+    r"|\* 턴 시작:|\[\d+ms\]|[♠♥♣◆])"
+)
+
+_BET_MARKERS = re.compile("|".join(re.escape(term) for term in [GENERIC, QUARTER_POT, HALF_POT, FULL_POT, RAISE, ALL_IN]))
+_BLIND_MARKERS = re.compile(f"{re.escape(SMALL_BLIND)}|{re.escape(BIG_BLIND)}")
+_START_FIELD = re.compile(r"(StageNo|Credit|SB|BB|MBI|CBIR):([^\s\]]*)")
+_START_CHIP_FIELDS = {"Credit": "credit", "SB": "sb", "BB": "bb", "MBI": "mbi", "CBIR": "cbir"}
+_WIN_MONEY = re.compile(r"WinMoney\[([\d,]+)원\] Credit\[([\d,]+)원\]")
+_HOLE_CARD = re.compile(r"[♠♥♣◆](?:\d+|A|J|Q|K)")
+_RESULT = re.compile(r"결과: (패배|승리) \[족보:(.*?)\] \[카드:(.*?)\]( - (기권승|기권))?")
+_BRACKETED = re.compile(r'\[(.*?)]')
+_BET_STACK = re.compile(r"Credit\(([\d,]+)원\)")
+_BET_SIZE = re.compile(r"\(([\d,]+)원\)")  # Also the remaining stack of checks, calls and folds
+_BLIND_STACK = re.compile(r"Creadit:\s*([\d,]+)원")
+_FEE_STACK = re.compile(r"Credit:([\d,]+)원")
+_AMOUNT = re.compile(r"\[금액:([\d,]+)원\]")
+_CALL_SIZE = re.compile(r"-([\d,]+)원")
+
+# The usual betting lines, eg. "[풀] (13,000원) Credit(391,687원) - 베팅순서: [0][1]" and "콜 -1,000원(367,491원) - 베팅순서: [0][6]"
+_SIZED_BET = re.compile(r"\[(하프|쿼터|풀|레이즈|베팅|올인)\] \(([\d,]+)원\) Credit\(([\d,]+)원\) - 베팅순서: \[(\d+)\]\[(\d+)\]$")
+_SIZED_BET_TYPES = {"레이즈": BetType.RAISE, "올인": BetType.ALL_IN}
+_CHECK_CALL_FOLD = re.compile(r"(?:(?P<verb>체크|콜) -(?P<amount>[\d,]+)원|(?P<fold>다이) \[0\])"
+                              r"\((?P<stack>[\d,]+)원\) - 베팅순서: \[(?P<round>\d+)\]\[(?P<position>\d+)\]$")
+_CHECK_CALL_FOLD_TYPES = {"체크": BetType.CHECK, "콜": BetType.CALL, "다이": BetType.FOLD}
+
+def classify_line(line: str) -> tuple[str | None, bool]:
+    """
+    Identifies what a hand history line holds.
+
+    Returns:
+    - The line marker (one of LINE_MARKERS, END or None) and whether the line also holds the end of hand "* 종료:".
+    """
+    match = _LINE_PREFIX.match(line)
+    if match is not None:
+        marker = match.group(1)
+        return marker, marker == END
+
+    # Unusual line, eg. "# 공베팅 반환 [4,000원]* 종료: ...": look for the markers anywhere in it
+    marker = next((marker for marker in LINE_MARKERS if marker in line), None)
+    return marker, "* 종료:" in line
+
 
 def parse_hand_history(hand_history: str) -> ParsedHandHistory:
     """
@@ -26,118 +85,103 @@ def parse_hand_history(hand_history: str) -> ParsedHandHistory:
 
     parsed_lines: ParsedHandHistory = []
     win_money_line: WinMoneyEntry = None
+    prefix_match = _LINE_PREFIX.match
 
     for line in lines:
-        parsed_line: HistoryLine | None = None
-
-        # 시작 (Start of the hand): Contains hand metadata like StageNo, Credit, Blinds
-        if "시작 :" in line:
-            parsed_line = StartEntry()
-            parts = line.replace("[", "").replace("]", "").split()
-            for part in parts:
-                if "StageNo:" in part:
-                    parsed_line.stage_number = part.split("StageNo:")[1]
-                elif "Credit:" in part:
-                    parsed_line.credit = parse_chips("Credit:", part)
-                elif "SB:" in part:
-                    parsed_line.sb = parse_chips("SB:", part)
-                elif "BB:" in part:
-                    parsed_line.bb = parse_chips("BB:", part)
-                elif "MBI:" in part:
-                    parsed_line.mbi = parse_chips("MBI:", part)
-                elif "CBIR:" in part:
-                    parsed_line.cbir = parse_chips("CBIR:", part)
-
-        # NICKNAME (플레이어 이름): Identifies the player
-        elif "NICKNAME:[" in line:
-            parsed_line = PlayerEntry()
-            start = line.find("[") + 1
-            end = line.find("]", start)
-            parsed_line.nickname = line[start:end]
-
-        elif "앤티:" in line:
-            parsed_line = AnteEntry()
-
-            # Remove "* 앤티:" and split by spaces, handling multiple spaces
-            parts = line.replace("* 앤티:", "").strip().split("원")
-
-            # Extract ante amount (removing '-', commas, and '원')
-            ante_amount = int(parts[0].replace("원", "").replace(",", "").replace("-", ""))
-
-            # Extract remaining stack (removing parentheses, commas, and '원')
-            remaining_stack = int(parts[1].strip("()").replace(",", "").replace("원", ""))
-
-            parsed_line.amount = ante_amount
-            parsed_line.remaining_stack = remaining_stack
-
-        # 홀 카드딜 (Hole Cards Deal): Player's starting hand
-        elif "홀 카드딜:" in line:
-            parsed_line = HoleCardsEntry()
-            parsed_line.hole_cards = extract_hole_cards(line)
-
-        # 커뮤니티 카드 딜 (Community Card Deal): The board cards for each street
-        elif "커뮤니티 카드 딜:" in line:
-            parsed_line = CommunityCardsEntry()
-            h_start = line.index("H(") + 2
-            h_end = line.index(")", h_start)
-            hole_cards_section = line[h_start:h_end]
-            # Change 10 to T
-            hole_cards_section = hole_cards_section.replace("10", "T")
-            parsed_line.hole_cards = [hole_cards_section[i:i + 2] for i in range(0, len(hole_cards_section), 2)]
-
-            # Step 2: Extract community cards after "C "
-            c_start = line.index("C (") + 2  # Start after "C ("
-            c_section = line[c_start:]  # Get everything after "C "
-            # Change 10 to T
-            c_section = c_section.replace("10", "T")
-
-            # Step 3: Split community cards while keeping empty streets
-            c_groups = c_section.split(") (")  # Split at street boundaries
-
-            c_groups = [group.replace("(", "").replace(")", "").strip() for group in c_groups]  # Clean up
-            cc = [[group[i:i + 2] for i in range(0, len(group), 2)] if group else [] for group in c_groups]
-            parsed_line.community_cards = cc
-
-        # 베팅 (Betting Action): Player actions (call, check, fold, raise)
-        elif "베팅:" in line:
-            parsed_line = _parse_betting_action(line)
-
-            # Keep track of the last action so we can add an uncalled_bet to it
-            last_action = parsed_line
-
-        elif "# 공베팅 반환" in line:
-            start_index = line.find("# 공베팅 반환 [") + len("# 공베팅 반환 [")
-            end_index = line.find("원]", start_index)
-            uncalled_bet_str = line[start_index:end_index].replace(",", "")
-            uncalled_bet = int(uncalled_bet_str)
-
-            if last_action is not None:
-                last_action.uncalled_bet = uncalled_bet
-
-        elif "결과:" in line:
-            parsed_line: ResultsEntry = ResultsEntry()
-            parsed_line.result, parsed_line.showdown = parse_result_line(line)
-
-        elif constants.ENTRY_FEE in line:
-            parsed_line: EntryFeeEntry = EntryFeeEntry()
-            parsed_line.amount, parsed_line.remaining_stack = _extract_bet_and_stack_constants(line)
-
-        # Must be an if, not elif, because the win money string can also appear in the # returned bet string
-        if "* 종료:" in line:
+        # Same as classify_line, inlined because this loop runs for every line of every player
+        match = prefix_match(line)
+        if match is not None:
+            marker = match.group(1)
+            if marker is None:
+                continue
+            ends = marker == END
+        else:
+            marker, ends = classify_line(line)
+
+        if marker is not None and marker != END:
+            if marker == UNCALLED_BET:
+                if last_action is not None:
+                    last_action.uncalled_bet = _parse_uncalled_bet(line)
+            else:
+                parsed_line: HistoryLine = _LINE_PARSERS[marker](line)
+                parsed_lines.append(parsed_line)
+
+                # Keep track of the last action so we can add an uncalled_bet to it
+                if marker == BETTING:
+                    last_action = parsed_line
+
+        # The win money string can also appear in the # returned bet line
+        if ends:
             win_money, credit = parse_winmoney_line(line)
             if win_money is not None and credit is not None:
-                win_money_line = WinMoneyEntry()
-                win_money_line.amount = win_money
-                win_money_line.remaining_stack = credit
-
-        if parsed_line is not None:
-            parsed_lines.append(parsed_line)
+                win_money_line = WinMoneyEntry(amount=win_money, final_stack=credit)
 
     return parsed_lines, win_money_line
 
+# 시작 (Start of the hand): Contains hand metadata like StageNo, Credit, Blinds
+def _parse_start(line: str) -> StartEntry:
+    fields = {}
+    for name, value in _START_FIELD.findall(line):
+        if name == "StageNo":
+            fields["stage_number"] = value
+        elif name in _START_CHIP_FIELDS:
+            fields[_START_CHIP_FIELDS[name]] = _chips(value)
+    return StartEntry(**fields)
+
+# NICKNAME (플레이어 이름): Identifies the player
+def _parse_nickname(line: str) -> PlayerEntry:
+    start = line.find("[") + 1
+    end = line.find("]", start)
+    return PlayerEntry(nickname=line[start:end])
+
+def _parse_ante(line: str) -> AnteEntry:
+    # Remove "* 앤티:" and split by spaces, handling multiple spaces
+    parts = line.replace("* 앤티:", "").strip().split("원")
+
+    # Extract ante amount (removing '-', commas, and '원')
+    amount = int(parts[0].replace("원", "").replace(",", "").replace("-", ""))
+
+    # Extract remaining stack (removing parentheses, commas, and '원')
+    remaining_stack = int(parts[1].strip("()").replace(",", "").replace("원", ""))
+
+    return AnteEntry(amount=amount, remaining_stack=remaining_stack)
+
+# 홀 카드딜 (Hole Cards Deal): Player's starting hand
+def _parse_hole_cards(line: str) -> HoleCardsEntry:
+    return HoleCardsEntry(hole_cards=extract_hole_cards(line))
+
+# 커뮤니티 카드 딜 (Community Card Deal): The board cards for each street
+def _parse_community_cards(line: str) -> CommunityCardsEntry:
+    h_start = line.index("H(") + 2
+    h_end = line.index(")", h_start)
+    hole_cards = parse_korean_cards(line[h_start:h_end])
+
+    # Step 2: Extract community cards after "C "
+    c_start = line.index("C (") + 2  # Start after "C ("
+    c_section = line[c_start:]  # Get everything after "C "
+
+    # Step 3: Split community cards while keeping empty streets
+    c_groups = c_section.split(") (")  # Split at street boundaries
+
+    c_groups = [group.replace("(", "").replace(")", "").strip() for group in c_groups]  # Clean up
+    community_cards = [parse_korean_cards(group) for group in c_groups]
+    return CommunityCardsEntry(hole_cards=hole_cards, community_cards=community_cards)
+
+def _parse_uncalled_bet(line: str) -> int:
+    start_index = line.find("# 공베팅 반환 [") + len("# 공베팅 반환 [")
+    end_index = line.find("원]", start_index)
+    return int(line[start_index:end_index].replace(",", ""))
+
+def _parse_result(line: str) -> ResultsEntry:
+    result, showdown = parse_result_line(line)
+    return ResultsEntry(result=result, showdown=showdown)
+
+def _parse_entry_fee(line: str) -> EntryFeeEntry:
+    amount, remaining_stack = _extract_bet_and_stack_constants(line)
+    return EntryFeeEntry(amount=amount, remaining_stack=remaining_stack)
+
 def parse_winmoney_line(line):
-    pattern = r"WinMoney\[([\d,]+)원\] Credit\[([\d,]+)원\]"
-    match = re.search(pattern, line)
+    match = _WIN_MONEY.search(line)
 
     if match:
         # Convert captured values to integers (removing commas)
@@ -149,40 +193,23 @@ def parse_winmoney_line(line):
 
 def extract_hole_cards(line):
     """
-    Extracts and normalizes hole cards from poker hand history lines.
+    Extracts the hole cards from a hole cards deal line.
 
     Parameters:
-        lines (list): A list of strings containing hand history lines with hole cards.
+        line (str): A hand history line with hole cards, eg. "* 홀 카드딜: ♣J(49) ♣9(47) [J 탑]".
 
     Returns:
-        list: A list of strings representing the extracted and formatted hole cards.
+        tuple: The two cards encoded by the cards module, or an empty tuple if there aren't two.
     """
-    # Mapping suit symbols to standard poker notation
-    suit_map = {
-        "♥": "h",  # Hearts
-        "♠": "s",  # Spades
-        "♣": "c",  # Clubs
-        "◆": "d"   # Diamonds (Korean uses ◆ instead of ♦)
-    }
-
-    # Convert 10 to T
-    rank_map = {"10": "T"}
-
-    hole_cards = ""
-
     # Extract the two hole cards using regex
-    match = re.findall(r"([♠♥♣◆])(\d+|A|J|Q|K)", line)
-    if match and len(match) == 2:
-        # Normalize rank and suit
-        normalized_cards = [
-            (rank_map.get(rank, rank) + suit_map[suit]) for suit, rank in match
-        ]
-        hole_cards = " ".join(normalized_cards)
+    match = _HOLE_CARD.findall(line)
+    if len(match) != 2:
+        return ()
 
-    return hole_cards
+    return from_korean(match[0]), from_korean(match[1])
 
 def parse_result_line(line):
-    pattern = re.search(r"결과: (패배|승리) \[족보:(.*?)\] \[카드:(.*?)\]( - (기권승|기권))?", line)
+    pattern = _RESULT.search(line)
 
     if not pattern:
         return None  # Return None if the line does not match
@@ -205,57 +232,46 @@ def parse_result_line(line):
 
     return result, showdown
 
-def parse_chips(text, part):
-    val = int(part.split(text)[1].replace(",", "").replace(MoneyUnit, ""))
-
-    return val
+def _chips(value):
+    return int(value.replace(",", "").replace(MoneyUnit, ""))
 
 
 def _parse_betting_action(line: str) -> ActionEntry:
     line = line.replace("* 베팅:", "").strip()
 
+    fast_action = _parse_common_betting_action(line)
+    if fast_action is not None:
+        return fast_action
+
     bet_size, remaining_stack = _extract_bet_and_stack_constants(line)
 
     # Check if it's a blind posting (Small Blind / Big Blind)
-    if "블라인드:SMALL" in line or "블라인드:BIG" in line:
-
-        blind_entry = PostBlindEntry("small") if "블라인드:SMALL" in line else PostBlindEntry("big")
-        blind_entry.amount = bet_size
-        blind_entry.remaining_stack = remaining_stack
+    blind = _BLIND_MARKERS.search(line)
+    if blind:
 
-        return blind_entry
+        return PostBlindEntry(blind_type="small" if SMALL_BLIND in line else "big",
+                              amount=bet_size, remaining_stack=remaining_stack)
 
-    parsed_data = ActionEntry()
-    parsed_data.amount = bet_size
-    parsed_data.remaining_stack = remaining_stack
-
-    # Extract betting action
-    if CHECK in line:
-        parsed_data.action = BetType.CHECK
-
-    if CALL in line:
-        parsed_data.action = BetType.CALL
-
-    if FOLD in line:
-        parsed_data.action = BetType.FOLD
-
-    if any(term in line for term in [GENERIC, QUARTER_POT, HALF_POT, FULL_POT, RAISE, ALL_IN]):
-        parsed_data.action = BetType.BET
-
-    if ALL_IN in line:
-        parsed_data.action = BetType.ALL_IN
+    parsed_data = ActionEntry(amount=bet_size, remaining_stack=remaining_stack)
 
+    # Extract betting action, the later checks take precedence
     if RAISE in line:
         parsed_data.action = BetType.RAISE
-
-    # TODO extract bet sizes
-    # Extract remaining stack from parentheses "(xxx,xxx원)"
-    remaining_stack = None
+    elif ALL_IN in line:
+        parsed_data.action = BetType.ALL_IN
+    elif _BET_MARKERS.search(line):
+        parsed_data.action = BetType.BET
+    elif FOLD in line:
+        parsed_data.action = BetType.FOLD
+    elif CALL in line:
+        parsed_data.action = BetType.CALL
+    elif CHECK in line:
+        parsed_data.action = BetType.CHECK
 
     # Uncalled bet
-    matches_after_marker = re.findall(r'\[(.*?)]', line)
+    matches_after_marker = _BRACKETED.findall(line)
     # Sometimes the uncalled bet will be at the start of the line
-    if "# 공베팅 반환" in line:
+    if UNCALLED_BET in line:
         if len(matches_after_marker) >= 0:
             parsed_data.uncalled_bet = matches_after_marker[0]
 
@@ -287,33 +303,53 @@ def _parse_betting_action(line: str) -> ActionEntry:
     return parsed_data
 
 
-def _extract_bet_and_stack_constants(line):
+def _parse_common_betting_action(line: str) -> ActionEntry | None:
+    """
+    Parses the betting line shapes that make up nearly all actions with a single regex.
+    Gives the same result as the general path; returns None for anything else so that path handles it.
+    """
+    match = _SIZED_BET.match(line)
+    if match is not None:
+        marker, amount, stack, betting_round, betting_position = match.groups()
+        action = _SIZED_BET_TYPES.get(marker, BetType.BET)
+    else:
+        match = _CHECK_CALL_FOLD.match(line)
+        if match is None:
+            return None
+        amount, stack, betting_round, betting_position = match.group("amount", "stack", "round", "position")
+        action = _CHECK_CALL_FOLD_TYPES[match["verb"] or match["fold"]]
+
+    # Positional, in field order: action, amount, remaining_stack, betting_round, betting_position
+    return ActionEntry(
+        action,
+        int(amount.replace(",", "")) if amount else 0,
+        int(stack.replace(",", "")),
+        int(betting_round),
+        int(betting_position)
+    )
 
-    bet_size = 0
-    remaining_stack = 0
 
-    # Extract remaining stack first
-    stack_match = re.search(rf"Credit\(([\d,]+){MoneyUnit}\)|Creadit:\s*([\d,]+){MoneyUnit}|\(([\d,]+){MoneyUnit}\)", line)
+def _extract_bet_and_stack_constants(line):
     bet_match = None
 
     # **Case 1: Quarter, Half, Full Pot, Raise, All-In (stack found in Credit(...))**
-    if any(term in line for term in [GENERIC, QUARTER_POT, HALF_POT, FULL_POT, RAISE, ALL_IN]):
-        stack_match = re.search(r"Credit\(([\d,]+)원\)", line)
-        bet_match = re.search(r"\(([\d,]+)원\)", line)  # Extract bet size
+    if _BET_MARKERS.search(line):
+        stack_match = _BET_STACK.search(line)
+        bet_match = _BET_SIZE.search(line)  # Extract bet size
 
-    elif any(term in line for term in [SMALL_BLIND, BIG_BLIND]):
-        stack_match = re.search(r"Creadit:\s*([\d,]+)원", line)  # Extract remaining stack
-        bet_match = re.search(r"\[금액:([\d,]+)원\]", line)  # Extract blind amount
+    elif _BLIND_MARKERS.search(line):
+        stack_match = _BLIND_STACK.search(line)  # Extract remaining stack
+        bet_match = _AMOUNT.search(line)  # Extract blind amount
 
     elif constants.ENTRY_FEE in line:
-        stack_match = re.search(r"Credit:([\d,]+)원", line)
-        bet_match = re.search(r"\[금액:([\d,]+)원\]", line)  # Extract blind amount
+        stack_match = _FEE_STACK.search(line)
+        bet_match = _AMOUNT.search(line)  # Extract blind amount
 
     # **Case 3: Checks, Calls, and Folds (stack found inside parentheses `()`)**
     else:
-        stack_match = re.search(r"\(([\d,]+)원\)", line)  # Extract remaining stack
+        stack_match = _BET_SIZE.search(line)  # Extract remaining stack
         if CALL in line or CHECK in line:  # Calls and checks have a bet amount
-            bet_match = re.search(r"-([\d,]+)원", line)
+            bet_match = _CALL_SIZE.search(line)
         elif FOLD in line:  # Folds always have a bet size of 0
             bet_match = None
 
@@ -321,4 +357,17 @@ def _extract_bet_and_stack_constants(line):
     remaining_stack = int(stack_match.group(1).replace(",", "")) if stack_match else 0
     bet_size = int(bet_match.group(1).replace(",", "")) if bet_match else 0
 
-    return bet_size, remaining_stack
\ No newline at end of file
+    return bet_size, remaining_stack
+
+
+# Extractor for every line marker that produces an entry
+_LINE_PARSERS = {
+    START: _parse_start,
+    NICKNAME: _parse_nickname,
+    ANTE: _parse_ante,
+    HOLE_CARDS: _parse_hole_cards,
+    COMMUNITY_CARDS: _parse_community_cards,
+    BETTING: _parse_betting_action,
+    RESULT: _parse_result,
+    ENTRY_FEE: _parse_entry_fee,
+}
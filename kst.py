@@ -0,0 +1,119 @@
+"""
+Parsing and formatting of the site's Korea Standard Time timestamps without pytz.
+
+Asia/Seoul has been UTC+9 without daylight saving time since 1988, so every timestamp in a hand history
+can be formatted with plain arithmetic. Older dates fall back to pytz, which knows the historical rules.
+"""
+import re
+from datetime import datetime, date
+from functools import lru_cache
+
+TIMEZONE_NAME = "KST"
+# First year with a fixed UTC+9 offset and no daylight saving time (the last KDT ended in October 1988)
+FIXED_OFFSET_SINCE = 1989
+
+MERIDIEM_HOURS = {"오전": 0, "오후": 12}  # AM, PM
+
+# The ISO stamp the export tool appends to file names, eg. parseerror2_2025-02-08T20-57-51.html
+_FILENAME_STAMP = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})T(\d{1,2})-(\d{1,2})-(\d{1,2})", re.ASCII)
+
+
+@lru_cache(maxsize=1024)
+def _parse_prefix(prefix: str) -> tuple[str, int, date]:
+    """
+    Parses the 'YYYY-MM-DD 오전/오후' part, which most hands of a session share.
+
+    Returns:
+    - The date formatted as 'YYYY/MM/DD', the hours to add to the 12 hour clock and the date itself.
+    """
+    date_part, _, meridiem = prefix.partition(" ")
+    fields = date_part.split("-")
+    if (len(fields) != 3 or meridiem not in MERIDIEM_HOURS or len(fields[0]) != 4
+            or not all(_is_number(field, 4 if i == 0 else 2) for i, field in enumerate(fields))):
+        raise ValueError(f"time data '{prefix}' does not match format 'YYYY-MM-DD 오전/오후'")
+
+    day = date(int(fields[0]), int(fields[1]), int(fields[2]))
+    return f"{day.year:04d}/{day.month:02d}/{day.day:02d}", MERIDIEM_HOURS[meridiem], day
+
+
+def _is_number(text: str, max_length: int) -> bool:
+    return 0 < len(text) <= max_length and text.isascii() and text.isdigit()
+
+
+def _parse_clock(clock: str, meridiem_hours: int) -> tuple[int, int, int]:
+    fields = clock.split(":")
+    if len(fields) != 3 or not all(_is_number(f, 2) for f in fields):
+        raise ValueError(f"time data '{clock}' does not match format 'HH:MM:SS'")
+
+    hour, minute, second = int(fields[0]), int(fields[1]), int(fields[2])
+    if not 1 <= hour <= 12 or minute > 59 or second > 59:
+        raise ValueError(f"time data '{clock}' is out of range")
+
+    # 12 is the first hour of the half day: 오전 12시 is midnight, 오후 12시 is noon
+    return hour % 12 + meridiem_hours, minute, second
+
+
+def _split(timestamp: str) -> tuple[str, str]:
+    prefix, _, clock = timestamp.strip().rpartition(" ")
+    return prefix, clock
+
+
+def parse_korean_timestamp(timestamp: str) -> datetime:
+    """
+    Parses a timestamp as shown by the site, eg. '2024-11-10 오후 3:32:02'.
+
+    Returns:
+    - A naive datetime in Korea Standard Time.
+    """
+    prefix, clock = _split(timestamp)
+    _, meridiem_hours, day = _parse_prefix(prefix)
+    hour, minute, second = _parse_clock(clock, meridiem_hours)
+    return datetime(day.year, day.month, day.day, hour, minute, second)
+
+
+def format_korean_timestamp(timestamp: str) -> str:
+    """
+    Reformats a timestamp as shown by the site without building a datetime.
+
+    Returns:
+    - The timestamp as 'YYYY/MM/DD HH:MM:SS KST', eg. '2024/11/10 15:32:02 KST'.
+    """
+    prefix, clock = _split(timestamp)
+    formatted_date, meridiem_hours, day = _parse_prefix(prefix)
+    if day.year < FIXED_OFFSET_SINCE:
+        return format_kst(parse_korean_timestamp(timestamp))
+
+    hour, minute, second = _parse_clock(clock, meridiem_hours)
+    return f"{formatted_date} {hour:02d}:{minute:02d}:{second:02d} {TIMEZONE_NAME}"
+
+
+def format_kst(dt_obj: datetime) -> str:
+    """
+    Formats a naive datetime in Korea Standard Time.
+
+    Returns:
+    - The datetime as 'YYYY/MM/DD HH:MM:SS KST'.
+    """
+    if dt_obj.tzinfo is not None:
+        raise ValueError("Not naive datetime (tzinfo is already set)")
+
+    if dt_obj.year < FIXED_OFFSET_SINCE:
+        # Historical offsets and daylight saving time, only pytz knows these
+        import pytz
+        return pytz.timezone("Asia/Seoul").localize(dt_obj).strftime("%Y/%m/%d %H:%M:%S %Z")
+
+    return (f"{dt_obj.year:04d}/{dt_obj.month:02d}/{dt_obj.day:02d} "
+            f"{dt_obj.hour:02d}:{dt_obj.minute:02d}:{dt_obj.second:02d} {TIMEZONE_NAME}")
+
+
+def parse_filename_stamp(stamp: str) -> datetime:
+    """
+    Parses the 'YYYY-MM-DDTHH-MM-SS' stamp of an exported file name.
+
+    Returns:
+    - A naive datetime in Korea Standard Time.
+    """
+    match = _FILENAME_STAMP.fullmatch(stamp)
+    if match is None:
+        raise ValueError(f"time data '{stamp}' does not match format 'YYYY-MM-DDTHH-MM-SS'")
+    return datetime(*map(int, match.groups()))
@@ -1,61 +1,323 @@
+import argparse
+import hashlib
 import os
-import sys
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
 from pathlib import Path
-from concurrent.futures import ProcessPoolExecutor, as_completed
-from itertools import islice
+from typing import List, Tuple
 
 import constants
-from hand_parser import parse
+import rowcache
+from discovery import ORDERS, WALK
+from executors import EXECUTOR_CHOICES, create_executor, default_workers
+from archives import ArchiveMember, archive_stem, is_archive
+from bundles import BundledHand, BundleWriter, FILES, OUTPUT_MODES, DEFAULT_ROLLING_HANDS, bundle_key
+from hand_parser import page_hands, row_hands
+from html_parser import BACKENDS, DEFAULT_BACKEND, get_backend
+from manifest import ConversionManifest, ManifestEntry, describe_file
+from pokerstars_converter import PokerStarsConverter
+from profiling import DEFAULT_TOP, PROFILES_PER_THREAD, BatchProfiler, ProfileCollector, WorkerProfile
+from sinks import COMPRESSIONS, EXTENSIONS, NONE, available_compressions, open_sink, parse_compression
+from scheduler import AdaptiveBatcher, batched, bounded_map
+from timings import HTML, READ, WRITE, PipelineTimings, StageTimer, measuring, stage
 from utils import find_files, extract_datetime_from_filename
 
-def process_file(file, data_folder, output_folder):
+@dataclass(frozen=True)
+class ConversionOptions:
+    """Settings shared by every worker task."""
+    currency_symbol: str = "$"
+    html_backend: str = DEFAULT_BACKEND
+    output_mode: str = FILES
+    compression: str = NONE
+    timings: bool = False  # Measure the time spent in each stage of the conversion
+    profile: bool = False  # Profile the conversion of every batch with cProfile
+    raw_cache: str | None = None  # Path of the cache of the rows extracted from the input files, see rowcache
+    refresh_raw_cache: bool = False  # Extract the rows of every file again instead of reading them from the cache
+
+@dataclass
+class BatchResult:
+    """Summary returned by a worker for one batch of files."""
+    converted: int = 0
+    entries: List[ManifestEntry] = field(default_factory=list)
+    failures: List[Tuple[str, str]] = field(default_factory=list)  # (file, error message)
+    hands: List[BundledHand] = field(default_factory=list)  # Converted hands for the bundle writer, bundled modes only
+    elapsed: float = 0.0  # Wall time spent on the batch inside the worker
+    timings: PipelineTimings | None = None  # Stage timings of the batch's files, when asked for
+    profile: WorkerProfile | None = None  # cProfile stats of the batch, when asked for
+    raw_rows: List[Tuple[bytes, bytes]] = field(default_factory=list)  # (digest, encoded rows) to add to the raw row cache
+
+    @property
+    def files(self):
+        return self.converted + len(self.failures)
+
+def manifest_version(options: ConversionOptions) -> str:
+    """The converter version, tagged with the output settings so that changing them converts every file again."""
+    version = constants.CONVERTER_VERSION
+    if options.output_mode != FILES:
+        version += f"+{options.output_mode}"
+    if options.compression != NONE:
+        version += f"+{options.compression}"
+    return version
+
+def read_input(file):
+    with stage(READ):
+        stat = file.stat()
+        raw_content = file.read_bytes()
+        return stat, raw_content, raw_content.decode("utf-8")
+
+def extract_hands(raw_content: bytes, html_content: str, correct_datetime, options: ConversionOptions, new_rows: list = None):
+    """
+    Reads the hands of a page like page_hands. With the raw row cache, the rows of a file already in the cache
+    are taken from it without parsing the HTML, and the rows of the others are added to new_rows,
+    for the main process to append to the cache. Refreshing the cache adds the rows of every file.
+    """
+    if not options.raw_cache:
+        return page_hands(html_content, correct_datetime, options.html_backend)
+
+    digest = hashlib.sha256(raw_content).digest()
+    with stage(READ):
+        rows = None if options.refresh_raw_cache else rowcache.reader(options.raw_cache).get(digest)
+    if rows is None:
+        with stage(HTML):
+            rows = list(get_backend(options.html_backend).iter_rows(html_content))
+        if new_rows is not None:
+            new_rows.append((digest, rowcache.encode_rows(rows)))
+    return row_hands(rows, correct_datetime)
+
+def convert_file(file, data_folder, output_folder, options: ConversionOptions = ConversionOptions(), new_rows: list = None) -> ManifestEntry:
+    stat, raw_content, html_content = read_input(file)
+    hands, corrected_timestamp = extract_hands(raw_content, html_content, extract_datetime_from_filename(file), options, new_rows)
+
+    # Create subdirectories relative to data_folder
+    relative_path = file.relative_to(data_folder)
+    output_filepath = output_folder / relative_path
+    output_filepath = output_filepath.with_suffix(".txt" + EXTENSIONS[options.compression])
+    # Archive member names are checked when the archive is read, this also catches links and anything that got past
+    if not output_filepath.resolve().is_relative_to(Path(output_folder).resolve()):
+        raise ValueError(f"output path '{output_filepath}' is outside the output folder")
+    output_filepath.parent.mkdir(parents=True, exist_ok=True)
+
+    # Hands are streamed into a temporary file, so a failed conversion never leaves a partial output behind
+    temp_filepath = output_filepath.with_name(output_filepath.name + ".tmp")
+    try:
+        # Opening, flushing and closing the sink count as writing, the parsing and formatting inside have their own stages
+        with stage(WRITE), open_sink(temp_filepath, options.compression) as output:
+            written = PokerStarsConverter(options.currency_symbol).convert_many(hands, output, corrected_timestamp)
+        if not written:
+            raise ValueError("no hand history found")
+        with stage(WRITE):
+            os.replace(temp_filepath, output_filepath)
+    finally:
+        temp_filepath.unlink(missing_ok=True)
+
+    return describe_file(file, data_folder, raw_content, stat)
+
+def bundle_file(file, data_folder, options: ConversionOptions, new_rows: list = None) -> Tuple[ManifestEntry, List[BundledHand]]:
+    """Converts the hands of a file for the bundle writer, which runs in the main process."""
+    stat, raw_content, html_content = read_input(file)
+    hands, correct_datetime = extract_hands(raw_content, html_content, extract_datetime_from_filename(file), options, new_rows)
+
+    converter = PokerStarsConverter(options.currency_symbol)
+    bundled = [BundledHand(key=bundle_key(options.output_mode, hand, correct_datetime),
+                           data=converter.convert_to_pokerstars_format(hand, correct_datetime).encode("utf-8"))
+               for hand in hands]
+    if not bundled:
+        raise ValueError("no hand history found")
+
+    return describe_file(file, data_folder, raw_content, stat), bundled
+
+def process_batch(files, data_folder, output_folder, options: ConversionOptions = ConversionOptions()) -> BatchResult:
+    """Converts a list of files in one task so the IPC round-trip is paid once per batch."""
+    start = time.perf_counter()
+    result = BatchResult(timings=PipelineTimings() if options.timings else None)
+    profiler = BatchProfiler() if options.profile else None
+
+    with profiler or nullcontext():
+        _process_files(files, data_folder, output_folder, options, result)
+
+    if profiler:
+        result.profile = profiler.result()
+    result.elapsed = time.perf_counter() - start
+    return result
+
+def _process_files(files, data_folder, output_folder, options: ConversionOptions, result: BatchResult):
+    for file in files:
+        timer = StageTimer() if options.timings else None
+        new_rows = []
+        try:
+            with measuring(timer):
+                if options.output_mode == FILES:
+                    result.entries.append(convert_file(file, data_folder, output_folder, options, new_rows))
+                else:
+                    entry, hands = bundle_file(file, data_folder, options, new_rows)
+                    result.entries.append(entry)
+                    result.hands.extend(hands)
+            result.converted += 1
+            # Only the rows of converted files are cached, a file that failed is extracted again next time
+            result.raw_rows.extend(new_rows)
+        except Exception as e:
+            result.failures.append((str(file), str(e)))
+        if timer:
+            result.timings.add_file(timer)
+
+def batch_size_arg(value):
+    if value == "auto":
+        return value
+    size = int(value)
+    if size < 1:
+        raise argparse.ArgumentTypeError("batch size must be at least 1")
+    return size
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return number
+
+def compression_arg(value):
     try:
-        html_content = file.read_text(encoding="utf-8")
-        corrected_timestamp = extract_datetime_from_filename(file)
-        converted_content = parse(html_content, corrected_timestamp, "$")
-
-        # Create subdirectories relative to data_folder
-        relative_path = file.relative_to(data_folder)
-        output_filepath = output_folder / relative_path
-        output_filepath = output_filepath.with_suffix(".txt")
-
-        output_filepath.parent.mkdir(parents=True, exist_ok=True)
-        output_filepath.write_text(converted_content, encoding="utf-8")
-
-        return 1
-    except Exception as e:
-        print(f"Error parsing file '{file}': {e}")
-        return 0
-
-def chunked_iterable(iterable, size):
-    """Yield successive chunks of a given size from an iterable."""
-    iterator = iter(iterable)
-    while chunk := list(islice(iterator, size)):
-        yield chunk
-
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python script.py <data_folder>")
-        sys.exit(1)
-
-    data_folder = Path(sys.argv[1])
-    output_folder = data_folder.parent / f"{data_folder.name}_converted"
-
-    max_workers = min(4, os.cpu_count() or 1)
+        compression = parse_compression(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    if compression not in available_compressions():
+        raise argparse.ArgumentTypeError(f"{compression} compression needs the zstandard package")
+    return compression
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Convert Korean hand histories to PokerStars format")
+    parser.add_argument("data_folder", type=Path,
+                        help="Folder containing the *.html hand histories, or a zip/tar archive of them. "
+                             "Archives inside the folder are read too, without extracting them")
+    parser.add_argument("--executor", choices=EXECUTOR_CHOICES, default="process",
+                        help="Backend used to run the conversion (default: process)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of worker threads or processes (default: number of CPUs)")
+    parser.add_argument("--max-in-flight", type=int, default=None,
+                        help="Maximum number of batches queued in the pool at once (default: 2 x workers)")
+    parser.add_argument("--batch-size", type=batch_size_arg, default="auto",
+                        help="Files converted per worker task, or 'auto' to tune it from observed timings (default: auto)")
+    parser.add_argument("--html-parser", choices=list(BACKENDS), default=DEFAULT_BACKEND,
+                        help=f"HTML extraction backend (default: {DEFAULT_BACKEND})")
+    parser.add_argument("--order", choices=ORDERS, default=WALK,
+                        help="'walk' converts files while the folder is still being scanned, 'largest' scans it all "
+                             "first and converts the largest files first so they don't finish last (default: walk)")
+    parser.add_argument("--scan-workers", type=positive_int, default=1,
+                        help="Threads listing subfolders at the same time, helps on network mounts (default: 1)")
+    parser.add_argument("--force", action="store_true",
+                        help="Convert every file, even if the manifest says it is up to date, and extract the rows "
+                             "of every file again instead of reading them from the raw row cache")
+    parser.add_argument("--output-mode", choices=OUTPUT_MODES, default=FILES,
+                        help="'files' writes one .txt per input file; 'day', 'stake' and 'rolling' bundle the hands "
+                             "per day played, per blinds, or all together (default: files)")
+    parser.add_argument("--bundle-hands", type=positive_int, default=None,
+                        help=f"Start a new bundle part after this many hands (default: {DEFAULT_ROLLING_HANDS} for rolling, "
+                             "no limit otherwise)")
+    parser.add_argument("--bundle-mb", type=float, default=None,
+                        help="Start a new bundle part before it grows past this many MB of uncompressed text")
+    parser.add_argument("--compress", type=compression_arg, default=NONE, metavar="{" + ",".join(COMPRESSIONS) + "}",
+                        help="Compress the output while it is written, by name or by extension, eg. gzip, .gz "
+                             "or txt.gz (default: none, zstd needs the zstandard package)")
+    parser.add_argument("--timings", action="store_true",
+                        help="Print the time spent in each stage of the conversion, with per file percentiles")
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile the conversion with cProfile in every worker, and write the merged stats and a "
+                             "report of the slowest functions to <output folder>/profile. Not available with the "
+                             "thread executor from Python 3.12 on")
+    parser.add_argument("--profile-top", type=positive_int, default=DEFAULT_TOP,
+                        help=f"Functions listed by the profile report (default: {DEFAULT_TOP})")
+    parser.add_argument("--no-raw-cache", action="store_true",
+                        help="Don't cache the rows extracted from the HTML. The cache lets a run after a converter "
+                             "update skip parsing the HTML of files it has seen before")
+    args = parser.parse_args(argv)
+    if args.profile and args.executor == "thread" and not PROFILES_PER_THREAD:
+        parser.error("--profile can't be used with the thread executor from Python 3.12 on, "
+                     "where only one profiler can run at a time, use the process or serial executor")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    data_folder = args.data_folder
+    input_name = archive_stem(data_folder) if is_archive(data_folder) else data_folder.name
+    output_folder = data_folder.parent / f"{input_name}_converted"
+
+    options = ConversionOptions(html_backend=args.html_parser, output_mode=args.output_mode, compression=args.compress,
+                                timings=args.timings, profile=args.profile,
+                                raw_cache=None if args.no_raw_cache else str(output_folder / rowcache.rows_name(args.html_parser)),
+                                refresh_raw_cache=args.force)
+    max_workers = 1 if args.executor == "serial" else args.workers or default_workers()
+    max_in_flight = args.max_in_flight or max_workers * 2
+    batcher = AdaptiveBatcher() if args.batch_size == "auto" else None
     processed = 0
+    skipped = 0
+    timings = PipelineTimings() if args.timings else None
+    profiles = ProfileCollector() if args.profile else None
+    start = time.perf_counter()
+
+    def pending_files():
+        nonlocal skipped
+        for file in find_files(data_folder, "*.html", order=args.order, workers=args.scan_workers):
+            if not args.force and manifest.is_current(file, data_folder):
+                skipped += 1
+                continue
+            if isinstance(file, ArchiveMember):
+                # Read while the archive is open, the content is sent to the worker with the member
+                file.read_bytes()
+            yield file
 
-    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+    if args.output_mode == FILES:
+        bundles = nullcontext()
+    else:
+        max_bytes = int(args.bundle_mb * 2 ** 20) if args.bundle_mb else None
+        bundles = BundleWriter(output_folder, args.output_mode, args.bundle_hands, max_bytes, args.compress)
+
+    # --force extracts every file again, and replaces the cache with what it found
+    row_cache = rowcache.RowStore(options.raw_cache, append=True, replace=args.force) if options.raw_cache else nullcontext()
+
+    with ConversionManifest(output_folder, manifest_version(options)) as manifest, bundles as bundle_writer, \
+            row_cache as row_store, create_executor(args.executor, max_workers) as executor:
         try:
-            for chunk in chunked_iterable(find_files(data_folder, "*.html"), max_workers):
-                futures = [executor.submit(process_file, file, data_folder, output_folder) for file in chunk]
-                for future in as_completed(futures):
-                    processed += future.result()
+            batches = batcher.batches(pending_files()) if batcher else batched(pending_files(), args.batch_size)
+            for result in bounded_map(executor, process_batch, batches, max_in_flight,
+                                      data_folder, output_folder, options):
+                # Hands are written before their files are recorded, so an interrupted run converts them again
+                write_start = time.perf_counter()
+                for hand in result.hands:
+                    bundle_writer.write(hand)
+                if timings:
+                    timings.merge(result.timings)
+                    if result.hands:
+                        timings.add(WRITE, time.perf_counter() - write_start, len(result.hands))
+                if profiles:
+                    profiles.add(result.profile)
+                if result.raw_rows:
+                    for digest, payload in result.raw_rows:
+                        row_store.put(digest, payload)
+                    # Flushed, so the workers find them from their next batch on
+                    row_store.flush()
+                for entry in result.entries:
+                    manifest.record(entry)
+                for file, error in result.failures:
+                    print(f"Error parsing file '{file}': {error}")
+
+                processed += result.converted
+                if batcher:
+                    batcher.observe(result.files, result.elapsed)
 
         except KeyboardInterrupt:
             print("\nProcess interrupted by user.")
             executor.shutdown(wait=False, cancel_futures=True)
+            if options.raw_cache:
+                # The interrupt doesn't reach the store, which would otherwise replace the cache with a partial one
+                row_store.close(keep=False)
 
-    print(f"Processed {processed}")
+    print(f"Processed {processed}, skipped {skipped} unchanged")
+    if timings:
+        print(timings.summary(time.perf_counter() - start))
+    if profiles and profiles.batches:
+        print(profiles.write(output_folder / "profile", args.profile_top))
+        print(f"Profiles written to {output_folder / 'profile'}")
 
 if __name__ == "__main__":
     main()
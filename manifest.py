@@ -0,0 +1,134 @@
+"""
+Persistent record of converted files so re-runs only process new or changed hands
+"""
+import hashlib
+import json
+import os
+from dataclasses import dataclass, asdict, replace
+from pathlib import Path
+
+import constants
+
+MANIFEST_NAME = ".conversion_manifest.jsonl"
+
+
+@dataclass
+class ManifestEntry:
+    """Describes one input file as it was when it was last converted."""
+    path: str  # Path relative to the data folder, always with forward slashes
+    size: int
+    mtime_ns: int
+    sha256: str
+    version: str  # constants.CONVERTER_VERSION at the time of conversion
+
+
+def relative_key(file: Path, data_folder: Path) -> str:
+    return file.relative_to(data_folder).as_posix()
+
+
+def describe_file(file: Path, data_folder: Path, content: bytes, stat: os.stat_result) -> ManifestEntry:
+    """Builds the manifest entry for a file whose content has already been read."""
+    return ManifestEntry(
+        path=relative_key(file, data_folder),
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        sha256=hashlib.sha256(content).hexdigest(),
+        version=constants.CONVERTER_VERSION
+    )
+
+
+class ConversionManifest:
+    """
+    Append-only JSON Lines manifest stored in the output folder.
+
+    Each line holds one ManifestEntry; when a path appears more than once the last line wins.
+    The file is rewritten without superseded lines on close once they make up most of it.
+    """
+
+    def __init__(self, output_folder: Path, version: str = constants.CONVERTER_VERSION):
+        self.path = Path(output_folder) / MANIFEST_NAME
+        self.version = version
+        self.entries: dict[str, ManifestEntry] = {}
+        self._lines = 0
+        self._handle = None
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+
+        with open(self.path, "r", encoding="utf-8") as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = ManifestEntry(**json.loads(line))
+                except (ValueError, TypeError):
+                    # A partially written last line after a crash; the file is simply converted again
+                    continue
+                self.entries[entry.path] = entry
+                self._lines += 1
+
+    def is_current(self, file: Path, data_folder: Path) -> bool:
+        """
+        Returns True if the file was already converted by this converter version and has not changed since.
+        Size and mtime are compared first; the content hash is only computed when the mtime alone differs.
+        """
+        entry = self.entries.get(relative_key(file, data_folder))
+        if entry is None or entry.version != self.version:
+            return False
+
+        stat = file.stat()
+        if stat.st_size != entry.size:
+            return False
+        if stat.st_mtime_ns == entry.mtime_ns:
+            return True
+
+        content = file.read_bytes()
+        if hashlib.sha256(content).hexdigest() != entry.sha256:
+            return False
+
+        # Same content with a new mtime (eg. downloaded again), remember the new mtime to skip hashing next time
+        self.record(describe_file(file, data_folder, content, stat))
+        return True
+
+    def record(self, entry: ManifestEntry):
+        # The output was written by this run, so it gets this run's version whatever the worker put in the entry
+        if entry.version != self.version:
+            entry = replace(entry, version=self.version)
+
+        if self._handle is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = open(self.path, "a", encoding="utf-8")
+
+        self._handle.write(json.dumps(asdict(entry), ensure_ascii=False) + "\n")
+        self.entries[entry.path] = entry
+        self._lines += 1
+
+    def compact(self):
+        """Rewrites the manifest with only the latest entry per path."""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+        temp_path = self.path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as file:
+            for entry in self.entries.values():
+                file.write(json.dumps(asdict(entry), ensure_ascii=False) + "\n")
+        os.replace(temp_path, self.path)
+        self._lines = len(self.entries)
+
+    def close(self):
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+        if self._lines > 2 * len(self.entries):
+            self.compact()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
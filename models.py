@@ -1,60 +1,66 @@
-from typing import List, Union, TypedDict, Optional
-from dataclasses import dataclass
+from typing import ClassVar, List, Tuple, Union, TypedDict, Optional
+from dataclasses import dataclass, field
 
 import constants
+from cards import format_pokerstars
 from constants import BetType
 
 
-class StartEntry:
-    type: str  = "START" # "START"
-    stage_number: str
-    credit: int
-    sb: int
-    bb: int
-    mbi: int
-    cbir: int
+# Entries are slotted dataclasses: a day of parsed hands holds millions of them, and a per-instance __dict__
+# would be most of their size. The entry type is a class attribute, not a field.
 
+@dataclass(slots=True)
+class StartEntry:
+    type: ClassVar[str] = "START"
+    stage_number: str = None
+    credit: int = None
+    sb: int = None
+    bb: int = None
+    mbi: int = None
+    cbir: int = None
+
+@dataclass(slots=True)
 class PlayerEntry:
-    type: str = "PLAYER"  # "PLAYER"
-    nickname: str
+    type: ClassVar[str] = "PLAYER"
+    nickname: str = None
 
+@dataclass(slots=True)
 class AnteEntry:
-    type: str = "ANTE" # "ANTE"
-    amount: int
-    remaining_stack: int
+    type: ClassVar[str] = "ANTE"
+    amount: int = None
+    remaining_stack: int = None
 
+@dataclass(slots=True)
 class CommunityCardsEntry:
-    type: str  = "COMMUNITY_CARDS" # "COMMUNITY_CARDS"
-    hole_cards: List[str]
-    community_cards: List[List[str]]
+    type: ClassVar[str] = "COMMUNITY_CARDS"
+    # Cards are encoded by the cards module
+    hole_cards: Tuple[int, ...] = None
+    community_cards: List[Tuple[int, ...]] = None  # One tuple per street
 
+@dataclass(slots=True)
 class ActionEntry:
-
-    def __init__(self):
-        self.uncalled_bet = None
-
-    type: str = "ACTION" # "ACTION"
-    action: BetType  # "콜", "체크", "다이", "풀"
-    amount: Optional[int]
-    remaining_stack: Optional[int]
-    betting_round: Optional[int]
-    betting_position: Optional[int]
-    time_taken_ms: Optional[int]
-    uncalled_bet: Optional[int]
-
-
-class PostBlindEntry():
-    def __init__(self, blind_type):
-        self.blind_type = blind_type
-
-    type: str = "POST_BLIND"
-    amount: int
-    blind_type: str
-    remaining_stack: int
-
-class HoleCardsEntry():
-    type: str  = "HOLE_CARDS"
-    hole_cards: str
+    type: ClassVar[str] = "ACTION"
+    action: BetType = None  # "콜", "체크", "다이", "풀"
+    amount: Optional[int] = None
+    remaining_stack: Optional[int] = None
+    betting_round: Optional[int] = None
+    betting_position: Optional[int] = None
+    time_taken_ms: Optional[int] = None
+    # Set by the parser when a later "공베팅 반환" line returns part of this bet
+    uncalled_bet: Optional[int] = None
+
+
+@dataclass(slots=True)
+class PostBlindEntry:
+    type: ClassVar[str] = "POST_BLIND"
+    blind_type: str = None  # "small" or "big"
+    amount: int = None
+    remaining_stack: int = None
+
+@dataclass(slots=True)
+class HoleCardsEntry:
+    type: ClassVar[str] = "HOLE_CARDS"
+    hole_cards: Tuple[int, ...] = None  # Empty if the line didn't hold two cards
 
 class RoundStartEntry(TypedDict):
     type: str  # "ROUND_START"
@@ -71,20 +77,23 @@ class UnknownEntry(TypedDict):
     type: str  # "UNKNOWN"
     content: str
 
+@dataclass(slots=True)
 class ResultsEntry:
-    type: str = "RESULTS"
-    result: str
-    showdown: str
+    type: ClassVar[str] = "RESULTS"
+    result: str = None
+    showdown: bool = None
 
+@dataclass(slots=True)
 class EntryFeeEntry:
-    type: str = "ENTRY_FEE"
-    amount: int
-    remaining_stack: int
+    type: ClassVar[str] = "ENTRY_FEE"
+    amount: int = None
+    remaining_stack: int = None
 
+@dataclass(slots=True)
 class WinMoneyEntry:
-    type: str = "WIN_MONEY"
-    amount: int
-    final_stack: int
+    type: ClassVar[str] = "WIN_MONEY"
+    amount: int = None
+    final_stack: int = None
 
 HistoryLine = Union[
     StartEntry,
@@ -101,7 +110,36 @@ ParsedHandHistory = List[
     HistoryLine
 ]
 
-@dataclass
+class ActionIndex:
+    """
+    Entries of one player's hand history grouped by entry type and by betting round.
+    Built in a single pass so the PlayerAction accessors don't rescan the whole list on every call.
+    """
+    __slots__ = ("source", "source_length", "by_type", "by_round", "blind_investment")
+
+    def __init__(self, betting_actions: ParsedHandHistory):
+        self.source = betting_actions
+        self.source_length = len(betting_actions)
+        self.by_type: dict[type, list] = {}
+        self.by_round: dict[int, List[ActionEntry]] = {}
+        self.blind_investment = None  # First PostBlindEntry or EntryFeeEntry
+
+        for action in betting_actions:
+            self.by_type.setdefault(type(action), []).append(action)
+
+            if isinstance(action, ActionEntry):
+                self.by_round.setdefault(action.betting_round, []).append(action)
+            elif self.blind_investment is None and isinstance(action, (PostBlindEntry, EntryFeeEntry)):
+                self.blind_investment = action
+
+    def is_current(self, betting_actions: ParsedHandHistory):
+        return betting_actions is self.source and len(betting_actions) == self.source_length
+
+    def first(self, entry_type):
+        entries = self.by_type.get(entry_type)
+        return entries[0] if entries else None
+
+@dataclass(slots=True)
 class PlayerAction:
     """Represents a player's betting action and final stack in a poker hand."""
     player: str  # 참가자 (Player name)
@@ -110,6 +148,17 @@ class PlayerAction:
     amount_won_lost: int  # 변동 금액 (How much they won or lost)
     final_stack: int  # 남은 잔액 (Final stack after the hand)
     win_money: WinMoneyEntry
+    _index: ActionIndex = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def index(self) -> ActionIndex:
+        # Rebuilt if betting_actions is replaced or appended to
+        if self._index is None or not self._index.is_current(self.betting_actions):
+            self._index = ActionIndex(self.betting_actions)
+        return self._index
+
+    def get_entries(self, entry_type) -> list:
+        return self.index.by_type.get(entry_type, [])
 
     def is_blind(self):
         return self.get_blind() is not None
@@ -122,12 +171,10 @@ class PlayerAction:
         return result is not None and result.showdown
 
     def results(self):
-        return next((action for action in self.betting_actions
-             if isinstance(action, ResultsEntry)), None)
+        return self.index.first(ResultsEntry)
 
     def get_round_actions(self, betting_round):
-        return [action for action in self.betting_actions if
-                isinstance(action, ActionEntry) and action.betting_round == betting_round]
+        return self.index.by_round.get(betting_round, [])
 
     def get_preflop_actions(self):
         return self.get_round_actions(0)
@@ -142,46 +189,84 @@ class PlayerAction:
         return self.get_round_actions(3)
 
     def get_all_betting_actions(self):
-        return [action for action in self.betting_actions if isinstance(action, ActionEntry)]
+        return self.get_entries(ActionEntry)
 
     @property
     def flop_betting_position(self):
-        return next((action.betting_position for action in self.betting_actions
-             if isinstance(action, ActionEntry)  and action.betting_round == 0))
+        return next((action.betting_position for action in self.get_round_actions(0)))
 
     def get_ante(self) -> int:
-        return next((action.amount for action in self.betting_actions
-             if isinstance(action, AnteEntry)  and action.amount is not None), 0)
+        return next((action.amount for action in self.get_entries(AnteEntry)
+             if action.amount is not None), 0)
 
     def get_blind_investment(self) -> PostBlindEntry | EntryFeeEntry:
-        return next((action.amount for action in self.betting_actions
-                     if isinstance(action, PostBlindEntry) or isinstance(action, EntryFeeEntry)), 0)
+        blind_investment = self.index.blind_investment
+        return blind_investment.amount if blind_investment is not None else 0
 
     def get_blind(self) -> PostBlindEntry:
-        return next((action for action in self.betting_actions
-             if isinstance(action, PostBlindEntry)), None)
+        return self.index.first(PostBlindEntry)
 
     def get_entry_fee(self) -> PostBlindEntry:
-        return next((action for action in self.betting_actions
-             if isinstance(action, EntryFeeEntry)), None)
+        return self.index.first(EntryFeeEntry)
 
     def get_start_stack(self):
-        return next((action.credit for action in self.betting_actions
-             if isinstance(action, StartEntry)), 0)
+        start = self.index.first(StartEntry)
+        return start.credit if start is not None else 0
 
     def get_small_blind(self):
-        return next((action.sb for action in self.betting_actions
-             if isinstance(action, StartEntry)), 0)
+        start = self.index.first(StartEntry)
+        return start.sb if start is not None else 0
 
     def get_big_blind(self):
-        return next((action.bb for action in self.betting_actions
-             if isinstance(action, StartEntry)), 0)
-
-    def get_hole_cards(self):
-        return next((action.hole_cards for action in self.betting_actions
-                     if isinstance(action, HoleCardsEntry)))
-
-@dataclass
+        start = self.index.first(StartEntry)
+        return start.bb if start is not None else 0
+
+    def get_hole_cards(self) -> str:
+        """The hole cards in PokerStars notation, eg. "Jc 9c"."""
+        return next((format_pokerstars(action.hole_cards) for action in self.get_entries(HoleCardsEntry)))
+
+class SeatMap:
+    """
+    Seating and action order of a hand: blinds, dealer, the preflop order that seat numbers are taken from,
+    and the ordered players of each later street. Computed once per hand.
+    """
+    __slots__ = ("source", "source_length", "small_blind", "big_blind", "preflop", "seats", "dealer",
+                 "_hand", "_streets")
+
+    def __init__(self, hand: "PokerHand"):
+        self.source = hand.players
+        self.source_length = len(hand.players)
+        self.small_blind = hand._find_blind_player("small")
+        self.big_blind = hand._find_blind_player("big")
+        self.preflop = hand._order_preflop_players(self.small_blind, self.big_blind)
+        self.seats = {id(player): seat for seat, player in enumerate(self.preflop, start=1)}
+
+        # HU, the dealer is the SB. Can't get the preflop ordered players because they're not always there.
+        # Otherwise it's the player to the right of the SB.
+        self.dealer = self.small_blind if len(hand.players) <= 2 else self.preflop[-3]
+
+        self._hand = hand
+        self._streets = {}
+
+    def is_current(self, players: List["PlayerAction"]):
+        return players is self.source and len(players) == self.source_length
+
+    def street_players(self, street: int) -> List["PlayerAction"]:
+        """Players with an action on the street, in betting order. Only computed for streets that are asked for."""
+        if street not in self._streets:
+            self._streets[street] = sorted(
+                self._hand._players_in_hand(street, self.small_blind, self.big_blind),
+                key=lambda item: PokerHand.get_sort_key(item, street)
+            )
+        return self._streets[street]
+
+    def seat(self, player: "PlayerAction") -> int:
+        try:
+            return self.seats[id(player)]
+        except KeyError:
+            raise ValueError(f"{player.player} has no seat in this hand")
+
+@dataclass(slots=True)
 class PokerHand:
     """Represents a full poker hand history with metadata and player actions."""
     round_id: str  # 라운드ID (Unique hand identifier)
@@ -190,6 +275,14 @@ class PokerHand:
     winner: str  # 승자(족보) (Winner and their hand ranking)
     winning_amount: str  # 이긴금액 (Amount won by the winner)
     players: List[PlayerAction]  # List of player actions
+    _seats: SeatMap = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def seats(self) -> SeatMap:
+        # Rebuilt if players is replaced or appended to
+        if self._seats is None or not self._seats.is_current(self.players):
+            self._seats = SeatMap(self)
+        return self._seats
 
     # We can have multiple winners in a multi-pot scenario
     # Make sure we always return the main pot winner first
@@ -197,11 +290,14 @@ class PokerHand:
         return [a for a in self.players if a.win_money is not None and a.win_money.amount > 0]
 
     def get_betting_position(self, player: PlayerAction):
-        return self.get_ordered_preflop_players().index(player) + 1
+        return self.seats.seat(player)
 
     # Returns the players ordered by their action on the flop
     def get_ordered_preflop_players(self):
-        blinds = [self.get_small_blind_player(), self.get_big_blind_player()]
+        return self.seats.preflop
+
+    def _order_preflop_players(self, small_blind, big_blind):
+        blinds = [small_blind, big_blind]
         if len(self.players) <= 2:
             return blinds
 
@@ -217,13 +313,14 @@ class PokerHand:
         - Finally, append players in betting order
         """
         ordered_players = [None] * len(self.players)
+        ordered_ids = set()
         unordered_players = []
 
         for value in self.players:
             if value.is_blind():
                 continue
 
-            preflop_betting_actions = [a for a in value.betting_actions if isinstance(a, ActionEntry) and a.betting_round == 0]
+            preflop_betting_actions = value.get_preflop_actions()
 
             # Append players without a betting_order to the start of the list
             if len(preflop_betting_actions) == 0:
@@ -231,8 +328,9 @@ class PokerHand:
                 continue
 
             # We don't want to add the player twice
-            if value not in ordered_players:
+            if id(value) not in ordered_ids:
                 ordered_players[preflop_betting_actions[0].betting_position] = value
+                ordered_ids.add(id(value))
             else:
                 print("Already found")
 
@@ -240,52 +338,44 @@ class PokerHand:
         return unordered_players + [p for p in ordered_players if p is not None] + blinds
 
     def get_ordered_flop_players(self):
-        return sorted(
-            self.get_players_in_hand(1),
-            key=lambda item: self.get_sort_key(item, 1)
-        )
+        return self.seats.street_players(1)
 
     def get_players_in_hand(self, street):
+        return self._players_in_hand(street, self.seats.small_blind, self.seats.big_blind)
+
+    def _players_in_hand(self, street, small_blind, big_blind):
         if len(self.players) <= 2:
-            return [self.get_small_blind_player(), self.get_big_blind_player()]
+            return [small_blind, big_blind]
 
         players = []
 
         for player in self.players:
-            match = [a for a in player.betting_actions if isinstance(a, ActionEntry) and a.betting_round == street]
-            if match:
+            if player.get_round_actions(street):
                 players.append(player)
         return players
 
     def get_ordered_turn_players(self):
-        return sorted(
-            self.get_players_in_hand(2),
-            key=lambda item: self.get_sort_key(item, 2)
-        )
+        return self.seats.street_players(2)
 
     def get_ordered_river_players(self):
-        return sorted(
-            self.get_players_in_hand(3),
-            key=lambda item: self.get_sort_key(item, 3)
-        )
+        return self.seats.street_players(3)
 
     def get_small_blind_player(self):
-        for player in self.players:
-            blind = player.get_blind()
-            if blind is not None and blind.blind_type == "small":
-                return player
-        return None
+        return self.seats.small_blind
 
     def get_big_blind_player(self):
+        return self.seats.big_blind
+
+    def _find_blind_player(self, blind_type):
         for player in self.players:
             blind = player.get_blind()
-            if blind is not None and blind.blind_type == "big":
+            if blind is not None and blind.blind_type == blind_type:
                 return player
         return None
 
     @property
     def start_entry(self):
-        return next((action for action in self.players[0].betting_actions if isinstance(action, StartEntry)))
+        return next((action for action in self.players[0].get_entries(StartEntry)))
 
     def get_small_blind_amount(self):
         return self.start_entry.sb
@@ -295,30 +385,19 @@ class PokerHand:
 
     @staticmethod
     def get_sort_key(item, street):
-        for action in item.betting_actions:
-            if isinstance(action, ActionEntry) and action.betting_round == street:
-                return action.betting_position
+        for action in item.get_round_actions(street):
+            return action.betting_position
         # If no matching action is found, return a default value.
         # Use float('inf') if sorting ascending so that these items appear at the end.
         return float('inf')
 
     def get_dealer(self):
-        sb = self.get_small_blind_player()
-
-        # HU, return the SB. Can't get the preflop ordered players because they're not always there.
-        if (len(self.players) <= 2):
-            return sb
-
-        preflop = self.get_ordered_preflop_players()
-
-        # Get the player to the right of the SB
-        return preflop[-3]
+        return self.seats.dealer
 
     def get_community_cards(self):
         return max(
             (action.community_cards
              for player in self.players
-             for action in player.betting_actions
-              if isinstance(action, CommunityCardsEntry)),
+             for action in player.get_entries(CommunityCardsEntry)),
             key=lambda cards: len(cards),
             default=[])
@@ -1,9 +1,33 @@
+import io
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Tuple, List
+from typing import Tuple, List, Iterable, Iterator, TextIO
+from cards import format_pokerstars
 from constants import BetType
 from models import PokerHand, PlayerAction, ActionEntry, PostBlindEntry, EntryFeeEntry
+from timings import CONVERT, stage
 from utils import convert_korean_datetime_with_timezone, format_korean_date
 
+# PokerStars hand history files separate hands with two empty lines
+HAND_SEPARATOR = "\n\n\n"
+
+
+@contextmanager
+def text_sink(fp, encoding: str = "utf-8") -> Iterator[TextIO]:
+    """
+    Yields a text stream that writes to fp. Text streams are used as they are; binary streams are wrapped
+    and detached again afterwards, so fp is flushed but stays open. Line endings are never translated.
+    """
+    if isinstance(fp, io.TextIOBase):
+        yield fp
+        return
+
+    out = io.TextIOWrapper(fp, encoding=encoding, newline="")
+    try:
+        yield out
+    finally:
+        out.detach()
+
 
 class PokerStarsConverter():
     def __init__(self, currency_symbol = None):
@@ -17,65 +41,103 @@ class PokerStarsConverter():
         if poker_hand is None:
             return None
 
+        with stage(CONVERT):
+            return "\n".join(self.iter_pokerstars_lines(poker_hand, correct_datetime))
+
+    def write_pokerstars(self, poker_hand: PokerHand, fp, correct_datetime: datetime = None) -> bool:
+        """
+        Writes a PokerHand in PokerStars hand history format to a text stream or a buffered binary sink,
+        one line at a time. The hand is written without a trailing newline, like convert_to_pokerstars_format.
+
+        Returns:
+        - False if there was no hand to write.
+        """
+        if poker_hand is None:
+            return False
+
+        with text_sink(fp) as out:
+            self._write_lines(out, poker_hand, correct_datetime)
+        return True
+
+    def convert_many(self, hands: Iterable[PokerHand], fp, correct_datetime: datetime = None) -> int:
+        """
+        Writes hands to a text stream or a buffered binary sink, separated by HAND_SEPARATOR.
+        Hands are converted one at a time as the iterable yields them, so a whole file never has to be in memory.
+
+        Returns:
+        - The number of hands written.
+        """
+        written = 0
+        with text_sink(fp) as out:
+            for poker_hand in hands:
+                if poker_hand is None:
+                    continue
+                if written:
+                    out.write(HAND_SEPARATOR)
+                self._write_lines(out, poker_hand, correct_datetime)
+                written += 1
+        return written
+
+    def _write_lines(self, out: TextIO, poker_hand: PokerHand, correct_datetime: datetime = None):
+        # Lines are formatted and written in turn, so the stage timings count both as converting.
+        # Opening, flushing and closing the sink are counted as writing by the caller
+        with stage(CONVERT):
+            lines = self.iter_pokerstars_lines(poker_hand, correct_datetime)
+            out.write(next(lines))
+            for line in lines:
+                out.write("\n")
+                out.write(line)
+
+    def iter_pokerstars_lines(self, poker_hand: PokerHand, correct_datetime: datetime = None) -> Iterator[str]:
+        """
+        Yields the lines of a PokerHand in PokerStars hand history format, without line endings.
+        """
         hand_id = poker_hand.round_id.replace("-", "")
         sb, bb = poker_hand.get_small_blind_amount(), poker_hand.get_big_blind_amount()
         timestamp = convert_korean_datetime_with_timezone(poker_hand.timestamp) if correct_datetime is None else format_korean_date(correct_datetime)
-        preflop_players = poker_hand.get_ordered_preflop_players()
+        seats = poker_hand.seats
+        preflop_players = seats.preflop
 
         # HEADER DATA
-        history_parts = [
-            f"PokerStars Hand #{hand_id}:  Hold'em No Limit ({self.format_currency(sb)}/{self.format_currency(bb)}) - {timestamp}",
-            f"Table 'Table 1' 9-max Seat #{poker_hand.get_dealer().flop_betting_position} is the button"
-        ]
+        yield f"PokerStars Hand #{hand_id}:  Hold'em No Limit ({self.format_currency(sb)}/{self.format_currency(bb)}) - {timestamp}"
+        yield f"Table 'Table 1' 9-max Seat #{seats.dealer.flop_betting_position} is the button"
 
         # STATUS HISTORY
         # Seat numbers are 1-indexed
-        seat_lines = []
         for idx, player in enumerate(preflop_players, start=1):
-            seat_lines.append(f"Seat {idx}: {player.player} ({self.format_currency(player.get_start_stack())} in chips)")
-
-        history_parts.extend(seat_lines)
+            yield f"Seat {idx}: {player.player} ({self.format_currency(player.get_start_stack())} in chips)"
 
         # ANTE HISTORY
-        antes = []
         for player in preflop_players:
             ante = player.get_ante()
-            antes.append(f"{player.player}: posts the ante {self.format_currency(ante)}")
-
-        history_parts.extend(antes)
+            yield f"{player.player}: posts the ante {self.format_currency(ante)}"
 
         # BLIND HISTORY
         for player in preflop_players:
             blind = player.get_blind()
             if blind:
-                history_parts.append(
-                    f"{player.player}: posts {blind.blind_type} blind {self.format_currency(blind.amount)}")
+                yield f"{player.player}: posts {blind.blind_type} blind {self.format_currency(blind.amount)}"
 
         # ENTRY FEES
         for player in preflop_players:
             entry_fee: EntryFeeEntry = player.get_entry_fee()
             if entry_fee is not None:
-                history_parts.append(f"{player.player}: posts big blind {self.format_currency(entry_fee.amount)}")
+                yield f"{player.player}: posts big blind {self.format_currency(entry_fee.amount)}"
 
         # PREFLOP HISTORY
-        history_parts.append("*** HOLE CARDS ***")
+        yield "*** HOLE CARDS ***"
         preflop_actions = [(player, action) for player in preflop_players for action in player.get_preflop_actions()]
         sorted_preflop_street_actions = sorted(preflop_actions, key=lambda item: item[1].betting_position)
-        history_parts.extend(self.generate_betting_rounds(bb, sorted_preflop_street_actions, True))
-
-        round_methods = [
-            ("FLOP", poker_hand.get_ordered_flop_players, lambda p: p.get_flop_actions()),
-            ("TURN", poker_hand.get_ordered_turn_players, lambda p: p.get_turn_actions()),
-            ("RIVER", poker_hand.get_ordered_river_players, lambda p: p.get_river_actions())
-        ]
+        yield from self.generate_betting_rounds(bb, sorted_preflop_street_actions, True)
 
         community_cards = poker_hand.get_community_cards()
-        for round_index, (round_name, get_players_func, get_actions_func) in enumerate(round_methods, start=1):
+        for round_index, round_name in enumerate(["FLOP", "TURN", "RIVER"], start=1):
             if len(community_cards) >= round_index:
-                history_parts.append(f"*** {round_name} *** {self.format_community_cards(community_cards, round_index)}")
-                actions = [(player, action) for player in get_players_func() for action in get_actions_func(player)]
+                yield f"*** {round_name} *** {self.format_community_cards(community_cards, round_index)}"
+                actions = [(player, action) for player in seats.street_players(round_index)
+                           for action in player.get_round_actions(round_index)]
                 sorted_actions = sorted(actions, key=lambda item: item[1].betting_position)
-                history_parts.extend(self.generate_betting_rounds(0, sorted_actions))
+                yield from self.generate_betting_rounds(0, sorted_actions)
 
         winner_statements = []
         winners = poker_hand.get_winners()
@@ -116,7 +178,7 @@ Total pot 162857 Main pot 36385. Side pot-1 38366. Side pot-2 80777. | Rake 7329
                 main_pot = winner.win_money.amount
             winner_statements.append(f"{winner.player} collected {self.format_currency(winner.win_money.amount)} from{pot_type} pot")
 
-        history_parts.extend(winner_statements)
+        yield from winner_statements
 
         summary = "*** SUMMARY ***"
 
@@ -132,19 +194,19 @@ Total pot 162857 Main pot 36385. Side pot-1 38366. Side pot-2 80777. | Rake 7329
 
         total_pot = f"Total pot {self.format_currency(pot)}{main_pot_text}{side_pot_text} | Rake {self.format_currency(rake)}"
 
-        history_parts.append(summary)
-        history_parts.append(total_pot)
+        yield summary
+        yield total_pot
 
         if community_cards is not None and len(community_cards) > 0:
-            flop = ' '.join(self.change_suit_card(s) for sublist in community_cards for s in sublist)
+            flop = format_pokerstars(card for street in community_cards for card in street)
             # A board is not always printed if there are no community cards
             board_part = f"Board [{flop}]"
-            history_parts.append(board_part)
+            yield board_part
 
         for player in preflop_players:
             hole_cards = player.get_hole_cards()
 
-            betting_position = poker_hand.get_betting_position(player)
+            betting_position = seats.seat(player)
 
             if player.is_winner():
                 summary_line = f"Seat {betting_position}: {player.player} showed [{hole_cards}] and won ({self.format_currency(player.win_money.amount)})"
@@ -153,11 +215,7 @@ Total pot 162857 Main pot 36385. Side pot-1 38366. Side pot-2 80777. | Rake 7329
             else:
                 summary_line = f"Seat {betting_position}: {player.player} mucked [{hole_cards}]"
 
-            history_parts.append(summary_line)
-
-        pokerstars_history = "\n".join(history_parts)
-
-        return pokerstars_history
+            yield summary_line
 
     def generate_betting_rounds(self, min_bet_size, sorted_street_actions, include_blind = False):
         last_bet_size = min_bet_size
@@ -217,12 +275,7 @@ Total pot 162857 Main pot 36385. Side pot-1 38366. Side pot-2 80777. | Rake 7329
 
     def format_community_cards(self, cards, street_index):
         """Formats community cards up to the current street."""
-        return ' '.join(f'[{" ".join(self.change_suit_card(card) for card in cards[i])}]' for i in range(street_index))
-
-    def change_suit_card(self, line):
-        suit = {"♠": "s", "◆": "d", "♣": "c", "♥": "h"}
-
-        return line[1] + suit[line[0]]
+        return ' '.join(f'[{format_pokerstars(cards[i])}]' for i in range(street_index))
 
     def format_currency(self, amount):
 
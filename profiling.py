@@ -0,0 +1,117 @@
+"""
+Optional cProfile profiling of the conversion, inside the workers that do it.
+
+Each batch is profiled by the worker converting it, and its raw stats come back with the batch's result.
+The main process merges them per worker and overall, and writes them as .pstats files that pstats, snakeviz
+or gprof2dot can read, with a text report of the functions that took the most time.
+
+From Python 3.12 on, only one profiler can be active at a time in an interpreter, so the batches of the thread
+executor can't be profiled apart, and --profile is refused with it.
+"""
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict
+
+COMBINED = "combined.pstats"
+REPORT = "report.txt"
+DEFAULT_TOP = 25  # Functions listed by the report, for each sort order
+REPORT_SORTS = ["tottime", "cumulative"]
+PROFILES_PER_THREAD = sys.version_info < (3, 12)  # Each thread can run its own profiler
+
+
+@dataclass
+class WorkerProfile:
+    """The profile of one batch, on its way from a worker to the main process."""
+    worker: str  # Process, and thread when it's not the main one, that converted the batch
+    stats: dict  # As pstats keeps them: (file, line, function) -> (calls, primitive calls, tottime, cumtime, callers)
+
+
+def worker_name() -> str:
+    thread = threading.current_thread()
+    if thread is threading.main_thread():
+        return f"pid{os.getpid()}"
+    return f"pid{os.getpid()}-{thread.name}"
+
+
+class BatchProfiler:
+    """Profiles the code run inside it on the current thread."""
+
+    def __init__(self):
+        self._profile = cProfile.Profile()
+
+    def __enter__(self):
+        self._profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._profile.disable()
+
+    def result(self) -> WorkerProfile:
+        self._profile.create_stats()
+        return WorkerProfile(worker_name(), self._profile.stats)
+
+
+class _RawStats:
+    """Lets pstats.Stats load stats that came from another process, like it loads a profiler."""
+
+    def __init__(self, stats: dict):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+class ProfileCollector:
+    """Merges the profiles sent back by the workers, per worker and overall."""
+
+    def __init__(self):
+        self.workers: Dict[str, pstats.Stats] = {}
+        self.batches = 0
+
+    def add(self, profile: WorkerProfile):
+        stats = self.workers.get(profile.worker)
+        if stats is None:
+            self.workers[profile.worker] = pstats.Stats(_RawStats(profile.stats))
+        else:
+            stats.add(_RawStats(profile.stats))
+        self.batches += 1
+
+    def combined(self) -> pstats.Stats:
+        combined = pstats.Stats()
+        for stats in self.workers.values():
+            combined.add(stats)
+        return combined
+
+    def write(self, folder: Path, top: int = DEFAULT_TOP) -> str:
+        """
+        Writes <worker>.pstats for every worker, their merge in combined.pstats and the report of the merge.
+
+        Returns:
+        - The report.
+        """
+        folder.mkdir(parents=True, exist_ok=True)
+        for worker, stats in self.workers.items():
+            stats.dump_stats(folder / f"{worker}.pstats")
+        combined = self.combined()
+        combined.dump_stats(folder / COMBINED)
+
+        report = self.report(combined, top)
+        (folder / REPORT).write_text(report, encoding="utf-8")
+        return report
+
+    def report(self, combined: pstats.Stats, top: int = DEFAULT_TOP) -> str:
+        stream = io.StringIO()
+        combined.stream = stream
+        print(f"{self.batches} batches profiled in {len(self.workers)} workers", file=stream)
+        # Short file names are easier to read, the .pstats files keep the full paths
+        combined.strip_dirs()
+        for sort in REPORT_SORTS:
+            print(f"\nTop {top} functions by {sort}:", file=stream)
+            combined.sort_stats(sort).print_stats(top)
+        return stream.getvalue()
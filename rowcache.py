@@ -0,0 +1,196 @@
+"""
+Cache of the raw rows extracted from the input files, so a converter or hand history parser fix doesn't
+tokenize the HTML of the whole archive again.
+
+The rows of a file are stored under the SHA-256 of its content in an append-only file next to the manifest:
+a header, then one record per file, each a digest, the length of the payload and the payload, the rows as
+zlib compressed JSON. Only the main process appends. Workers read records at the offsets of an index they keep
+per process, and extend it from the end of the file before every lookup, so they see the records of earlier
+batches of the same run too.
+
+The rows only depend on the HTML and on the backend that extracted them, so there is a file per backend, kept
+whatever the converter version. ROWS_VERSION is bumped when an extractor changes, which starts new files.
+A run with --force extracts every file again, and replaces the file with the rows it found once it is done.
+"""
+import json
+import os
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from html_parser import RawHandRow
+
+ROWS_VERSION = 1
+
+_MAGIC = b"RAWROWS" + bytes([ROWS_VERSION])
+_RECORD = struct.Struct("<32sI")  # SHA-256 digest, payload length
+
+
+def rows_name(backend: str) -> str:
+    """The name of the cache file of the rows extracted by an HTML backend."""
+    return f".raw_rows_{backend}_v{ROWS_VERSION}.bin"
+
+
+def encode_rows(rows: List[RawHandRow]) -> bytes:
+    data = [[row.cells, row.player_rows] for row in rows]
+    return zlib.compress(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def decode_rows(payload: bytes) -> List[RawHandRow]:
+    return [RawHandRow(cells, player_rows) for cells, player_rows in json.loads(zlib.decompress(payload))]
+
+
+class RowStore:
+    """
+    The cache file, opened to read records, or to append them as well in the main process.
+    A record cut short by a crash is ignored, and truncated before anything is appended after it.
+
+    A store opened with replace starts out empty and writes a new file next to the old one,
+    which takes its place when the store is closed, unless it is closed by an exception.
+    """
+
+    def __init__(self, path: Path, append: bool = False, replace: bool = False):
+        self.path = Path(path)
+        self.append = append
+        self.replace = replace
+        self.index: Dict[bytes, Tuple[int, int]] = {}  # digest -> offset and length of the payload
+        self._end = 0  # End of the last complete record
+        self._identity = None  # Device and inode of the file being read, a replaced file is read from scratch
+        self._reader = None
+        self._writer = None
+        self._lock = threading.Lock()  # Reads seek the shared handle, and the thread executor shares the store
+        if not replace:
+            self.refresh()
+
+    def refresh(self):
+        """Indexes the records appended since the last refresh."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return
+        identity = (stat.st_dev, stat.st_ino)
+        if identity == self._identity and stat.st_size <= self._end:
+            return
+
+        with self._lock:
+            if identity != self._identity:
+                if self._reader is not None:
+                    self._reader.close()
+                    self._reader = None
+                self.index.clear()
+                self._end = 0
+                self._identity = identity
+
+            size = stat.st_size
+            if self._reader is None:
+                self._reader = open(self.path, "rb")
+                if self._reader.read(len(_MAGIC)) != _MAGIC:
+                    # Not a complete cache file, the main process writes it again from scratch
+                    self._reader.close()
+                    self._reader = None
+                    self._identity = None
+                    return
+                self._end = len(_MAGIC)
+
+            self._reader.seek(self._end)
+            while self._end + _RECORD.size <= size:
+                digest, length = _RECORD.unpack(self._reader.read(_RECORD.size))
+                offset = self._end + _RECORD.size
+                if offset + length > size:
+                    break
+                self.index.setdefault(digest, (offset, length))
+                self._end = offset + length
+                self._reader.seek(self._end)
+
+    def get(self, digest: bytes) -> List[RawHandRow] | None:
+        location = self.index.get(digest)
+        if location is None:
+            return None
+        offset, length = location
+        with self._lock:
+            if self._reader is None:
+                return None
+            self._reader.seek(offset)
+            payload = self._reader.read(length)
+        try:
+            return decode_rows(payload)
+        except (zlib.error, ValueError, TypeError):
+            return None
+
+    def put(self, digest: bytes, payload: bytes):
+        """Appends the encoded rows of a file, unless the store already has them."""
+        if not self.append:
+            raise ValueError("The row store was not opened to append")
+        if digest in self.index:
+            return
+
+        if self._writer is None:
+            self._open_writer()
+        offset = self._end + _RECORD.size
+        self._writer.write(_RECORD.pack(digest, len(payload)))
+        self._writer.write(payload)
+        self.index[digest] = (offset, len(payload))
+        self._end = offset + len(payload)
+
+    @property
+    def _write_path(self) -> Path:
+        return self.path.with_name(self.path.name + ".new") if self.replace else self.path
+
+    def _open_writer(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self._end <= 0:
+            self._writer = open(self._write_path, "wb")
+            self._writer.write(_MAGIC)
+            self._end = len(_MAGIC)
+            self.index.clear()
+        else:
+            self._writer = open(self._write_path, "r+b")
+            # Drops a record cut short by a crash
+            self._writer.truncate(self._end)
+            self._writer.seek(self._end)
+
+        if self._reader is not None:
+            self._reader.close()
+        self._reader = open(self._write_path, "rb")
+        stat = os.fstat(self._reader.fileno())
+        self._identity = (stat.st_dev, stat.st_ino)
+
+    def flush(self):
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self, keep: bool = True):
+        written = self._writer is not None
+        for handle in (self._writer, self._reader):
+            if handle is not None:
+                handle.close()
+        self._writer = self._reader = None
+        if self.replace and written:
+            if keep:
+                os.replace(self._write_path, self.path)
+            else:
+                os.remove(self._write_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(keep=exc_type is None)
+
+
+_readers: Dict[str, RowStore] = {}
+_readers_lock = threading.Lock()
+
+
+def reader(path: str) -> RowStore:
+    """
+    The store this process reads a cache file with, refreshed with the records appended since the last call.
+    """
+    with _readers_lock:
+        store = _readers.get(path)
+        if store is None:
+            store = _readers[path] = RowStore(path)
+    store.refresh()
+    return store
@@ -0,0 +1,83 @@
+"""
+Streaming task scheduling for the conversion pool
+"""
+from concurrent.futures import Executor, FIRST_COMPLETED, wait
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator
+
+
+def bounded_map(executor: Executor, fn: Callable, items: Iterable, max_in_flight: int, *args) -> Iterator[Any]:
+    """
+    Submits fn(item, *args) for every item while keeping at most max_in_flight tasks pending.
+
+    Items are pulled lazily from the iterable, so a slow directory walk (or a slow task) applies
+    backpressure instead of the whole input being queued up front. A new task is submitted as soon
+    as any running task finishes, so one slow file never stalls the rest of the pool.
+
+    Returns:
+    - An iterator over task results in completion order.
+    """
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1")
+
+    pending = set()
+    for item in items:
+        if len(pending) >= max_in_flight:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+        pending.add(executor.submit(fn, item, *args))
+
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield future.result()
+
+
+def batched(items: Iterable, size: int) -> Iterator[list]:
+    """Yields successive lists of at most size items from an iterable."""
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class AdaptiveBatcher:
+    """
+    Groups items into batches whose size is tuned from the observed time per item,
+    aiming for batches that each take roughly target_seconds to process.
+
+    Small files end up in large batches so the per-task IPC cost is amortised, while slow files
+    are sent in small batches so they don't hold up the tail of the run.
+    """
+
+    def __init__(self, target_seconds: float = 0.5, initial_size: int = 8, min_size: int = 1, max_size: int = 512):
+        self.target_seconds = target_seconds
+        self.size = initial_size
+        self.min_size = min_size
+        self.max_size = max_size
+        self._seconds_per_item = None
+
+    def observe(self, items: int, elapsed: float):
+        """Feeds back how long a finished batch took."""
+        if items <= 0:
+            return
+
+        sample = elapsed / items
+        # Exponential moving average so a single slow hand doesn't collapse the batch size
+        if self._seconds_per_item is None:
+            self._seconds_per_item = sample
+        else:
+            self._seconds_per_item = 0.8 * self._seconds_per_item + 0.2 * sample
+
+        if self._seconds_per_item > 0:
+            ideal = int(self.target_seconds / self._seconds_per_item)
+        else:
+            ideal = self.max_size
+        self.size = max(self.min_size, min(self.max_size, ideal))
+
+    def batches(self, items: Iterable) -> Iterator[list]:
+        """Like batched, but reads the current size before every batch."""
+        iterator = iter(items)
+        while batch := list(islice(iterator, self.size)):
+            yield batch
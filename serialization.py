@@ -0,0 +1,215 @@
+"""
+Parsed hands saved as JSON Lines, so they can be converted or analysed many times without parsing the HTML again.
+
+The first line is a header with the format and its version. Every other line is one hand, as positional arrays
+rather than objects, which keeps the file small and loading fast:
+
+    hand:      [round_id, timestamp, game_type, winner, winning_amount, corrected datetime or null, [player, ...]]
+    player:    [player, raw_betting_action or null, amount_won_lost, final_stack, win money or null, [entry, ...]]
+    win money: [amount, final_stack]
+    entry:     [type, field, ...], with the fields of the entry's dataclass in their declared order
+
+The corrected datetime is the one taken from the file name of a single hand page, which the converter uses over
+the hand's own timestamp. The raw betting actions are only kept when asked for, nothing after parsing needs them.
+Files are compressed when their name ends with .gz, .xz or .zst.
+
+Usage:
+    python serialization.py build DATA_FOLDER OUTPUT [--keep-raw] [--html-parser {bs4,stream}]
+    python serialization.py convert INPUT OUTPUT [--currency-symbol SYMBOL]
+"""
+import argparse
+import io
+import json
+import time
+from dataclasses import fields
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, Tuple
+
+from constants import BetType
+from hand_parser import page_hands
+from html_parser import BACKENDS, DEFAULT_BACKEND
+from models import (ActionEntry, AnteEntry, CommunityCardsEntry, EntryFeeEntry, HoleCardsEntry, PlayerAction,
+                    PlayerEntry, PokerHand, PostBlindEntry, ResultsEntry, StartEntry, WinMoneyEntry)
+from pokerstars_converter import HAND_SEPARATOR, PokerStarsConverter
+from sinks import open_sink, open_source
+from utils import extract_datetime_from_filename, find_files
+
+FORMAT = "pokerhands"
+VERSION = 1
+
+ENTRY_TYPES = [StartEntry, PlayerEntry, AnteEntry, CommunityCardsEntry, ActionEntry, PostBlindEntry,
+               HoleCardsEntry, ResultsEntry, EntryFeeEntry]
+_ENTRY_FIELDS = {entry_type: tuple(field.name for field in fields(entry_type)) for entry_type in ENTRY_TYPES}
+_ENTRY_TYPES = {entry_type.type: entry_type for entry_type in ENTRY_TYPES}
+
+SerializedHand = Tuple[PokerHand, datetime | None]  # A hand and its corrected datetime
+
+
+def _encode_entry(entry) -> list:
+    values = [entry.type]
+    for name in _ENTRY_FIELDS[type(entry)]:
+        value = getattr(entry, name)
+        values.append(value.value if isinstance(value, BetType) else value)
+    return values
+
+
+def _decode_entry(values: list):
+    entry = _ENTRY_TYPES[values[0]](*values[1:])
+    # JSON has no tuples or enums
+    if entry.type == ActionEntry.type:
+        if entry.action is not None:
+            entry.action = BetType(entry.action)
+    elif entry.type == CommunityCardsEntry.type:
+        if entry.hole_cards is not None:
+            entry.hole_cards = tuple(entry.hole_cards)
+        if entry.community_cards is not None:
+            entry.community_cards = [tuple(cards) for cards in entry.community_cards]
+    elif entry.type == HoleCardsEntry.type:
+        if entry.hole_cards is not None:
+            entry.hole_cards = tuple(entry.hole_cards)
+    return entry
+
+
+def encode_hand(hand: PokerHand, correct_datetime: datetime = None, keep_raw: bool = False) -> list:
+    players = [[
+        player.player,
+        player.raw_betting_action if keep_raw else None,
+        player.amount_won_lost,
+        player.final_stack,
+        None if player.win_money is None else [player.win_money.amount, player.win_money.final_stack],
+        [_encode_entry(entry) for entry in player.betting_actions],
+    ] for player in hand.players]
+    corrected = correct_datetime.isoformat() if correct_datetime is not None else None
+    return [hand.round_id, hand.timestamp, hand.game_type, hand.winner, hand.winning_amount, corrected, players]
+
+
+def decode_hand(values: list) -> SerializedHand:
+    round_id, timestamp, game_type, winner, winning_amount, corrected, players = values
+    hand = PokerHand(
+        round_id=round_id,
+        timestamp=timestamp,
+        game_type=game_type,
+        winner=winner,
+        winning_amount=winning_amount,
+        players=[PlayerAction(
+            player=player,
+            raw_betting_action=raw_betting_action or "",
+            amount_won_lost=amount_won_lost,
+            final_stack=final_stack,
+            betting_actions=[_decode_entry(entry) for entry in entries],
+            win_money=None if win_money is None else WinMoneyEntry(*win_money),
+        ) for player, raw_betting_action, amount_won_lost, final_stack, win_money, entries in players]
+    )
+    return hand, datetime.fromisoformat(corrected) if corrected is not None else None
+
+
+def dump_hands(hands: Iterable[SerializedHand], fp: BinaryIO, keep_raw: bool = False) -> int:
+    """
+    Writes the header and the hands to a binary stream.
+
+    Returns:
+    - The number of hands written.
+    """
+    written = 0
+    out = io.TextIOWrapper(fp, encoding="utf-8", newline="\n")
+    try:
+        out.write(json.dumps({"format": FORMAT, "version": VERSION}) + "\n")
+        for hand, correct_datetime in hands:
+            out.write(json.dumps(encode_hand(hand, correct_datetime, keep_raw), ensure_ascii=False,
+                                 separators=(",", ":")) + "\n")
+            written += 1
+    finally:
+        out.detach()
+    return written
+
+
+def load_hands(fp: BinaryIO) -> Iterator[SerializedHand]:
+    """Reads the hands of a binary stream written by dump_hands, one line at a time."""
+    header = fp.readline()
+    try:
+        header = json.loads(header)
+    except ValueError:
+        header = None
+    if not isinstance(header, dict) or header.get("format") != FORMAT:
+        raise ValueError("Not a file of parsed hands")
+    if header.get("version") != VERSION:
+        raise ValueError(f"Unsupported version {header.get('version')} of the parsed hands, expected {VERSION}")
+
+    for line in fp:
+        if line.strip():
+            yield decode_hand(json.loads(line))
+
+
+def save(path: Path, hands: Iterable[SerializedHand], keep_raw: bool = False) -> int:
+    with open_sink(path) as fp:
+        return dump_hands(hands, fp, keep_raw)
+
+
+def load(path: Path) -> Iterator[SerializedHand]:
+    with open_source(path) as fp:
+        yield from load_hands(fp)
+
+
+def iter_folder_hands(data_folder: Path, html_backend: str = None) -> Iterator[SerializedHand]:
+    """Parses the hands of every page below a folder, and of the archives in it, like main.py finds them."""
+    for file in find_files(data_folder, "*.html"):
+        try:
+            html_content = file.read_bytes().decode("utf-8")
+            hands, correct_datetime = page_hands(html_content, extract_datetime_from_filename(file), html_backend)
+            hands = list(hands)
+        except Exception as e:
+            print(f"Error parsing file '{file}': {e}")
+            continue
+        for hand in hands:
+            yield hand, correct_datetime
+
+
+def convert(hands: Iterable[SerializedHand], fp: BinaryIO, currency_symbol: str = None) -> int:
+    """
+    Writes hands in PokerStars format to a binary stream, separated like a PokerStars hand history file.
+
+    Returns:
+    - The number of hands written.
+    """
+    converter = PokerStarsConverter(currency_symbol)
+    written = 0
+    for hand, correct_datetime in hands:
+        if written:
+            fp.write(HAND_SEPARATOR.encode("utf-8"))
+        fp.write(converter.convert_to_pokerstars_format(hand, correct_datetime).encode("utf-8"))
+        written += 1
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Parse the HTML hand histories of a folder into a file of parsed hands")
+    build.add_argument("data_folder", type=Path, help="Folder of the HTML hand histories")
+    build.add_argument("output", type=Path, help="File to write, eg. hands.jsonl or hands.jsonl.gz")
+    build.add_argument("--keep-raw", action="store_true", help="Keep the raw betting actions of every player")
+    build.add_argument("--html-parser", choices=list(BACKENDS), default=DEFAULT_BACKEND,
+                       help=f"HTML parser backend (default: {DEFAULT_BACKEND})")
+
+    to_pokerstars = commands.add_parser("convert", help="Convert a file of parsed hands to PokerStars format")
+    to_pokerstars.add_argument("input", type=Path, help="File of parsed hands")
+    to_pokerstars.add_argument("output", type=Path, help="PokerStars hand history to write, eg. hands.txt or hands.txt.gz")
+    to_pokerstars.add_argument("--currency-symbol", default="$", help="Currency symbol of the amounts (default: $)")
+
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+
+    if args.command == "build":
+        written = save(args.output, iter_folder_hands(args.data_folder, args.html_parser), args.keep_raw)
+    else:
+        with open_sink(args.output) as fp:
+            written = convert(load(args.input), fp, args.currency_symbol)
+
+    print(f"Wrote {written} hands to {args.output} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Binary output sinks with optional streaming compression, and the sources that read them back.
+
+Converted text is compressed as it is written, so output never touches the disk uncompressed.
+zstd needs the optional zstandard package; gzip and xz only need the standard library.
+"""
+import gzip
+import importlib.util
+import io
+import lzma
+from pathlib import Path
+from typing import BinaryIO
+
+NONE = "none"
+GZIP = "gzip"
+XZ = "xz"
+ZSTD = "zstd"
+
+# File extension added after .txt for each compression
+EXTENSIONS = {NONE: "", GZIP: ".gz", XZ: ".xz", ZSTD: ".zst"}
+COMPRESSIONS = list(EXTENSIONS)
+
+# Favor ratio over speed, the disk is slower than the compressor at these levels
+GZIP_LEVEL = 6
+XZ_PRESET = 6
+ZSTD_LEVEL = 9
+
+
+def available_compressions() -> list[str]:
+    return [compression for compression in COMPRESSIONS
+            if compression != ZSTD or importlib.util.find_spec("zstandard") is not None]
+
+
+def compression_for_path(path: Path) -> str:
+    """The compression implied by a file name, eg. gzip for hands.txt.gz."""
+    suffix = Path(path).suffix.lower()
+    return next((compression for compression, extension in EXTENSIONS.items() if extension and extension == suffix), NONE)
+
+
+def parse_compression(value: str) -> str:
+    """Accepts a compression name or an extension such as gz, .xz or txt.zst."""
+    value = value.lower()
+    if value in EXTENSIONS:
+        return value
+
+    compression = compression_for_path(Path("output." + value.lstrip(".")))
+    if compression == NONE and value.lstrip(".") not in ("txt", ""):
+        raise ValueError(f"Unknown compression '{value}', expected one of {', '.join(COMPRESSIONS)} or their extensions")
+    return compression
+
+
+def open_sink(path: Path, compression: str = None, append: bool = False) -> BinaryIO:
+    """
+    Opens a binary file for writing, compressing what is written to it.
+    Without a compression, it is taken from the file extension.
+
+    Appending to a compressed file adds a new stream (or gzip member, or zstd frame) after the existing ones,
+    which the decompressors read back as one file.
+    """
+    if compression is None:
+        compression = compression_for_path(path)
+    mode = "ab" if append else "wb"
+
+    if compression == NONE:
+        return open(path, mode)
+    if compression == GZIP:
+        return gzip.open(path, mode, compresslevel=GZIP_LEVEL)
+    if compression == XZ:
+        return lzma.open(path, mode, preset=XZ_PRESET)
+    if compression == ZSTD:
+        if ZSTD not in available_compressions():
+            raise ValueError("zstd compression needs the zstandard package (pip install zstandard)")
+        import zstandard
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(open(path, mode), closefd=True)
+
+    raise ValueError(f"Unknown compression '{compression}', expected one of {', '.join(COMPRESSIONS)}")
+
+
+def open_source(path: Path, compression: str = None) -> BinaryIO:
+    """Opens a file written by open_sink for reading, decompressing it. Without a compression, it is taken from the file extension."""
+    if compression is None:
+        compression = compression_for_path(path)
+
+    if compression == NONE:
+        return open(path, "rb")
+    if compression == GZIP:
+        return gzip.open(path, "rb")
+    if compression == XZ:
+        return lzma.open(path, "rb")
+    if compression == ZSTD:
+        if ZSTD not in available_compressions():
+            raise ValueError("zstd compression needs the zstandard package (pip install zstandard)")
+        import zstandard
+        # read_across_frames, so the frames of an appended file read back as one. Buffered to read it line by line
+        reader = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), read_across_frames=True, closefd=True)
+        return io.BufferedReader(reader)
+
+    raise ValueError(f"Unknown compression '{compression}', expected one of {', '.join(COMPRESSIONS)}")
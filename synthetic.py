@@ -0,0 +1,758 @@
+"""
+Synthetic hand histories in the site's HTML, to test and benchmark at production scale without real player data.
+
+Every hand is dealt and played out by a small engine: 2-9 players with antes, blinds and entry fees, pot sized
+bets and raises, timeouts, players leaving the room, all-ins with side pots, uncalled bets returned, rake and
+a showdown. Each player's history is written line by line in the site's format, inside the same markup the
+html_parser backends read.
+
+Hand i of a seed is the same on every run and platform, and doesn't depend on the hands before it,
+so a corpus can be generated in slices with --start.
+
+Usage:
+    python synthetic.py OUTPUT_FOLDER [--hands N] [--seed S] [--start I] [--hands-per-page K] [--files-per-folder M]
+"""
+import argparse
+import random
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator, List, Set, Tuple
+
+from cards import DECK, KOREAN, KOREAN_RANKS, SUITS
+
+# (blind, MBI): the site's small blind, big blind and ante are the same amount
+STAKES = [(1000, 100_000), (2000, 200_000), (5000, 500_000)]
+CBIR = [100, 150, 200, 250, 300]
+RAKE_PER_MILLE = 53
+FIRST_STAGE = 10_000_000  # Stage number of hand 0, round IDs are 15-2-<stage>
+FIRST_HAND_TIME = datetime(2024, 7, 1, 8, 0, 0)
+SECONDS_PER_HAND = 53
+
+STREETS = ["프리플랍", "플랍", "턴", "리버"]  # Preflop, flop, turn, river
+POT_FRACTIONS = {"쿼터": 0.25, "하프": 0.5, "풀": 1.0}  # Quarter, half and full pot bets
+
+# Features a hand can have, counted by write_corpus
+ALL_IN = "all-in"
+SIDE_POT = "side pot"
+ENTRY_FEE = "entry fee"
+UNCALLED_BET = "uncalled bet"
+TIMEOUT = "timeout"
+LEFT_ROOM = "left room"
+SHOWDOWN = "showdown"
+
+# The site's own card numbering: spades, diamonds, hearts then clubs, from the ace to the king
+_SITE_SUIT_BASE = {"s": 0, "d": 13, "h": 26, "c": 39}
+_SITE_INDEX = tuple(_SITE_SUIT_BASE[SUITS[card % 4]] + (card // 4 + 1) % 13 for card in DECK)
+_NICKNAME_CHARACTERS = "abcdefghijklmnopqrstuvwxyz0123456789"
+_KOREAN_NICKNAMES = ["김예리미", "행운의손", "포커왕", "밤하늘", "고수"]
+
+
+# Hand evaluation
+
+_HIGH_CARD, _PAIR, _TWO_PAIR, _TRIPS, _STRAIGHT, _FLUSH, _FULL_HOUSE, _QUADS, _STRAIGHT_FLUSH = range(9)
+
+
+def _straight_top(ranks: Set[int]) -> int | None:
+    for top in range(12, 3, -1):
+        if all(rank in ranks for rank in range(top - 4, top + 1)):
+            return top
+    # The wheel, five high with the ace low
+    return 3 if {12, 0, 1, 2, 3} <= ranks else None
+
+
+def _straight_cards(cards: List[int], top: int) -> List[int]:
+    by_rank = {}
+    for card in cards:
+        by_rank.setdefault(card // 4, card)
+    return [by_rank[rank % 13 if rank >= 0 else 12] for rank in range(top, top - 5, -1)]
+
+
+def evaluate(cards: List[int]) -> Tuple[tuple, List[int], str]:
+    """
+    Finds the best hand of up to seven cards, or the best partial hand of fewer cards.
+
+    Returns:
+    - A score that compares like the hands do, the cards of the hand in the site's display order,
+      and its name as the site writes it, eg. '7 4 투 페어'.
+    """
+    cards = sorted(cards, key=lambda card: card // 4, reverse=True)
+    by_suit = {}
+    for card in cards:
+        by_suit.setdefault(card % 4, []).append(card)
+
+    flush = next((suited for suited in by_suit.values() if len(suited) >= 5), None)
+    if flush:
+        top = _straight_top({card // 4 for card in flush})
+        if top is not None:
+            name = "로열 스트레이트 플러시" if top == 12 else f"{KOREAN_RANKS[top]} 스트레이트 플러시"
+            return (_STRAIGHT_FLUSH, top), _straight_cards(flush, top), name
+
+    groups = {}
+    for card in cards:
+        groups.setdefault(card // 4, []).append(card)
+    # Largest groups first, then the highest ranks
+    ordered = sorted(groups.items(), key=lambda item: (len(item[1]), item[0]), reverse=True)
+    counts = [len(group) for _, group in ordered]
+
+    def kickers(used_ranks, number):
+        return [card for card in cards if card // 4 not in used_ranks][:number]
+
+    if counts[0] == 4:
+        rank = ordered[0][0]
+        shown = ordered[0][1] + kickers({rank}, 1)
+        return (_QUADS, rank, *[card // 4 for card in shown[4:]]), shown, f"{KOREAN_RANKS[rank]} 포카드"
+
+    if counts[0] == 3 and len(counts) > 1 and counts[1] >= 2:
+        trips, pair = ordered[0][0], ordered[1][0]
+        shown = ordered[0][1] + ordered[1][1][:2]
+        return (_FULL_HOUSE, trips, pair), shown, f"{KOREAN_RANKS[trips]} 풀 하우스"
+
+    if flush:
+        shown = flush[:5]
+        return (_FLUSH, *[card // 4 for card in shown]), shown, f"{KOREAN_RANKS[shown[0] // 4]} 플러시"
+
+    top = _straight_top(set(groups))
+    if top is not None:
+        return (_STRAIGHT, top), _straight_cards(cards, top), f"{KOREAN_RANKS[top]} 스트레이트"
+
+    if counts[0] == 3:
+        rank = ordered[0][0]
+        shown = ordered[0][1] + kickers({rank}, 2)
+        return (_TRIPS, rank, *[card // 4 for card in shown[3:]]), shown, f"{KOREAN_RANKS[rank]} 트리플"
+
+    if counts[0] == 2 and len(counts) > 1 and counts[1] == 2:
+        high, low = ordered[0][0], ordered[1][0]
+        shown = ordered[0][1] + ordered[1][1] + kickers({high, low}, 1)
+        return ((_TWO_PAIR, high, low, *[card // 4 for card in shown[4:]]), shown,
+                f"{KOREAN_RANKS[high]} {KOREAN_RANKS[low]} 투 페어")
+
+    if counts[0] == 2:
+        rank = ordered[0][0]
+        shown = ordered[0][1] + kickers({rank}, 3)
+        return (_PAIR, rank, *[card // 4 for card in shown[2:]]), shown, f"{KOREAN_RANKS[rank]} 원 페어"
+
+    shown = cards[:5]
+    return (_HIGH_CARD, *[card // 4 for card in shown]), shown, f"{KOREAN_RANKS[shown[0] // 4]} 탑"
+
+
+def _korean(cards: List[int], separator: str = " ") -> str:
+    return separator.join(KOREAN[card] for card in cards)
+
+
+def _chips(amount: int) -> str:
+    return f"{amount:,}"
+
+
+# Dealing and betting
+
+class _Player:
+    __slots__ = ("name", "nickname", "start", "stack", "hole", "role", "parts", "folded", "timed_out", "left",
+                 "invested", "street", "returned", "won", "board_seen", "acted")
+
+    def __init__(self, name: str, nickname: str, stack: int, hole: List[int]):
+        self.name = name  # As shown in the 참가자 column
+        self.nickname = nickname  # As shown in the NICKNAME line, not always the same
+        self.start = stack
+        self.stack = stack
+        self.hole = hole
+        self.role = None  # "Small Blind", "Big Blind" or "Entry Fee"
+        self.parts: List[str] = []  # Markup of the history lines, in order
+        self.folded = False
+        self.timed_out = False
+        self.left = False
+        self.invested = 0  # Chips put in the pot during the hand
+        self.street = 0  # Chips put in the pot on the current street
+        self.returned = 0  # Uncalled bet given back
+        self.won = 0
+        self.board_seen = 0  # Community cards dealt while still in the hand
+        self.acted = False
+
+    def line(self, text: str):
+        self.parts.append("\n<br>" + text)
+
+    def put(self, amount: int):
+        self.stack -= amount
+        self.invested += amount
+        self.street += amount
+
+    @property
+    def can_act(self) -> bool:
+        return not self.folded and self.stack > 0
+
+
+@dataclass
+class SyntheticHand:
+    """One generated hand: the row of the table-area and what happened in it."""
+    index: int
+    round_id: str
+    played: datetime  # In Korea Standard Time
+    row: str  # The <tr> of the hand history table
+    players: int
+    features: Set[str] = field(default_factory=set)
+
+
+class _Hand:
+    def __init__(self, rng: random.Random, stage: int):
+        self.rng = rng
+        self.stage = stage
+        self.features = set()
+        self.blind, self.mbi = rng.choice(STAKES)
+        self.min_raise = self.blind
+
+        deck = list(DECK)
+        rng.shuffle(deck)
+        count = rng.choices(range(2, 10), weights=[2, 2, 3, 4, 5, 6, 7, 9])[0]
+        names = set()
+        self.players: List[_Player] = []
+        for _ in range(count):
+            name = self._nickname(names)
+            nickname = rng.choice(_KOREAN_NICKNAMES) if rng.random() < 0.02 else name
+            if rng.random() < 0.1:
+                name = name.capitalize()
+            self.players.append(_Player(name, nickname, self._stack(), [deck.pop(), deck.pop()]))
+        self.board = [deck.pop() for _ in range(5)]
+        self.dealt = 0  # Community cards dealt so far
+
+        # Preflop order: everyone after the big blind, then the blinds. Heads up the small blind acts first
+        self.preflop = self.players
+        if count == 2:
+            self.small_blind, self.big_blind = self.players
+            self.postflop = [self.big_blind, self.small_blind]
+        else:
+            self.small_blind, self.big_blind = self.players[-2:]
+            self.postflop = self.players[-2:] + self.players[:-2]
+
+    def _nickname(self, taken: Set[str]) -> str:
+        while True:
+            length = self.rng.randint(4, 15)
+            name = "".join(self.rng.choice(_NICKNAME_CHARACTERS) for _ in range(length))
+            if name not in taken:
+                taken.add(name)
+                return name
+
+    def _stack(self) -> int:
+        roll = self.rng.random()
+        if roll < 0.3:
+            return self.mbi
+        if roll < 0.45:
+            # Short stacks, most of the all-ins
+            return self.rng.randint(5, 30) * self.blind + self.rng.randint(0, 999)
+        return self.rng.randint(30, 600) * self.blind + self.rng.randint(0, 999)
+
+    def pot(self) -> int:
+        return sum(player.invested for player in self.players)
+
+    def in_hand(self) -> List[_Player]:
+        return [player for player in self.players if not player.folded]
+
+    def play(self):
+        rng, blind = self.rng, self.blind
+        for player in self.players:
+            player.line(f"* 시작 : [StageNo:{self.stage}] [Credit:{_chips(player.start)}원] [SB:{_chips(blind)}원] "
+                        f"[BB:{_chips(blind)}원] [MBI:{_chips(self.mbi)}원] [CBIR:{rng.choice(CBIR)}]")
+            player.line(f"* NICKNAME:[{player.nickname.lower()}]")
+            player.put(blind)
+            player.line(f"* 앤티: -{_chips(blind)}원({_chips(player.stack)}원)")
+            score, shown, name = evaluate(player.hole)
+            hole = " ".join(f"{KOREAN[card]}({_SITE_INDEX[card]})" for card in player.hole)
+            player.line(f"* 홀 카드딜: {hole} [{name}]")
+            player.line(f"* 턴 시작: [{STREETS[0]}(0)] [족보:{name}({_korean(shown)})]")
+        # The ante is not part of the street
+        for player in self.players:
+            player.street = 0
+
+        for player, blind_type in [(self.small_blind, "SMALL"), (self.big_blind, "BIG")]:
+            player.role = "Small Blind" if blind_type == "SMALL" else "Big Blind"
+            player.put(blind)
+            player.line(f"* 베팅: [블라인드:{blind_type}] [금액:{_chips(blind)}원] [Creadit:{_chips(player.stack)}원]")
+        if len(self.players) > 2:
+            for player in self.players[:-2]:
+                # New players post a big blind to join the table
+                if rng.random() < 0.08:
+                    player.role = "Entry Fee"
+                    player.put(blind)
+                    player.line(f"* 신규 참가비 [금액:{_chips(blind)}원] [Credit:{_chips(player.stack)}원]")
+                    self.features.add(ENTRY_FEE)
+
+        for street in range(4):
+            if street:
+                if not self._deal(street):
+                    break
+            self._betting_round(street, self.preflop if street == 0 else self.postflop)
+            self._return_uncalled()
+            if len(self.in_hand()) == 1:
+                break
+            if street < 3 and sum(player.can_act for player in self.in_hand()) <= 1:
+                # Nobody left to bet against: the rest of the board is dealt at once
+                for player in self.in_hand():
+                    player.line(f"* 쇼다운 상태 진입: [턴:{street}]")
+                self._deal(3, all_at_once=True)
+                break
+
+        self._award()
+        return self._row()
+
+    def _deal(self, street: int, all_at_once: bool = False) -> bool:
+        self.dealt = 5 if all_at_once else street + 2
+        board = [self.board[:3]] + [[card] for card in self.board[3:self.dealt]]
+        section = " ".join(f"({_korean(cards, '')})" for cards in board)
+        for player in self.players:
+            if player.left:
+                continue
+            player.line(f"* 커뮤니티 카드 딜: H({_korean(player.hole, '')}) C {section}")
+            if not player.folded:
+                player.board_seen = self.dealt
+                if not all_at_once:
+                    score, shown, name = evaluate(player.hole + self.board[:self.dealt])
+                    player.line(f"* 턴 시작: [{STREETS[street]}({street})] [족보:{name}({_korean(shown)})]")
+                    if not player.stack:
+                        player.line("* 올인 플레이어 턴: Credit(0원)")
+            player.street = 0
+        self.min_raise = self.blind
+        return True
+
+    def _betting_round(self, street: int, order: List[_Player]):
+        current = max(player.street for player in order)
+        queue = deque(player for player in order if player.can_act)
+        position = 0
+
+        while queue:
+            player = queue.popleft()
+            if not player.can_act or len(self.in_hand()) == 1:
+                continue
+            to_call = current - player.street
+            others_can_act = any(other.can_act for other in self.in_hand() if other is not player)
+            if to_call == 0 and not others_can_act:
+                continue
+
+            position += 1
+            order_text = f" - 베팅순서: [{street}][{position}]"
+            action = self._decide(street, to_call, others_can_act)
+
+            if action == "fold":
+                player.folded = True
+                if to_call and self.rng.random() < 0.02:
+                    player.timed_out = True
+                    player.line("* 베팅: 타임아웃[자동다이]")
+                    player.line(f"* 베팅: 다이 [2]({_chips(player.stack)}원){order_text}")
+                    player.parts.append(f"\n[{self.rng.randint(10000, 10400)}ms]")
+                    self.features.add(TIMEOUT)
+                else:
+                    player.line(f"* 베팅: 다이 [0]({_chips(player.stack)}원){order_text}")
+                    self._think(player)
+                if self.rng.random() < 0.03:
+                    player.left = True
+                    player.line("* 방이동요청[0]")
+                    player.line("* 방나감")
+                    self.features.add(LEFT_ROOM)
+                continue
+
+            if action == "check":
+                player.line(f"* 베팅: 체크 -0원({_chips(player.stack)}원){order_text}")
+                self._think(player)
+                continue
+
+            if action == "call":
+                amount = min(to_call, player.stack)
+                player.put(amount)
+                if player.stack:
+                    player.line(f"* 베팅: 콜 -{_chips(amount)}원({_chips(player.stack)}원){order_text}")
+                else:
+                    player.line(f"* 베팅: [올인] ({_chips(amount)}원) Credit(0원){order_text}")
+                    self.features.add(ALL_IN)
+                self._think(player)
+                continue
+
+            label, amount = self._size(player, to_call, current, shove=action == "shove")
+            player.put(amount)
+            if not player.stack:
+                label = "올인"
+                self.features.add(ALL_IN)
+            player.line(f"* 베팅: [{label}] ({_chips(amount)}원) Credit({_chips(player.stack)}원){order_text}")
+            self._think(player)
+
+            if player.street > current:
+                self.min_raise = max(self.min_raise, player.street - current)
+                current = player.street
+                # Everyone else gets to answer the raise, in order after the raiser
+                index = order.index(player)
+                queue = deque(other for other in order[index + 1:] + order[:index] if other.can_act)
+
+    def _decide(self, street: int, to_call: int, others_can_act: bool) -> str:
+        roll = self.rng.random()
+        if to_call == 0:
+            return "check" if roll < 0.62 else ("shove" if roll > 0.97 else "bet")
+        if street == 0 and to_call <= self.blind:
+            fold, call = 0.42, 0.86
+        else:
+            fold, call = 0.45, 0.88
+        if roll < fold:
+            return "fold"
+        if roll < call or not others_can_act:
+            return "call"
+        return "shove" if roll > 0.97 else "bet"
+
+    def _size(self, player: _Player, to_call: int, current: int, shove: bool) -> Tuple[str, int]:
+        """The label and the chips put in by a bet or raise, everything the player has for a shove."""
+        if shove:
+            return "올인", player.stack
+
+        minimum = to_call + self.min_raise
+        pot_after_call = self.pot() + to_call
+        label = self.rng.choices(["쿼터", "하프", "풀", None], weights=[2, 3, 2, 3])[0]
+        if label is not None:
+            amount = to_call + int(pot_after_call * POT_FRACTIONS[label])
+        elif current:
+            label = "레이즈"
+            amount = int(current * self.rng.uniform(2, 3.5)) // 500 * 500 - player.street
+        else:
+            label = "베팅"
+            amount = self.rng.randint(self.blind, max(self.blind, pot_after_call)) // 500 * 500
+
+        if amount < minimum:
+            label = "레이즈" if current else "베팅"
+            amount = minimum
+        return label, min(amount, player.stack)
+
+    def _think(self, player: _Player):
+        player.parts.append(f"\n[{int(self.rng.lognormvariate(7.2, 0.7))}ms]")
+
+    def _return_uncalled(self):
+        # The biggest bet of the street is only matched up to the second biggest
+        ordered = sorted(self.players, key=lambda player: player.street, reverse=True)
+        top, second = ordered[0], ordered[1]
+        excess = top.street - second.street
+        if excess > 0:
+            top.stack += excess
+            top.invested -= excess
+            top.street -= excess
+            top.returned += excess
+            self.features.add(UNCALLED_BET)
+
+    def _award(self):
+        contenders = self.in_hand()
+        if len(contenders) > 1:
+            self.features.add(SHOWDOWN)
+        scores = {id(player): evaluate(player.hole + self.board[:player.board_seen])[0] for player in contenders}
+
+        pots = []
+        previous = 0
+        for level in sorted({player.invested for player in contenders}):
+            amount = sum(min(player.invested, level) - min(player.invested, previous) for player in self.players)
+            pots.append((amount, [player for player in contenders if player.invested >= level]))
+            previous = level
+        # Chips of folded players above the last all-in level go to the last pot
+        leftover = self.pot() - sum(amount for amount, _ in pots)
+        if leftover:
+            amount, eligible = pots[-1]
+            pots[-1] = (amount + leftover, eligible)
+        if len(pots) > 1:
+            self.features.add(SIDE_POT)
+
+        self.main_winner = None
+        for amount, eligible in pots:
+            best = max(scores[id(player)] for player in eligible)
+            winners = [player for player in eligible if scores[id(player)] == best]
+            net = amount - amount * RAKE_PER_MILLE // 1000
+            share, remainder = divmod(net, len(winners))
+            for player in winners:
+                player.won += share
+            winners[0].won += remainder
+            if self.main_winner is None:
+                self.main_winner = winners[0]
+
+        for player in self.players:
+            player.stack += player.won
+
+    def _row(self) -> str:
+        contested = len(self.in_hand()) > 1
+        cells = []
+        for player in self.players:
+            seen = player.hole + self.board[:player.board_seen]
+            score, shown, name = evaluate(seen)
+            if not player.left:
+                if player.returned:
+                    player.parts.append(f"\n# 공베팅 반환 [{_chips(player.returned)}원]<br>")
+                else:
+                    player.parts.append("\n<br>")
+                player.parts.append(f"* 종료: WinMoney[{_chips(player.won)}원] Credit[{_chips(player.stack)}원]")
+                if player.folded:
+                    suffix = " - 기권"
+                else:
+                    suffix = "" if contested else " - 기권승"
+                result = "승리" if player.won else "패배"
+                player.line(f"* 결과: {result} [족보:{name}] [카드:{_korean(shown)}]{suffix}")
+
+            tags = ("(시간) " if player.timed_out else "(다이) " if player.folded else "") + (f"({player.role})" if player.role else "")
+            history = f"{_korean(seen)} [{name}]  {tags}" + "".join(player.parts)
+            cells.append(_PLAYER_ROW.format(name=player.name, history=_red_suits(history),
+                                            change=_chips(player.stack - player.start), stack=_chips(player.stack)))
+
+        self.rng.shuffle(cells)
+        winner = self.main_winner
+        winner_seen = winner.hole + self.board[:winner.board_seen]
+        self.winner_text = f"{winner.name} ({evaluate(winner_seen)[2]})"
+        self.winning_amount = winner.won
+        return "".join(cells)
+
+
+def _red_suits(text: str) -> str:
+    return text.replace("♥", "<font color='red'>♥</font>").replace("◆", "<font color='red'>◆</font>")
+
+
+def site_timestamp(played: datetime) -> str:
+    """Formats a datetime like the site, eg. '2024-09-03 오전 8:35:31'."""
+    meridiem = "오전" if played.hour < 12 else "오후"
+    return f"{played:%Y-%m-%d} {meridiem} {(played.hour - 1) % 12 + 1}:{played:%M:%S}"
+
+
+def generate_hand(index: int, seed: int = 0) -> SyntheticHand:
+    """
+    Deals and plays hand number index of a seed.
+
+    Returns:
+    - The hand, with its table row ready to be put on a page.
+    """
+    rng = random.Random(f"{seed}:{index}")
+    stage = FIRST_STAGE + index
+    hand = _Hand(rng, stage)
+    player_rows = hand.play()
+
+    played = FIRST_HAND_TIME + timedelta(days=seed % 365, seconds=index * SECONDS_PER_HAND + rng.randint(0, 40))
+    round_id = f"15-2-{stage}"
+    row = _HAND_ROW.format(round_id=round_id, timestamp=site_timestamp(played), winner=hand.winner_text,
+                           raw_amount=hand.winning_amount, amount=_chips(hand.winning_amount), player_rows=player_rows)
+    return SyntheticHand(index=index, round_id=round_id, played=played, row=row, players=len(hand.players),
+                         features=hand.features)
+
+
+def render_page(hands: List[SyntheticHand]) -> str:
+    """A whole page holding the hands, in the order given."""
+    return _PAGE_HEAD + "".join(hand.row for hand in hands) + _PAGE_TAIL.format(round_id=hands[0].round_id)
+
+
+def page_name(hands: List[SyntheticHand]) -> str:
+    """
+    Single hand pages are named like the export tool names them, with the time the hand was played,
+    which the converter takes over the page's own timestamp.
+    """
+    stamp = f"{hands[0].played:%Y-%m-%dT%H-%M-%S}"
+    if len(hands) == 1:
+        return f"{hands[0].round_id}_{stamp}.html"
+    return f"page{hands[0].index // len(hands):07d}_{stamp}.html"
+
+
+def iter_pages(hands: int, seed: int = 0, start: int = 0, hands_per_page: int = 1) -> Iterator[Tuple[List[SyntheticHand], str]]:
+    """Yields the hands start to start + hands, grouped in pages, with the HTML of each page."""
+    end = start + hands
+    for first in range(start, end, hands_per_page):
+        page = [generate_hand(index, seed) for index in range(first, min(first + hands_per_page, end))]
+        yield page, render_page(page)
+
+
+def write_corpus(folder: Path, hands: int, seed: int = 0, start: int = 0, hands_per_page: int = 1,
+                 files_per_folder: int = 1000) -> Counter:
+    """
+    Writes hands as .html pages below folder, files_per_folder pages per subfolder.
+
+    Returns:
+    - How many pages and hands were written, and how many hands had each feature.
+    """
+    folder = Path(folder)
+    counts = Counter()
+    for page, html in iter_pages(hands, seed, start, hands_per_page):
+        page_number = page[0].index // hands_per_page
+        subfolder = folder / f"{page_number // files_per_folder:05d}"
+        subfolder.mkdir(parents=True, exist_ok=True)
+        (subfolder / page_name(page)).write_text(html, encoding="utf-8")
+
+        counts["pages"] += 1
+        for hand in page:
+            counts["hands"] += 1
+            counts.update(hand.features)
+    return counts
+
+
+_PLAYER_ROW = """
+
+
+
+										<tr bgcolor="white">
+											<td style="word-break:break-all" bgcolor="white"><p align="center"><b><font color=>{name}</font></b></p></td>
+
+											<td style="word-break:break-all"><p align="left">
+											{history}
+
+											</p></td>
+
+											<td style="word-break:break-all"><p align="right"><font color='red'>{change}</font></p></td>
+											<td style="word-break:break-all"><p align="right">{stack}</p></td>
+
+										</tr>
+"""
+
+_HAND_ROW = """
+
+
+
+                            <tr bgcolor="white">
+								<td width="56" height="26"><p align="center">&nbsp;{round_id}</p></td>
+                                <td height="26" ><p align="center">&nbsp;{timestamp}</p></td>
+                                <td ><p align="center">&nbsp;홀덤</p></td>
+                                <td ><p align="center">&nbsp;<b>{winner}</b></p></td>
+<!--								<td ><p align="center">&nbsp;{raw_amount}</p></td>   -->
+								<td ><p align="center">&nbsp;{amount}</p></td>
+								<td class="double-table">
+
+									<table cellspacing="0" width="100%"  border="0">
+										<colgroup>
+											<col width="200" />
+											<col width="*" />
+											<col width="160" />
+											<col width="200" />
+										</colgroup>
+										<tr>
+											<th height="34" style="word-break:break-all"><p align="center">참가자</p></th>
+											<th height="34" style="word-break:break-all"><p align="center">족보</p></th>
+											<th height="34" style="word-break:break-all"><p align="center">변동 금액</p></th>
+											<th height="34" style="word-break:break-all"><p align="center">남은 잔액</p></th>
+										</tr>
+
+
+{player_rows}
+									 </table>
+								</td>
+                            </tr>
+"""
+
+# The site's page around the table, with its style sheet shortened to the rules of the table-area
+_PAGE_HEAD = """<iframe width="0" height="0" name="hfrm"></iframe>
+<script language="javascript">
+	function goProc(mode,uid,infotype,money){
+		form = document.form1;
+		form.target="hfrm";
+		if (money < 1) {
+			alert("1보다 큰금액만 입력하실수 있습니다");
+			return;
+		}
+		form.infotype.value=infotype;
+		form.money.value=money;
+		form.user_id.value=uid;
+		form.action="userinmoney_proc.asp";
+
+			if(confirm(uid + "에게 " + money + "원 하자처리 하시겠습니까?")){
+				form.submit();
+			}
+
+	}
+</script>
+
+<style>
+		body {background:#f5f5f5;}
+		* {padding:0; margin:0;}
+		.table-area {
+			border:1px solid #e6e6f2;
+			border-radius:1rem;
+			overflow-x:auto;
+			background:#fff;
+			box-shadow:3px 3px 5px #e7e7e7;
+			margin:1rem;
+		}
+		.table-area td {
+			font-size:14px;
+			padding:0.425rem 0.75rem;
+			color:#71748d;
+			white-space:nowrap;
+			background:#fff;
+			border-bottom:1px solid #e6e6f2;
+		}
+		.table-area table td.double-table tr:nth-child(2n) td {
+			background:#f9f9f9;
+		}
+	</style>
+
+	<div class="page-layout">
+		<div class="bar-search">
+			<div class="title">게임기록보기</div>
+			<div>
+                <div>
+					<input type="button" value="닫기" onclick="self.close()" class="btn-serarch" />
+                </div>
+			</div>
+		</div>
+
+		<div class="table-area">
+			<table cellspacing="0" width="100%"  border="0" >
+				<tr>
+                          <th width="" height="34"><p align="center">라운드ID</p></th>
+                          <th width="" height="34"><p align="center">시각</p></th>
+                          <th width="" height="34"><p align="center">게임 종류</p></th>
+                          <th width="" height="34"><p align="center">승자(족보)</p></th>
+					<th width="" height="34"><p align="center">이긴금액</p></th>
+					<th class="double-table">
+						상세정보
+					</th>
+				</tr>
+"""
+
+_PAGE_TAIL = """
+
+
+
+
+
+
+                        </table>
+
+                        <table cellpadding="0" cellspacing="0" border="0" width="100%">
+                            <tr>
+                                <td width="100%" align="center" style="padding:1rem 0; background:#fdfdfd;">
+                                	<input type="button" value="닫기" onclick="self.close()" class="btn-history-back">
+                                </td>
+                            </tr>
+                        </table>
+
+		</div>
+
+	</div>
+
+
+
+
+<form name="form1" method="Post">
+<input type="hidden" name="s_scroll" value="">
+<input type="hidden" name="s_key" value="">
+<input type="hidden" name="logno" value="{round_id}">
+<input type="hidden" name="user_id">
+<input type="hidden" name="money">
+</form>
+"""
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output_folder", type=Path, help="Folder to write the pages to")
+    parser.add_argument("--hands", type=int, default=1000, help="Number of hands (default: 1000)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the corpus (default: 0)")
+    parser.add_argument("--start", type=int, default=0, help="Index of the first hand, to generate a corpus in slices")
+    parser.add_argument("--hands-per-page", type=int, default=1, help="Hands on each page (default: 1)")
+    parser.add_argument("--files-per-folder", type=int, default=1000, help="Pages in each subfolder (default: 1000)")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    counts = write_corpus(args.output_folder, args.hands, args.seed, args.start, args.hands_per_page,
+                          args.files_per_folder)
+    elapsed = time.perf_counter() - started
+
+    hands = counts.pop("hands", 0)
+    pages = counts.pop("pages", 0)
+    print(f"{hands} hands on {pages} pages in {elapsed:.1f}s ({hands / elapsed if elapsed else 0:.0f} hands/sec)")
+    for feature, count in sorted(counts.items()):
+        print(f"  {feature}: {count} hands ({count / hands:.1%})")
+
+
+if __name__ == "__main__":
+    main()
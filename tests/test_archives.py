@@ -0,0 +1,128 @@
+import contextlib
+import io
+import pickle
+import tarfile
+import tempfile
+import unittest
+import zipfile
+from datetime import datetime
+from pathlib import Path, PurePosixPath
+
+import main
+from archives import ArchiveMember, archive_stem, is_safe_member_name, iter_archive
+from main import ConversionOptions, convert_file
+from utils import find_files, extract_datetime_from_filename
+
+DATA = Path(__file__).parent / "data"
+EXPECTED = Path(__file__).parent / "expected"
+NAMES = ["smallhand.html", "parseerror2_2025-02-08T20-57-51.html"]
+
+
+class TestArchives(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_folder = Path(self.temp_dir.name) / "data"
+        (self.data_folder / "daily").mkdir(parents=True)
+
+        self.zip_path = self.data_folder / "2025-02-08.zip"
+        with zipfile.ZipFile(self.zip_path, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            for name in NAMES:
+                zip_file.write(DATA / name, f"hands/{name}")
+            zip_file.writestr("hands/readme.txt", "not a hand")
+
+        self.tar_path = self.data_folder / "daily" / "2025-02-09.tar.gz"
+        with tarfile.open(self.tar_path, "w:gz") as tar_file:
+            for name in NAMES:
+                tar_file.add(DATA / name, name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_find_files_reads_archive_members(self):
+        files = list(find_files(self.data_folder))
+        self.assertEqual(sorted(str(file.relative_to(self.data_folder)) for file in files), [
+            "2025-02-08.zip/hands/parseerror2_2025-02-08T20-57-51.html",
+            "2025-02-08.zip/hands/smallhand.html",
+            "daily/2025-02-09.tar.gz/parseerror2_2025-02-08T20-57-51.html",
+            "daily/2025-02-09.tar.gz/smallhand.html",
+        ])
+        self.assertEqual(list(find_files(self.data_folder, archives=False)), [])
+
+    def test_members_read_like_files(self):
+        for archive in [self.zip_path, self.tar_path]:
+            with self.subTest(archive=archive.name):
+                for member in iter_archive(archive):
+                    content = (DATA / member.name).read_bytes()
+                    self.assertEqual(member.read_bytes(), content)
+                    self.assertEqual(member.stat().st_size, len(content))
+                    self.assertEqual(member.relative_to(archive), PurePosixPath(member.member_name))
+
+    def test_member_content_survives_pickling(self):
+        members = iter_archive(self.tar_path)
+        member = next(members)
+        member.read_bytes()
+        members.close()
+        copy = pickle.loads(pickle.dumps(member))
+        self.assertEqual(copy.read_bytes(), member.read_bytes())
+
+        unread = pickle.loads(pickle.dumps(next(iter_archive(self.zip_path))))
+        with self.assertRaises(ValueError):
+            unread.read_bytes()
+
+    def test_datetime_from_member_names(self):
+        member = next(member for member in iter_archive(self.zip_path) if member.name.startswith("parseerror2"))
+        self.assertEqual(extract_datetime_from_filename(member), datetime(2025, 2, 8, 20, 57, 51))
+        self.assertEqual(extract_datetime_from_filename(member.member_name), datetime(2025, 2, 8, 20, 57, 51))
+        self.assertIsInstance(member, ArchiveMember)
+
+    def test_archive_stem(self):
+        self.assertEqual(archive_stem(self.tar_path), "2025-02-09")
+        self.assertEqual(archive_stem(self.zip_path), "2025-02-08")
+
+    def test_convert_archive(self):
+        for executor in ["serial", "process"]:
+            with self.subTest(executor=executor):
+                main.main([str(self.zip_path), "--executor", executor, "--workers", "1", "--force"])
+
+                output = self.data_folder / "2025-02-08_converted" / "hands" / "smallhand.txt"
+                self.assertEqual(output.read_text(encoding="utf-8"),
+                                 (EXPECTED / "smallhand.txt").read_text(encoding="utf-8"))
+
+    def test_member_names_outside_the_archive_are_skipped(self):
+        zip_path = self.data_folder / "in" / "malicious.zip"
+        zip_path.parent.mkdir()
+        with zipfile.ZipFile(zip_path, "w") as zip_file:
+            # ZipInfo keeps the names as they are, ZipFile.write would clean them up
+            for name in ["../../escaped.html", "/tmp/escaped_absolute.html"]:
+                zip_file.writestr(zipfile.ZipInfo(name), (DATA / "smallhand.html").read_bytes())
+            zip_file.write(DATA / "smallhand.html", "hands/smallhand.html")
+        tar_path = self.data_folder / "in" / "malicious.tar"
+        with tarfile.open(tar_path, "w") as tar_file:
+            tar_file.add(DATA / "smallhand.html", "../escaped.html")
+
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            self.assertEqual([member.member_name for member in iter_archive(zip_path)], ["hands/smallhand.html"])
+            self.assertEqual(list(iter_archive(tar_path)), [])
+            main.main([str(self.data_folder / "in"), "--executor", "serial"])
+
+        self.assertIn("Skipping '../../escaped.html'", output.getvalue())
+        self.assertEqual([path.name for path in Path(self.temp_dir.name).rglob("escaped*")], [])
+        self.assertTrue((self.data_folder / "in_converted" / "malicious.zip" / "hands" / "smallhand.txt").exists())
+
+    def test_member_names(self):
+        for name in ["hands/a.html", "a..html"]:
+            self.assertTrue(is_safe_member_name(name), name)
+        for name in ["../a.html", "hands/../../a.html", "/a.html", "..\\a.html", "C:/a.html", ""]:
+            self.assertFalse(is_safe_member_name(name), name)
+
+    def test_output_outside_the_output_folder_is_refused(self):
+        member = ArchiveMember(self.data_folder, "../escaped.html", None, lambda: (DATA / "smallhand.html").read_bytes())
+        member._stat = (DATA / "smallhand.html").stat()
+        with self.assertRaisesRegex(ValueError, "outside the output folder"):
+            convert_file(member, self.data_folder, Path(self.temp_dir.name) / "out", ConversionOptions())
+        self.assertEqual(list(Path(self.temp_dir.name).rglob("escaped*")), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
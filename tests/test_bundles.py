@@ -0,0 +1,118 @@
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+import bundles
+import main
+from bundles import BundledHand, BundleWriter, bundle_key
+from html_parser import extract_hand_histories_from_html
+from pokerstars_converter import HAND_SEPARATOR
+
+DATA = Path(__file__).parent / "data"
+
+
+def hand(key, text):
+    return BundledHand(key=key, data=text.encode("utf-8"))
+
+
+class TestBundleWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_folder = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def read(self, mode, name):
+        return (self.output_folder / mode / name).read_text(encoding="utf-8")
+
+    def test_hands_are_separated_per_key(self):
+        with BundleWriter(self.output_folder, bundles.DAY) as writer:
+            writer.write(hand("2024-11-10", "first"))
+            writer.write(hand("2024-11-11", "other"))
+            writer.write(hand("2024-11-10", "second"))
+
+        self.assertEqual(self.read("day", "2024-11-10_0001.txt"), "first" + HAND_SEPARATOR + "second")
+        self.assertEqual(self.read("day", "2024-11-11_0001.txt"), "other")
+        self.assertEqual(writer.hands_written, 3)
+
+    def test_rolls_over_by_hands_and_bytes(self):
+        with BundleWriter(self.output_folder, bundles.ROLLING, max_hands=2) as writer:
+            for text in "abcde":
+                writer.write(hand("hands", text))
+
+        self.assertEqual([self.read("rolling", f"hands_000{part}.txt") for part in (1, 2, 3)],
+                         ["a" + HAND_SEPARATOR + "b", "c" + HAND_SEPARATOR + "d", "e"])
+
+        with BundleWriter(self.output_folder, bundles.STAKE, max_bytes=10) as writer:
+            for text in ["1234", "5678", "9", "a hand longer than the limit"]:
+                writer.write(hand("500-1000", text))
+
+        self.assertEqual(self.read("stake", "500-1000_0001.txt"), "1234")
+        self.assertEqual(self.read("stake", "500-1000_0002.txt"), "5678" + HAND_SEPARATOR + "9")
+        self.assertEqual(self.read("stake", "500-1000_0003.txt"), "a hand longer than the limit")
+
+    def test_later_runs_start_a_new_part(self):
+        for text in ["first run", "second run"]:
+            with BundleWriter(self.output_folder, bundles.DAY) as writer:
+                writer.write(hand("2024-11-10", text))
+
+        self.assertEqual(self.read("day", "2024-11-10_0001.txt"), "first run")
+        self.assertEqual(self.read("day", "2024-11-10_0002.txt"), "second run")
+
+    def test_least_recently_written_bundles_are_closed(self):
+        with mock.patch.object(bundles, "MAX_OPEN_BUNDLES", 2), BundleWriter(self.output_folder, bundles.DAY) as writer:
+            for key in ["a", "b", "c", "a"]:
+                writer.write(hand(key, key))
+            self.assertEqual(list(writer._handles), ["c", "a"])
+
+        self.assertEqual(self.read("day", "a_0001.txt"), "a" + HAND_SEPARATOR + "a")
+
+    def test_files_mode_does_not_bundle(self):
+        with self.assertRaises(ValueError):
+            BundleWriter(self.output_folder, bundles.FILES)
+
+    def test_bundle_key(self):
+        poker_hand = extract_hand_histories_from_html((DATA / "all_in_pre.html").read_text(encoding="utf-8"))
+
+        self.assertEqual(bundle_key(bundles.DAY, poker_hand), "2024-11-10")
+        self.assertEqual(bundle_key(bundles.DAY, poker_hand, datetime(2025, 2, 8, 20, 57, 51)), "2025-02-08")
+        self.assertEqual(bundle_key(bundles.STAKE, poker_hand),
+                         f"{poker_hand.get_small_blind_amount()}-{poker_hand.get_big_blind_amount()}")
+        self.assertEqual(bundle_key(bundles.ROLLING, poker_hand), "hands")
+
+
+class TestBundledConversion(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_folder = Path(self.temp_dir.name) / "data"
+        self.data_folder.mkdir()
+        for name in ["smallhand.html", "bighand.html", "river-9way-bet-call.html"]:
+            shutil.copy(DATA / name, self.data_folder / name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_rolling_bundle_holds_every_hand(self):
+        main.main([str(self.data_folder), "--executor", "serial", "--output-mode", "rolling"])
+
+        output_folder = Path(self.temp_dir.name) / "data_converted"
+        bundle = (output_folder / "rolling" / "hands_0001.txt").read_text(encoding="utf-8")
+        self.assertEqual(len(bundle.split(HAND_SEPARATOR)), 3)
+        self.assertEqual(sorted(path.name for path in output_folder.rglob("*.txt")), ["hands_0001.txt"])
+
+    def test_changing_the_output_mode_converts_again(self):
+        main.main([str(self.data_folder), "--executor", "serial"])
+        main.main([str(self.data_folder), "--executor", "serial", "--output-mode", "stake"])
+
+        output_folder = Path(self.temp_dir.name) / "data_converted"
+        self.assertTrue(list((output_folder / "stake").glob("*.txt")))
+
+
+if __name__ == '__main__':
+    unittest.main()
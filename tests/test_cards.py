@@ -0,0 +1,42 @@
+import unittest
+
+import cards
+
+
+class TestCards(unittest.TestCase):
+
+    def test_tables_cover_the_deck(self):
+        self.assertEqual(len(set(cards.POKERSTARS)), 52)
+        self.assertEqual(len(set(cards.KOREAN)), 52)
+        for card in cards.DECK:
+            self.assertEqual(cards.from_pokerstars(cards.to_pokerstars(card)), card)
+            self.assertEqual(cards.from_korean(cards.to_korean(card)), card)
+            self.assertEqual(cards.card(cards.rank_of(card), cards.suit_of(card)), card)
+
+    def test_notations(self):
+        ten_of_diamonds = cards.card("T", "d")
+        self.assertEqual(cards.to_pokerstars(ten_of_diamonds), "Td")
+        self.assertEqual(cards.to_korean(ten_of_diamonds), "◆10")
+        self.assertEqual(cards.from_korean("◆T"), ten_of_diamonds)
+        self.assertEqual(cards.to_pokerstars(cards.from_korean("♠A")), "As")
+        self.assertEqual(cards.to_pokerstars(cards.from_korean("♣2")), "2c")
+        self.assertEqual(cards.to_pokerstars(cards.from_korean("♥K")), "Kh")
+
+    def test_parse_korean_cards(self):
+        board = cards.parse_korean_cards("♥K◆4◆10")
+        self.assertEqual(cards.format_pokerstars(board), "Kh 4d Td")
+        self.assertIs(cards.parse_korean_cards("♥K◆4◆10"), board)
+        self.assertEqual(cards.parse_korean_cards(""), ())
+
+    def test_unknown_cards(self):
+        for text in ("♦K", "♥1", "Xh"):
+            with self.assertRaises(ValueError):
+                cards.from_korean(text)
+        with self.assertRaises(ValueError):
+            cards.from_pokerstars("♥K")
+        with self.assertRaises(ValueError):
+            cards.parse_korean_cards("♥K◆")
+
+
+if __name__ == '__main__':
+    unittest.main()
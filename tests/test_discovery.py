@@ -0,0 +1,81 @@
+import os
+import pickle
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from discovery import DiscoveredFile, largest_first, scan_files
+from utils import find_files
+
+DATA = Path(__file__).parent / "data"
+
+
+class TestDiscovery(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.folder = Path(self.temp_dir.name)
+        for name, size in [("b.html", 10), ("a.html", 30), ("notes.txt", 50),
+                           ("2025/01/c.html", 20), ("2025/02/d.html", 40), ("2025/e.html", 5)]:
+            path = self.folder / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(b"x" * size)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def relative_names(self, files):
+        return [file.relative_to(self.folder).as_posix() for file in files]
+
+    def test_scan_is_depth_first_in_name_order(self):
+        self.assertEqual(self.relative_names(scan_files(self.folder)), [
+            "a.html", "b.html", "2025/e.html", "2025/01/c.html", "2025/02/d.html",
+        ])
+
+    def test_scan_matches_the_pattern(self):
+        self.assertEqual(self.relative_names(scan_files(self.folder, "*.txt")), ["notes.txt"])
+        self.assertEqual(self.relative_names(scan_files(self.folder, "[cd].html")), ["2025/01/c.html", "2025/02/d.html"])
+
+    def test_files_carry_their_stat(self):
+        for file in scan_files(self.folder):
+            self.assertEqual(file.size, os.stat(file).st_size)
+            self.assertEqual(file.stat().st_mtime_ns, file.path.stat().st_mtime_ns)
+            self.assertEqual(file.read_bytes(), file.path.read_bytes())
+            self.assertEqual(file.stem + file.suffix, file.name)
+
+    def test_parallel_scan_finds_the_same_files(self):
+        self.assertEqual(sorted(map(str, scan_files(self.folder, workers=4))), sorted(map(str, scan_files(self.folder))))
+
+    def test_largest_first(self):
+        self.assertEqual([file.name for file in largest_first(scan_files(self.folder))],
+                         ["d.html", "a.html", "c.html", "b.html", "e.html"])
+
+    def test_symlinked_directories_are_not_followed(self):
+        try:
+            (self.folder / "link").symlink_to(self.folder / "2025", target_is_directory=True)
+        except (OSError, NotImplementedError):
+            self.skipTest("symlinks are not available")
+        self.assertEqual(len(list(scan_files(self.folder))), 5)
+
+    def test_archives_are_ordered_then_expanded(self):
+        with zipfile.ZipFile(self.folder / "2025" / "big.zip", "w") as zip_file:
+            zip_file.write(DATA / "smallhand.html", "smallhand.html")
+            zip_file.writestr("padding.bin", b"\0" * 1000)
+
+        files = list(find_files(self.folder, order="largest"))
+        self.assertEqual(files[0].name, "smallhand.html")
+        self.assertEqual(str(files[0].relative_to(self.folder)), "2025/big.zip/smallhand.html")
+        self.assertEqual([file.name for file in files[1:]], ["d.html", "a.html", "c.html", "b.html", "e.html"])
+        self.assertEqual(len(list(find_files(self.folder, archives=False))), 5)
+
+    def test_discovered_files_survive_pickling(self):
+        file = next(scan_files(self.folder))
+        copy = pickle.loads(pickle.dumps(file))
+        self.assertEqual(copy, file)
+        self.assertEqual(copy.size, file.size)
+        self.assertIsInstance(copy, DiscoveredFile)
+
+
+if __name__ == "__main__":
+    unittest.main()
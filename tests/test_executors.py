@@ -0,0 +1,32 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from executors import SerialExecutor, create_executor
+
+
+class TestExecutors(unittest.TestCase):
+
+    def test_serial_executor_runs_inline(self):
+        with SerialExecutor() as executor:
+            future = executor.submit(pow, 2, 10)
+
+        self.assertTrue(future.done())
+        self.assertEqual(future.result(), 1024)
+
+    def test_serial_executor_captures_exceptions(self):
+        with SerialExecutor() as executor:
+            future = executor.submit(int, "not a number")
+
+        self.assertIsInstance(future.exception(), ValueError)
+
+    def test_create_thread_executor(self):
+        with create_executor("thread", 2) as executor:
+            self.assertIsInstance(executor, ThreadPoolExecutor)
+            self.assertEqual(executor.submit(sum, [1, 2, 3]).result(), 6)
+
+    def test_unknown_executor(self):
+        with self.assertRaises(ValueError):
+            create_executor("gpu")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,9 +2,10 @@ import unittest
 from pprint import pprint
 from pathlib import Path
 
+from cards import parse_korean_cards
 from constants import BetType
-from individual_history_parser import parse_hand_history, _parse_betting_action  # Import your function
-from html_parser import extract_hand_histories_from_html
+from individual_history_parser import parse_hand_history, _parse_betting_action, classify_line  # Import your function
+from html_parser import extract_hand_histories_from_html, Bs4Backend, StreamingBackend
 from models import StartEntry, PlayerEntry, AnteEntry, CommunityCardsEntry, ActionEntry, PostBlindEntry
 
 
@@ -56,8 +57,9 @@ class TestActionsParsing(unittest.TestCase):
         self.assertEqual(ante.amount, 2000)
         self.assertEqual(ante.remaining_stack, 262846)
 
-        self.assertEqual(community_cards.hole_cards, ["♥A", "♣8"])
-        self.assertEqual(community_cards.community_cards, [["♥6", "◆3", "♥4"], ["◆9"], ["♥7"]])
+        self.assertEqual(community_cards.hole_cards, parse_korean_cards("♥A♣8"))
+        self.assertEqual(community_cards.community_cards,
+                         [parse_korean_cards("♥6◆3♥4"), parse_korean_cards("◆9"), parse_korean_cards("♥7")])
 
         self.assertEqual(betting_actions[0].action, BetType.CALL)
         self.assertEqual(betting_actions[0].amount, 2000)
@@ -194,6 +196,35 @@ class TestActionsParsing(unittest.TestCase):
         self.assertEqual(bet.betting_round, 1)
         self.assertEqual(bet.betting_position, 4)
 
+    def test_classify_line(self):
+        self.assertEqual(classify_line("* 베팅: 콜 -1,000원(367,491원) - 베팅순서: [0][6]"), ("베팅:", False))
+        self.assertEqual(classify_line("        * 시작 : [StageNo:27891125] [Credit:264,846원]"), ("시작 :", False))
+        self.assertEqual(classify_line("* 턴 시작: [프리플랍(0)] [족보:A 탑(♥A ♣8)]"), (None, False))
+        self.assertEqual(classify_line("[5297ms]"), (None, False))
+        self.assertEqual(classify_line("* 종료: WinMoney[0원] Credit[260,846원]"), ("종료:", True))
+        self.assertEqual(classify_line("# 공베팅 반환 [4,000원]* 종료: WinMoney[3,788원] Credit[215,615원]"), ("# 공베팅 반환", True))
+
+    def test_parse_betting_action_shapes(self):
+        cases = [
+            ("* 베팅: 콜 -1,000원(367,491원) - 베팅순서: [0][6]", BetType.CALL, 1000, 367491, 0, 6),
+            ("* 베팅: 체크 -0원(364,080원) - 베팅순서: [1][2]", BetType.CHECK, 0, 364080, 1, 2),
+            ("* 베팅: 다이 [0](169,039원) - 베팅순서: [0][4]", BetType.FOLD, 0, 169039, 0, 4),
+            ("* 베팅: [하프] (8,500원) Credit(405,687원) - 베팅순서: [0][2]", BetType.BET, 8500, 405687, 0, 2),
+            ("* 베팅: [레이즈] (7,000원) Credit(92,000원) - 베팅순서: [0][6]", BetType.RAISE, 7000, 92000, 0, 6),
+            ("* 베팅: [올인] (38,500원) Credit(0원) - 베팅순서: [1][9]", BetType.ALL_IN, 38500, 0, 1, 9),
+            ("* 베팅: 콜 -1,000원(367,491원) - 베팅순서: [0][6] [318ms]", BetType.CALL, 1000, 367491, 0, 6),
+        ]
+
+        for line, action, amount, remaining_stack, betting_round, betting_position in cases:
+            with self.subTest(line=line):
+                bet: ActionEntry = _parse_betting_action(line)
+                self.assertEqual(bet.action, action)
+                self.assertEqual(bet.amount, amount)
+                self.assertEqual(bet.remaining_stack, remaining_stack)
+                self.assertEqual(bet.betting_round, betting_round)
+                self.assertEqual(bet.betting_position, betting_position)
+                self.assertIsNone(bet.uncalled_bet)
+
     def test_parse_html(self):
         script_dir = Path(__file__).parent
 
@@ -208,5 +239,17 @@ class TestActionsParsing(unittest.TestCase):
                 str = extract_hand_histories_from_html(html_content)
                 pprint(str)
 
+    def test_backends_extract_same_rows(self):
+        script_dir = Path(__file__).parent
+        data_folder = script_dir / "data"
+
+        for file in sorted(data_folder.glob("*.html")):
+            html_content = file.read_text(encoding="utf-8")
+            with self.subTest(file=file.name):
+                self.assertEqual(StreamingBackend().extract_row(html_content), Bs4Backend().extract_row(html_content))
+
+    def test_streaming_backend_without_table_area(self):
+        self.assertIsNone(StreamingBackend().extract_row("<html><body><table><tr><td>1</td></tr></table></body></html>"))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
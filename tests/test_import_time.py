@@ -0,0 +1,56 @@
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+# Cumulative import time budget for the conversion entry points, in microseconds.
+# Generous on purpose: it is there to catch a heavy module creeping back into the import path.
+IMPORT_TIME_BUDGET_US = 300_000
+
+# Only imported on demand (bs4 backend, timezone formatting) or not at all
+LAZY_MODULES = ["bs4", "pytz", "tkinter"]
+
+# Only needed by the main process to look for files, not by the workers converting them
+MAIN_PROCESS_MODULES = ["archives", "discovery", "tarfile", "zipfile", "concurrent.futures"]
+
+
+def import_times(module):
+    """Runs 'python -X importtime' on a fresh interpreter and returns {module: cumulative microseconds}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=Path(__file__).parent.parent, capture_output=True, text=True, check=True
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestImportTime(unittest.TestCase):
+
+    def test_import_has_no_side_effects(self):
+        for module in ["hand_parser", "main"]:
+            with self.subTest(module=module):
+                times = import_times(module)
+
+                for lazy_module in LAZY_MODULES:
+                    self.assertNotIn(lazy_module, times, f"{module} imports {lazy_module} eagerly")
+
+    def test_workers_do_not_import_file_discovery(self):
+        times = import_times("hand_parser")
+        for module in MAIN_PROCESS_MODULES:
+            self.assertNotIn(module, times, f"hand_parser imports {module}")
+
+    def test_import_time_budget(self):
+        # Warm up the bytecode cache so only the import itself is measured
+        import_times("hand_parser")
+        times = import_times("hand_parser")
+
+        self.assertLess(times["hand_parser"], IMPORT_TIME_BUDGET_US)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import kst
+from utils import convert_korean_datetime_with_timezone, format_korean_date, extract_datetime_from_filename
+
+
+def reference_format(dt_obj):
+    import pytz
+    return pytz.timezone("Asia/Seoul").localize(dt_obj).strftime("%Y/%m/%d %H:%M:%S %Z")
+
+
+class TestKst(unittest.TestCase):
+
+    def test_format_korean_timestamp(self):
+        self.assertEqual(convert_korean_datetime_with_timezone("2024-11-10 오후 3:32:02"), "2024/11/10 15:32:02 KST")
+        self.assertEqual(convert_korean_datetime_with_timezone("2024-09-09 오후 10:32:44"), "2024/09/09 22:32:44 KST")
+        self.assertEqual(convert_korean_datetime_with_timezone("2024-07-05 오전 9:02:38"), "2024/07/05 09:02:38 KST")
+
+    def test_twelve_oclock(self):
+        self.assertEqual(kst.parse_korean_timestamp("2025-02-08 오전 12:00:05"), datetime(2025, 2, 8, 0, 0, 5))
+        self.assertEqual(kst.parse_korean_timestamp("2025-02-08 오후 12:00:05"), datetime(2025, 2, 8, 12, 0, 5))
+
+    def test_matches_pytz(self):
+        moment = datetime(2024, 12, 31, 0, 0, 1)
+        for _ in range(200):
+            moment += timedelta(minutes=7, seconds=13)
+            meridiem = "오전" if moment.hour < 12 else "오후"
+            text = f"{moment:%Y-%m-%d} {meridiem} {(moment.hour - 1) % 12 + 1}:{moment:%M:%S}"
+
+            self.assertEqual(kst.parse_korean_timestamp(text), moment)
+            self.assertEqual(convert_korean_datetime_with_timezone(text), reference_format(moment))
+            self.assertEqual(format_korean_date(moment), reference_format(moment))
+
+    def test_historical_dates_use_pytz(self):
+        # Korea observed daylight saving time in 1987 and 1988
+        summer = datetime(1988, 7, 1, 12, 0, 0)
+        self.assertEqual(format_korean_date(summer), reference_format(summer))
+        self.assertEqual(format_korean_date(summer)[-3:], "KDT")
+
+    def test_invalid_timestamps(self):
+        for text in ("2024-11-10 PM 3:32:02", "2024-11-10 오후 13:32:02", "2024-11-10 오후 0:32:02",
+                     "2024-02-30 오후 3:32:02", "24-11-10 오후 3:32:02", "2024-11-10 오후 3:32", ""):
+            with self.assertRaises(ValueError, msg=text):
+                convert_korean_datetime_with_timezone(text)
+
+        with self.assertRaises(ValueError):
+            format_korean_date(datetime(2025, 2, 8, tzinfo=timezone.utc))
+
+    def test_filename_stamp(self):
+        self.assertEqual(extract_datetime_from_filename(Path("parseerror2_2025-02-08T20-57-51.html")),
+                         datetime(2025, 2, 8, 20, 57, 51))
+        self.assertIsNone(extract_datetime_from_filename(Path("bighand.html")))
+        self.assertIsNone(extract_datetime_from_filename(Path("hand_2025-02-30T20-57-51.html")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from manifest import ConversionManifest, describe_file
+
+
+class TestConversionManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_folder = Path(self.temp_dir.name) / "data"
+        self.output_folder = Path(self.temp_dir.name) / "data_converted"
+        self.data_folder.mkdir()
+        self.file = self.data_folder / "hand.html"
+        self.file.write_bytes(b"<html>hand</html>")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def record(self, manifest):
+        content = self.file.read_bytes()
+        manifest.record(describe_file(self.file, self.data_folder, content, self.file.stat()))
+
+    def test_new_file_is_not_current(self):
+        with ConversionManifest(self.output_folder) as manifest:
+            self.assertFalse(manifest.is_current(self.file, self.data_folder))
+
+    def test_recorded_file_is_current_after_reload(self):
+        with ConversionManifest(self.output_folder) as manifest:
+            self.record(manifest)
+
+        with ConversionManifest(self.output_folder) as manifest:
+            self.assertTrue(manifest.is_current(self.file, self.data_folder))
+
+    def test_changed_content_is_not_current(self):
+        with ConversionManifest(self.output_folder) as manifest:
+            self.record(manifest)
+
+        self.file.write_bytes(b"<html>another hand</html>")
+
+        with ConversionManifest(self.output_folder) as manifest:
+            self.assertFalse(manifest.is_current(self.file, self.data_folder))
+
+    def test_touched_file_with_same_content_is_current(self):
+        with ConversionManifest(self.output_folder) as manifest:
+            self.record(manifest)
+
+        stat = self.file.stat()
+        os.utime(self.file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000_000))
+
+        with ConversionManifest(self.output_folder) as manifest:
+            self.assertTrue(manifest.is_current(self.file, self.data_folder))
+
+    def test_version_bump_invalidates_entries(self):
+        with ConversionManifest(self.output_folder, version="1") as manifest:
+            self.record(manifest)
+
+        with ConversionManifest(self.output_folder, version="2") as manifest:
+            self.assertFalse(manifest.is_current(self.file, self.data_folder))
+
+    def test_entries_get_the_manifest_version(self):
+        with ConversionManifest(self.output_folder, version="1+gzip") as manifest:
+            self.record(manifest)
+
+        with ConversionManifest(self.output_folder, version="1+gzip") as manifest:
+            self.assertTrue(manifest.is_current(self.file, self.data_folder))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+from pathlib import Path
+
+from cards import format_pokerstars
+from constants import BetType
+from html_parser import extract_hand_histories_from_html
+from individual_history_parser import parse_hand_history
+from models import PlayerAction, ActionEntry, AnteEntry, StartEntry, CommunityCardsEntry, WinMoneyEntry, PokerHand
+
+HAND_HISTORY = """
+* 시작 : [StageNo:86303449] [Credit:200,000원] [SB:1,000원] [BB:1,000원] [MBI:100,000원] [CBIR:200]
+* NICKNAME:[3whj3jk21]
+* 앤티: -1,000원(199,000원)
+* 홀 카드딜: ♣J(49) ♣9(47) [J 탑]
+* 턴 시작: [프리플랍(0)] [족보:J 탑(♣J ♣9)]
+* 베팅: [블라인드:SMALL] [금액:1,000원] [Creadit:198,000원]
+* 베팅: 콜 -7,500원(190,500원) - 베팅순서: [0][8]
+* 커뮤니티 카드 딜: H(♣J♣9) C (♥K◆4◆10)
+* 턴 시작: [플랍(1)] [족보:K 탑(♥K ♣J ◆10 ♣9 ◆4)]
+* 베팅: 체크 -0원(190,500원) - 베팅순서: [1][1]
+* 베팅: 다이 [0](190,500원) - 베팅순서: [1][6]
+* 종료: WinMoney[0원] Credit[190,500원]
+* 결과: 패배 [족보:K 탑] [카드:♥K ♣J ◆10 ♣9 ◆4] - 기권
+"""
+
+
+def make_player():
+    betting_actions, win_money = parse_hand_history(HAND_HISTORY)
+    return PlayerAction(player="3whj3jk21", raw_betting_action=HAND_HISTORY, betting_actions=betting_actions,
+                        amount_won_lost=-9500, final_stack=190500, win_money=win_money)
+
+
+class TestPlayerAction(unittest.TestCase):
+
+    def test_accessors(self):
+        player = make_player()
+
+        self.assertEqual(player.get_start_stack(), 200000)
+        self.assertEqual(player.get_small_blind(), 1000)
+        self.assertEqual(player.get_ante(), 1000)
+        self.assertEqual(player.get_blind().blind_type, "small")
+        self.assertEqual(player.get_blind_investment(), 1000)
+        self.assertIsNone(player.get_entry_fee())
+        self.assertEqual(player.get_hole_cards(), "Jc 9c")
+        self.assertEqual([a.action for a in player.get_preflop_actions()], [BetType.CALL])
+        self.assertEqual([a.action for a in player.get_flop_actions()], [BetType.CHECK, BetType.FOLD])
+        self.assertEqual(player.get_turn_actions(), [])
+        self.assertEqual(player.flop_betting_position, 8)
+        self.assertFalse(player.went_to_showdown())
+
+    def test_index_follows_changes_to_betting_actions(self):
+        player = make_player()
+        self.assertEqual(len(player.get_all_betting_actions()), 3)
+
+        action = ActionEntry(action=BetType.CHECK, betting_round=2)
+        player.betting_actions.append(action)
+        self.assertEqual(player.get_turn_actions(), [action])
+
+        ante = AnteEntry(amount=500)
+        player.betting_actions = [ante]
+        self.assertEqual(player.get_ante(), 500)
+        self.assertEqual(player.get_all_betting_actions(), [])
+
+
+    def test_entries_are_slotted(self):
+        player = make_player()
+        self.assertEqual(player.betting_actions[0], StartEntry(stage_number="86303449", credit=200000, sb=1000,
+                                                               bb=1000, mbi=100000, cbir=200))
+        self.assertEqual(player.win_money, WinMoneyEntry(amount=0, final_stack=190500))
+
+        for entry in player.betting_actions + [player.win_money, player]:
+            self.assertFalse(hasattr(entry, "__dict__"), type(entry).__name__)
+        self.assertFalse(hasattr(PokerHand("1", "", "", "", "0", [player]), "__dict__"))
+
+        # The type stays a class attribute, not a constructor argument
+        self.assertEqual(ActionEntry().type, "ACTION")
+        with self.assertRaises(AttributeError):
+            player.win_money.remaining_stack = 0
+
+    def test_board_cards_are_shared(self):
+        first, second = (make_player().get_entries(CommunityCardsEntry)[0] for _ in range(2))
+        self.assertEqual([format_pokerstars(street) for street in first.community_cards], ["Kh 4d Td"])
+        self.assertIs(first.community_cards[0], second.community_cards[0])
+
+
+class TestSeatMap(unittest.TestCase):
+
+    def setUp(self):
+        file = Path(__file__).parent / "data" / "river-9way-bet-call.html"
+        self.hand = extract_hand_histories_from_html(file.read_text(encoding="utf-8"))
+
+    def test_seats_follow_preflop_order(self):
+        preflop = self.hand.get_ordered_preflop_players()
+
+        self.assertEqual(len(preflop), 9)
+        self.assertEqual([self.hand.get_betting_position(player) for player in preflop], list(range(1, 10)))
+        self.assertIs(preflop[-2], self.hand.get_small_blind_player())
+        self.assertIs(preflop[-1], self.hand.get_big_blind_player())
+        self.assertIs(self.hand.get_dealer(), preflop[-3])
+
+    def test_seat_map_is_computed_once(self):
+        self.assertIs(self.hand.seats, self.hand.seats)
+        self.assertIs(self.hand.get_ordered_flop_players(), self.hand.get_ordered_flop_players())
+
+    def test_seat_map_follows_changes_to_players(self):
+        seats = self.hand.seats
+        self.hand.players = self.hand.players[:]
+
+        self.assertIsNot(self.hand.seats, seats)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,12 @@
+import io
 import unittest
 from datetime import datetime
 from pprint import pprint
 from pathlib import Path
 
-from hand_parser import parse
+from hand_parser import parse, parse_many, write_many
+from html_parser import extract_hand_histories_from_html
+from pokerstars_converter import HAND_SEPARATOR, PokerStarsConverter
 
 class TestPokerstarsConverter(unittest.TestCase):
 
@@ -19,8 +22,89 @@ class TestPokerstarsConverter(unittest.TestCase):
             html_content = file.read()
             return html_content
 
-    def parse(self, content, correct_datetime = None):
-        return parse(content, correct_datetime, currency_symbol="$")
+    def parse(self, content, correct_datetime = None, html_backend = None):
+        return parse(content, correct_datetime, currency_symbol="$", html_backend=html_backend)
+
+    @staticmethod
+    def hand_row(html_content):
+        # The outer row starts just before the round id cell and ends after the nested table
+        start = html_content.rindex("<tr", 0, html_content.index('<td width="56"'))
+        end = html_content.index("</tr>", html_content.index("</table>", start)) + len("</tr>")
+        return start, end
+
+    def multi_hand_page(self):
+        """The smallhand page with the bighand row added after its own row."""
+        first = self.read_test_file("smallhand.html")
+        second = self.read_test_file("bighand.html")
+
+        second_start, second_end = self.hand_row(second)
+        _, first_end = self.hand_row(first)
+        return first[:first_end] + second[second_start:second_end] + first[first_end:]
+
+    def test_multi_hand_page(self):
+        page = self.multi_hand_page()
+
+        for html_backend in ["stream", "bs4"]:
+            with self.subTest(html_backend=html_backend):
+                converted = list(parse_many(page, datetime(2024, 11, 30, 13, 34, 46), "$", html_backend))
+
+                self.assertEqual(converted, [self.read_expected_file("smallhand.txt"), self.read_expected_file("bighand.txt")])
+
+    def test_parse_many_single_hand(self):
+        expected = self.read_expected_file("river-9way-bet-call.txt")
+        content = self.read_test_file("river-9way-bet-call.html")
+
+        converted = list(parse_many(content, datetime(2024, 11,30, 13, 34, 46), "$"))
+
+        self.assertEqual(HAND_SEPARATOR.join(converted), expected)
+
+    def test_write_many(self):
+        page = self.multi_hand_page()
+        expected = self.read_expected_file("smallhand.txt") + HAND_SEPARATOR + self.read_expected_file("bighand.txt")
+
+        text = io.StringIO()
+        self.assertEqual(write_many(page, text, currency_symbol="$"), 2)
+        self.assertEqual(text.getvalue(), expected)
+
+        binary = io.BytesIO()
+        self.assertEqual(write_many(page, binary, currency_symbol="$"), 2)
+        self.assertFalse(binary.closed)
+        self.assertEqual(binary.getvalue(), expected.encode("utf-8"))
+
+        self.assertEqual(write_many("<html></html>", io.StringIO()), 0)
+
+    def test_write_pokerstars(self):
+        expected = self.read_expected_file("river-9way-bet-call.txt")
+        hand = extract_hand_histories_from_html(self.read_test_file("river-9way-bet-call.html"))
+        converter = PokerStarsConverter("$")
+
+        binary = io.BytesIO()
+        self.assertTrue(converter.write_pokerstars(hand, binary, datetime(2024, 11, 30, 13, 34, 46)))
+        self.assertEqual(binary.getvalue().decode("utf-8"), expected)
+        self.assertFalse(converter.write_pokerstars(None, binary))
+
+    def test_hands_are_written_line_by_line(self):
+        expected = self.read_expected_file("river-9way-bet-call.txt")
+        hand = extract_hand_histories_from_html(self.read_test_file("river-9way-bet-call.html"))
+        writes = []
+
+        class RecordingStream(io.StringIO):
+            def write(self, text):
+                writes.append(text)
+                return super().write(text)
+
+        PokerStarsConverter("$").write_pokerstars(hand, RecordingStream(), datetime(2024, 11, 30, 13, 34, 46))
+        # No write holds more than a line, the hand is never built as one string
+        self.assertEqual("".join(writes), expected)
+        self.assertEqual(max(len(text) for text in writes), max(len(line) for line in expected.split("\n")))
+
+    def test_bs4_backend(self):
+        for name in ["smallhand", "bighand", "all_in", "multiple_entryfees", "pot_size_error_3"]:
+            with self.subTest(name=name):
+                expected = self.read_expected_file(f"{name}.txt")
+                content = self.read_test_file(f"{name}.html")
+
+                self.assertEqual(self.parse(content, html_backend="bs4"), expected)
 
     def test_smallhand(self):
         expected = self.read_expected_file("smallhand.txt")
@@ -0,0 +1,99 @@
+import contextlib
+import io
+import pstats
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import main
+from main import ConversionOptions, process_batch
+from profiling import COMBINED, PROFILES_PER_THREAD, REPORT, ProfileCollector, WorkerProfile
+
+DATA = Path(__file__).parent / "data"
+
+
+def function_names(stats: pstats.Stats):
+    return {function for _, _, function in stats.stats}
+
+
+class TestProfiling(unittest.TestCase):
+
+    def test_process_batch_returns_its_profile(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result = process_batch([DATA / "smallhand.html"], DATA, Path(temp_dir), ConversionOptions(profile=True))
+
+        self.assertEqual(result.converted, 1)
+        self.assertTrue(result.profile.worker.startswith("pid"))
+        self.assertIn("convert_file", {function for _, _, function in result.profile.stats})
+
+    def test_process_batch_without_profile(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result = process_batch([DATA / "smallhand.html"], DATA, Path(temp_dir))
+        self.assertIsNone(result.profile)
+
+    def test_collector_merges_per_worker_and_overall(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output = Path(temp_dir)
+            options = ConversionOptions(profile=True)
+            collector = ProfileCollector()
+            for worker, file in [("pid1", "smallhand.html"), ("pid2", "flop-9way.html"), ("pid1", "smallhand.html")]:
+                profile = process_batch([DATA / file], DATA, output, options).profile
+                collector.add(WorkerProfile(worker, profile.stats))
+
+            report = collector.write(output / "profile", top=5)
+            self.assertEqual(sorted(path.name for path in (output / "profile").iterdir()),
+                             ["combined.pstats", "pid1.pstats", "pid2.pstats", "report.txt"])
+
+            combined = pstats.Stats(str(output / "profile" / COMBINED))
+            worker = pstats.Stats(str(output / "profile" / "pid1.pstats"))
+            calls = {function: stats[0] for (_, _, function), stats in combined.stats.items()}
+            self.assertEqual(calls["convert_file"], 3)
+            self.assertEqual({function: stats[0] for (_, _, function), stats in worker.stats.items()}["convert_file"], 2)
+
+        self.assertTrue(report.startswith("3 batches profiled in 2 workers"))
+        self.assertIn("Top 5 functions by tottime", report)
+        self.assertIn("Top 5 functions by cumulative", report)
+
+    def test_main_profiles_the_process_workers(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            data_folder = Path(temp_dir) / "data"
+            shutil.copytree(DATA, data_folder)
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                main.main([str(data_folder), "--executor", "process", "--workers", "2", "--profile"])
+
+            profile_folder = Path(temp_dir) / "data_converted" / "profile"
+            combined = pstats.Stats(str(profile_folder / COMBINED))
+            self.assertIn("iter_pokerstars_lines", function_names(combined))
+            self.assertTrue((profile_folder / REPORT).exists())
+            self.assertIn(f"Profiles written to {profile_folder}", output.getvalue())
+
+    @unittest.skipUnless(PROFILES_PER_THREAD, "only one profiler can run at a time")
+    def test_main_profiles_the_thread_workers(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            data_folder = Path(temp_dir) / "data"
+            shutil.copytree(DATA, data_folder)
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                main.main([str(data_folder), "--executor", "thread", "--workers", "2", "--batch-size", "1",
+                           "--profile"])
+
+            self.assertNotIn("Error", output.getvalue())
+            profile_folder = Path(temp_dir) / "data_converted" / "profile"
+            workers = [path.name for path in profile_folder.glob("pid*.pstats")]
+            self.assertTrue(workers)
+            self.assertTrue(all("-" in worker for worker in workers))
+            self.assertIn("iter_pokerstars_lines", function_names(pstats.Stats(str(profile_folder / COMBINED))))
+
+    def test_thread_executor_is_refused_without_profiles_per_thread(self):
+        with mock.patch("main.PROFILES_PER_THREAD", False), contextlib.redirect_stderr(io.StringIO()) as error, \
+                self.assertRaises(SystemExit):
+            main.parse_args(["data", "--executor", "thread", "--profile"])
+        self.assertIn("--profile can't be used with the thread executor", error.getvalue())
+
+        with mock.patch("main.PROFILES_PER_THREAD", False):
+            self.assertTrue(main.parse_args(["data", "--executor", "process", "--profile"]).profile)
+
+
+if __name__ == "__main__":
+    unittest.main()
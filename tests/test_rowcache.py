@@ -0,0 +1,205 @@
+import contextlib
+import hashlib
+import io
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import main
+import rowcache
+from html_parser import BACKENDS, DEFAULT_BACKEND, get_backend
+from rowcache import RowStore, decode_rows, encode_rows
+
+DATA = Path(__file__).parent / "data"
+
+
+def page_rows(name):
+    return list(get_backend().iter_rows((DATA / name).read_text(encoding="utf-8")))
+
+
+def digest(text):
+    return hashlib.sha256(text.encode()).digest()
+
+
+class TestRowCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / rowcache.rows_name(DEFAULT_BACKEND)
+        self.rows = page_rows("flop-9way.html")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_rows_round_trip(self):
+        self.assertEqual(decode_rows(encode_rows(self.rows)), self.rows)
+        self.assertEqual(decode_rows(encode_rows([])), [])
+
+    def test_records_are_found_after_reopening(self):
+        with RowStore(self.path, append=True) as store:
+            store.put(digest("a"), encode_rows(self.rows))
+            store.put(digest("b"), encode_rows([]))
+            # A file seen twice is only stored once
+            store.put(digest("a"), encode_rows([]))
+
+        with RowStore(self.path) as store:
+            self.assertEqual(store.get(digest("a")), self.rows)
+            self.assertEqual(store.get(digest("b")), [])
+            self.assertIsNone(store.get(digest("c")))
+
+    def test_reader_sees_flushed_records(self):
+        with RowStore(self.path, append=True) as writer, RowStore(self.path) as store:
+            writer.put(digest("a"), encode_rows(self.rows))
+            writer.flush()
+            store.refresh()
+            self.assertEqual(store.get(digest("a")), self.rows)
+
+            writer.put(digest("b"), encode_rows([]))
+            self.assertIsNone(store.get(digest("b")))
+            writer.flush()
+            store.refresh()
+            self.assertEqual(store.get(digest("b")), [])
+
+    def test_record_cut_short_is_ignored_then_replaced(self):
+        with RowStore(self.path, append=True) as store:
+            store.put(digest("a"), encode_rows(self.rows))
+            store.put(digest("b"), encode_rows(self.rows))
+        with open(self.path, "r+b") as file:
+            file.truncate(self.path.stat().st_size - 10)
+
+        with RowStore(self.path, append=True) as store:
+            self.assertEqual(store.get(digest("a")), self.rows)
+            self.assertIsNone(store.get(digest("b")))
+            store.put(digest("c"), encode_rows([]))
+
+        with RowStore(self.path) as store:
+            self.assertEqual(store.get(digest("a")), self.rows)
+            self.assertEqual(store.get(digest("c")), [])
+
+    def test_other_files_are_written_again(self):
+        self.path.write_bytes(b"not a cache")
+        with RowStore(self.path, append=True) as store:
+            self.assertIsNone(store.get(digest("a")))
+            store.put(digest("a"), encode_rows(self.rows))
+        with RowStore(self.path) as store:
+            self.assertEqual(store.get(digest("a")), self.rows)
+
+    def test_replaced_file_is_read_from_scratch(self):
+        with RowStore(self.path, append=True) as store:
+            store.put(digest("a"), encode_rows(self.rows))
+        self.assertEqual(rowcache.reader(str(self.path)).get(digest("a")), self.rows)
+
+        with RowStore(self.path, append=True, replace=True) as store:
+            self.assertIsNone(store.get(digest("a")))
+            store.put(digest("b"), encode_rows(self.rows))
+        reader = rowcache.reader(str(self.path))
+        self.assertIsNone(reader.get(digest("a")))
+        self.assertEqual(reader.get(digest("b")), self.rows)
+
+    def test_replacement_interrupted_keeps_the_old_file(self):
+        with RowStore(self.path, append=True) as store:
+            store.put(digest("a"), encode_rows(self.rows))
+        with self.assertRaises(KeyboardInterrupt), RowStore(self.path, append=True, replace=True) as store:
+            store.put(digest("b"), encode_rows(self.rows))
+            raise KeyboardInterrupt
+
+        self.assertEqual([path.name for path in self.path.parent.iterdir()], [self.path.name])
+        with RowStore(self.path) as store:
+            self.assertEqual(store.get(digest("a")), self.rows)
+            self.assertIsNone(store.get(digest("b")))
+
+    def test_backends_have_their_own_file(self):
+        names = {rowcache.rows_name(backend) for backend in BACKENDS}
+        self.assertEqual(len(names), len(BACKENDS))
+
+        data_folder = Path(self.temp_dir.name) / "data"
+        shutil.copytree(DATA, data_folder)
+        with contextlib.redirect_stdout(io.StringIO()):
+            main.main([str(data_folder), "--executor", "serial", "--html-parser", "bs4"])
+        output_folder = Path(self.temp_dir.name) / "data_converted"
+        self.assertEqual(sorted(path.name for path in output_folder.glob(".raw_rows_*")), [rowcache.rows_name("bs4")])
+
+    def test_rerun_skips_the_html_and_converts_the_same(self):
+        data_folder = Path(self.temp_dir.name) / "data"
+        shutil.copytree(DATA, data_folder)
+        output_folder = Path(self.temp_dir.name) / "data_converted"
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            main.main([str(data_folder), "--executor", "serial"])
+        first = {path.name: path.read_bytes() for path in output_folder.glob("*.txt")}
+
+        # A new converter version converts every file again, from the cached rows
+        with mock.patch("constants.CONVERTER_VERSION", "next"), \
+                mock.patch("main.get_backend", side_effect=AssertionError("the HTML was parsed")), \
+                contextlib.redirect_stdout(io.StringIO()) as output:
+            main.main([str(data_folder), "--executor", "serial"])
+        self.assertNotIn("Error", output.getvalue())
+        self.assertEqual({path.name: path.read_bytes() for path in output_folder.glob("*.txt")}, first)
+
+    def test_force_extracts_again_and_replaces_the_cache(self):
+        data_folder = Path(self.temp_dir.name) / "data"
+        data_folder.mkdir()
+        for name in ["smallhand.html", "flop-9way.html"]:
+            shutil.copy(DATA / name, data_folder / name)
+        with contextlib.redirect_stdout(io.StringIO()):
+            main.main([str(data_folder), "--executor", "serial"])
+        (data_folder / "flop-9way.html").unlink()
+
+        with mock.patch("main.get_backend", wraps=get_backend) as backend, contextlib.redirect_stdout(io.StringIO()):
+            main.main([str(data_folder), "--executor", "serial", "--force"])
+        self.assertEqual(backend.call_count, 1)
+
+        with RowStore(Path(self.temp_dir.name) / "data_converted" / rowcache.rows_name(DEFAULT_BACKEND)) as store:
+            self.assertEqual(store.get(hashlib.sha256((DATA / "smallhand.html").read_bytes()).digest()),
+                             page_rows("smallhand.html"))
+            self.assertEqual(len(store.index), 1)
+
+    def test_interrupted_force_run_keeps_the_old_cache(self):
+        data_folder = Path(self.temp_dir.name) / "data"
+        shutil.copytree(DATA, data_folder)
+        with contextlib.redirect_stdout(io.StringIO()):
+            main.main([str(data_folder), "--executor", "serial"])
+        path = Path(self.temp_dir.name) / "data_converted" / rowcache.rows_name(DEFAULT_BACKEND)
+        cache = path.read_bytes()
+
+        batches = 0
+        process_batch = main.process_batch
+
+        def interrupted(*args):
+            nonlocal batches
+            batches += 1
+            if batches == 3:
+                raise KeyboardInterrupt
+            return process_batch(*args)
+
+        with mock.patch("main.process_batch", side_effect=interrupted), contextlib.redirect_stdout(io.StringIO()):
+            main.main([str(data_folder), "--executor", "serial", "--batch-size", "1", "--force"])
+        self.assertGreaterEqual(batches, 3)
+        self.assertEqual(path.read_bytes(), cache)
+        self.assertEqual(sorted(path.name for path in path.parent.glob(".raw_rows_*")), [path.name])
+
+    def test_rows_of_failed_files_are_not_cached(self):
+        data_folder = Path(self.temp_dir.name) / "data"
+        data_folder.mkdir()
+        shutil.copy(DATA / "smallhand.html", data_folder / "smallhand.html")
+        with mock.patch("main.row_hands", side_effect=ValueError("broken")), \
+                contextlib.redirect_stdout(io.StringIO()) as output:
+            main.main([str(data_folder), "--executor", "serial"])
+        self.assertIn("broken", output.getvalue())
+
+        path = Path(self.temp_dir.name) / "data_converted" / rowcache.rows_name(DEFAULT_BACKEND)
+        with RowStore(path) as store:
+            self.assertEqual(store.index, {})
+
+    def test_no_raw_cache(self):
+        data_folder = Path(self.temp_dir.name) / "data"
+        shutil.copytree(DATA, data_folder)
+        with contextlib.redirect_stdout(io.StringIO()):
+            main.main([str(data_folder), "--executor", "serial", "--no-raw-cache"])
+        self.assertEqual(list((Path(self.temp_dir.name) / "data_converted").glob(".raw_rows_*")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from scheduler import AdaptiveBatcher, batched, bounded_map
+
+
+class TestBoundedMap(unittest.TestCase):
+
+    def test_returns_every_result(self):
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            results = list(bounded_map(executor, lambda x, y: x * y, range(20), 4, 2))
+
+        self.assertEqual(sorted(results), [x * 2 for x in range(20)])
+
+    def test_limits_tasks_in_flight(self):
+        lock = threading.Lock()
+        running = 0
+        peak = 0
+
+        def task(_):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.01)
+            with lock:
+                running -= 1
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(bounded_map(executor, task, range(30), 3))
+
+        self.assertLessEqual(peak, 3)
+
+    def test_pulls_items_lazily(self):
+        pulled = []
+
+        def items():
+            for i in range(10):
+                pulled.append(i)
+                yield i
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = bounded_map(executor, lambda x: x, items(), 2)
+            next(results)
+            self.assertLess(len(pulled), 10)
+            list(results)
+
+    def test_slow_task_does_not_block_refill(self):
+        started = []
+
+        def task(x):
+            started.append(x)
+            if x == 0:
+                time.sleep(0.3)
+            return x
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = bounded_map(executor, task, range(10), 2)
+            first_nine = [next(results) for _ in range(9)]
+
+        self.assertNotIn(0, first_nine)
+
+
+class TestBatching(unittest.TestCase):
+
+    def test_batched(self):
+        self.assertEqual(list(batched(range(7), 3)), [[0, 1, 2], [3, 4, 5], [6]])
+
+    def test_adaptive_batcher_grows_for_fast_items(self):
+        batcher = AdaptiveBatcher(target_seconds=1.0, initial_size=4, max_size=100)
+        batcher.observe(4, 0.04)
+
+        self.assertEqual(batcher.size, 100)
+
+    def test_adaptive_batcher_shrinks_for_slow_items(self):
+        batcher = AdaptiveBatcher(target_seconds=1.0, initial_size=50)
+        batcher.observe(10, 5.0)
+
+        self.assertEqual(batcher.size, 2)
+
+    def test_adaptive_batcher_yields_every_item(self):
+        batcher = AdaptiveBatcher(initial_size=3)
+        batches = []
+        for batch in batcher.batches(range(10)):
+            batches.append(batch)
+            batcher.observe(len(batch), 10.0)
+
+        self.assertEqual([i for batch in batches for i in batch], list(range(10)))
+        self.assertEqual(len(batches[0]), 3)
+        self.assertEqual(len(batches[1]), 1)
+
+if __name__ == '__main__':
+    unittest.main()
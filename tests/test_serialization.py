@@ -0,0 +1,89 @@
+import contextlib
+import gzip
+import io
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import serialization
+from hand_parser import page_hands
+from pokerstars_converter import HAND_SEPARATOR, PokerStarsConverter
+from utils import extract_datetime_from_filename
+
+DATA = Path(__file__).parent / "data"
+
+
+def parsed_hands():
+    for file in sorted(DATA.glob("*.html")):
+        hands, correct_datetime = page_hands(file.read_text(encoding="utf-8"), extract_datetime_from_filename(file))
+        for hand in hands:
+            yield hand, correct_datetime
+
+
+class TestSerialization(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.folder = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_hands_round_trip(self):
+        hands = list(parsed_hands())
+        stream = io.BytesIO()
+        self.assertEqual(serialization.dump_hands(hands, stream, keep_raw=True), len(hands))
+
+        stream.seek(0)
+        loaded = list(serialization.load_hands(stream))
+        self.assertEqual(loaded, hands)
+        first_hand = loaded[0][0]
+        self.assertIsInstance(first_hand.players[0].betting_actions[3].hole_cards, tuple)
+
+    def test_raw_betting_actions_are_dropped_by_default(self):
+        hands = list(parsed_hands())[:2]
+        stream = io.BytesIO()
+        serialization.dump_hands(hands, stream)
+        stream.seek(0)
+
+        for (hand, _), (loaded, _) in zip(hands, serialization.load_hands(stream)):
+            self.assertEqual([player.raw_betting_action for player in loaded.players], [""] * len(hand.players))
+            self.assertEqual([player.betting_actions for player in loaded.players],
+                             [player.betting_actions for player in hand.players])
+
+    def test_loaded_hands_convert_the_same(self):
+        converter = PokerStarsConverter("$")
+        path = self.folder / "hands.jsonl.gz"
+        serialization.save(path, parsed_hands())
+        self.assertTrue(gzip.decompress(path.read_bytes()).startswith(b'{"format": "pokerhands", "version": 1}\n'))
+
+        for (hand, correct_datetime), (loaded, loaded_datetime) in zip(parsed_hands(), serialization.load(path)):
+            self.assertEqual(loaded_datetime, correct_datetime)
+            self.assertEqual(converter.convert_to_pokerstars_format(loaded, loaded_datetime),
+                             converter.convert_to_pokerstars_format(hand, correct_datetime))
+
+    def test_other_files_are_refused(self):
+        with self.assertRaises(ValueError):
+            list(serialization.load_hands(io.BytesIO(b"<html></html>\n")))
+        with self.assertRaisesRegex(ValueError, "Unsupported version 2"):
+            list(serialization.load_hands(io.BytesIO(b'{"format": "pokerhands", "version": 2}\n')))
+
+    def test_build_and_convert(self):
+        data_folder = self.folder / "data"
+        shutil.copytree(DATA, data_folder)
+        hands_path = self.folder / "hands.jsonl"
+        text_path = self.folder / "hands.txt"
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            serialization.main(["build", str(data_folder), str(hands_path)])
+            serialization.main(["convert", str(hands_path), str(text_path)])
+
+        converter = PokerStarsConverter("$")
+        expected = HAND_SEPARATOR.join(converter.convert_to_pokerstars_format(hand, correct_datetime)
+                                       for hand, correct_datetime in parsed_hands())
+        self.assertEqual(text_path.read_text(encoding="utf-8"), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import gzip
+import lzma
+import tempfile
+import unittest
+from pathlib import Path
+
+import bundles
+import main
+import sinks
+from bundles import BundledHand, BundleWriter
+from pokerstars_converter import HAND_SEPARATOR
+
+EXPECTED = Path(__file__).parent / "expected"
+DECOMPRESS = {sinks.GZIP: gzip.decompress, sinks.XZ: lzma.decompress}
+
+
+class TestSinks(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.folder = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_compression_from_name_or_extension(self):
+        self.assertEqual(sinks.compression_for_path(Path("hands.txt.gz")), sinks.GZIP)
+        self.assertEqual(sinks.compression_for_path(Path("hands.txt.ZST")), sinks.ZSTD)
+        self.assertEqual(sinks.compression_for_path(Path("hands.txt")), sinks.NONE)
+
+        for value, compression in [("gzip", sinks.GZIP), ("gz", sinks.GZIP), (".xz", sinks.XZ),
+                                   ("txt.zst", sinks.ZSTD), ("none", sinks.NONE), ("txt", sinks.NONE)]:
+            self.assertEqual(sinks.parse_compression(value), compression, value)
+        with self.assertRaises(ValueError):
+            sinks.parse_compression("bz2")
+
+    def test_appended_streams_read_back_as_one(self):
+        for compression, decompress in DECOMPRESS.items():
+            with self.subTest(compression=compression):
+                path = self.folder / f"hands.txt{sinks.EXTENSIONS[compression]}"
+                with sinks.open_sink(path) as sink:
+                    sink.write(b"first")
+                with sinks.open_sink(path, append=True) as sink:
+                    sink.write(b" second")
+
+                self.assertEqual(decompress(path.read_bytes()), b"first second")
+
+    def test_sources_read_back_the_sinks(self):
+        for compression in [sinks.NONE, *DECOMPRESS]:
+            with self.subTest(compression=compression):
+                path = self.folder / f"hands.jsonl{sinks.EXTENSIONS[compression]}"
+                with sinks.open_sink(path) as sink:
+                    sink.write(b"first\n")
+                with sinks.open_sink(path, append=True) as sink:
+                    sink.write(b"second\n")
+
+                with sinks.open_source(path) as source:
+                    self.assertEqual(list(source), [b"first\n", b"second\n"])
+
+    @unittest.skipUnless(sinks.ZSTD in sinks.available_compressions(), "zstandard is not installed")
+    def test_zstd(self):
+        import zstandard
+        path = self.folder / "hands.txt.zst"
+        with sinks.open_sink(path) as sink:
+            sink.write(b"hand")
+        self.assertEqual(zstandard.ZstdDecompressor().stream_reader(path.read_bytes()).read(), b"hand")
+
+    def test_compressed_bundles(self):
+        with BundleWriter(self.folder, bundles.DAY, compression=sinks.GZIP) as writer:
+            writer.write(BundledHand(key="2024-11-10", data=b"first"))
+            writer._close_handle("2024-11-10")  # As if the bundle was closed to make room for others
+            writer.write(BundledHand(key="2024-11-10", data=b"second"))
+
+        path = self.folder / "day" / "2024-11-10_0001.txt.gz"
+        self.assertEqual(gzip.decompress(path.read_bytes()).decode("utf-8"), "first" + HAND_SEPARATOR + "second")
+
+        with BundleWriter(self.folder, bundles.DAY, compression=sinks.GZIP) as writer:
+            writer.write(BundledHand(key="2024-11-10", data=b"next run"))
+        self.assertTrue((self.folder / "day" / "2024-11-10_0002.txt.gz").exists())
+
+    def test_convert_to_compressed_files(self):
+        data_folder = self.folder / "data"
+        data_folder.mkdir()
+        (data_folder / "smallhand.html").write_bytes((Path(__file__).parent / "data" / "smallhand.html").read_bytes())
+
+        main.main([str(data_folder), "--executor", "serial", "--compress", "txt.xz"])
+
+        output = self.folder / "data_converted" / "smallhand.txt.xz"
+        self.assertEqual(lzma.decompress(output.read_bytes()), (EXPECTED / "smallhand.txt").read_bytes())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import re
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+import hand_parser
+import synthetic
+from cards import from_korean
+from html_parser import extract_hand_histories_from_html
+from utils import find_files
+
+
+def korean_cards(text):
+    return [from_korean(card) for card in text.split()]
+
+
+class TestSynthetic(unittest.TestCase):
+
+    def test_hands_are_deterministic(self):
+        self.assertEqual(synthetic.generate_hand(7, seed=3).row, synthetic.generate_hand(7, seed=3).row)
+        self.assertNotEqual(synthetic.generate_hand(7, seed=3).row, synthetic.generate_hand(7, seed=4).row)
+        self.assertNotEqual(synthetic.generate_hand(7, seed=3).row, synthetic.generate_hand(8, seed=3).row)
+
+    def test_hands_convert_and_keep_the_chips(self):
+        for index in range(200):
+            hand = synthetic.generate_hand(index, seed=1)
+            with self.subTest(index=index):
+                html = synthetic.render_page([hand])
+                poker_hand = extract_hand_histories_from_html(html)
+                self.assertEqual(len(poker_hand.players), hand.players)
+
+                converted = hand_parser.parse(html)
+                rake = int(re.search(r"\| Rake (\d+)", converted).group(1))
+                # The chips lost by some players are won by the others, less the rake
+                self.assertEqual(-sum(player.amount_won_lost for player in poker_hand.players), rake)
+
+    def test_features_are_covered(self):
+        features = set()
+        players = set()
+        for index in range(300):
+            hand = synthetic.generate_hand(index)
+            features |= hand.features
+            players.add(hand.players)
+        self.assertEqual(features, {synthetic.ALL_IN, synthetic.SIDE_POT, synthetic.ENTRY_FEE, synthetic.UNCALLED_BET,
+                                    synthetic.TIMEOUT, synthetic.LEFT_ROOM, synthetic.SHOWDOWN})
+        self.assertEqual(players, set(range(2, 10)))
+
+    def test_hand_names(self):
+        cases = {
+            "♠A ♠K ♠Q ♠J ♠10 ◆2 ♣3": "로열 스트레이트 플러시",
+            "♠A ◆2 ♣3 ♥4 ♠5 ◆9 ♣J": "5 스트레이트",
+            "♠7 ◆7 ♣4 ♥4 ♠K ◆2": "7 4 투 페어",
+            "♠9 ◆9 ♣9 ♥9 ♠K": "9 포카드",
+            "♠A ◆A ♣A ♥K ♠K ◆K": "A 풀 하우스",
+            "♥2 ♥7 ♥9 ♥J ♥A ♠A": "A 플러시",
+            "♠A ◆J": "A 탑",
+        }
+        for text, name in cases.items():
+            with self.subTest(cards=text):
+                self.assertEqual(synthetic.evaluate(korean_cards(text))[2], name)
+
+    def test_site_timestamp(self):
+        self.assertEqual(synthetic.site_timestamp(datetime(2024, 9, 3, 8, 35, 31)), "2024-09-03 오전 8:35:31")
+        self.assertEqual(synthetic.site_timestamp(datetime(2024, 9, 3, 0, 5, 1)), "2024-09-03 오전 12:05:01")
+        self.assertEqual(synthetic.site_timestamp(datetime(2024, 9, 3, 13, 0, 0)), "2024-09-03 오후 1:00:00")
+
+    def test_multi_hand_pages(self):
+        pages = list(synthetic.iter_pages(7, seed=2, hands_per_page=3))
+        self.assertEqual([len(hands) for hands, _ in pages], [3, 3, 1])
+        hands, html = pages[0]
+        self.assertEqual(len(list(hand_parser.parse_many(html))), 3)
+
+    def test_write_corpus(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            folder = Path(temp_dir)
+            counts = synthetic.write_corpus(folder, 25, seed=5, files_per_folder=10)
+            self.assertEqual((counts["pages"], counts["hands"]), (25, 25))
+
+            files = list(find_files(folder, "*.html"))
+            self.assertEqual(len(files), 25)
+            self.assertEqual(sorted({file.path.parent.name for file in files}), ["00000", "00001", "00002"])
+            # Slices generated separately give the same pages as one run
+            first = synthetic.generate_hand(20, seed=5)
+            self.assertTrue((folder / "00002" / synthetic.page_name([first])).exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import timings
+from main import ConversionOptions, process_batch
+from timings import Histogram, PipelineTimings, StageTimer, measuring, stage
+
+DATA = Path(__file__).parent / "data"
+
+
+class TestTimings(unittest.TestCase):
+
+    def test_nested_stages_are_exclusive(self):
+        timer = StageTimer()
+        with measuring(timer):
+            with stage("outer"):
+                time.sleep(0.01)
+                with stage("inner"):
+                    time.sleep(0.02)
+                with stage("inner"):
+                    pass
+
+        self.assertEqual(timer.calls, {"outer": 1, "inner": 2, timings.OTHER: 1})
+        self.assertGreaterEqual(timer.seconds["inner"], 0.02)
+        self.assertLess(timer.seconds["outer"], 0.02)
+        self.assertAlmostEqual(timer.total, sum(timer.seconds.values()))
+
+    def test_stage_without_timer_does_nothing(self):
+        timer = StageTimer()
+        with stage("read"):
+            pass
+        with measuring(None):
+            with stage("read"):
+                pass
+        self.assertEqual(timer.seconds, {})
+
+    def test_histogram_percentiles(self):
+        histogram = Histogram()
+        for milliseconds in range(1, 101):
+            histogram.add(milliseconds / 1000)
+
+        other = Histogram()
+        other.add(10.0)
+        histogram.merge(other)
+
+        self.assertEqual(histogram.count, 101)
+        # Within a bucket (9%) above the measured durations
+        for q, expected in [(50, 0.051), (95, 0.096), (100, 10.0)]:
+            self.assertGreaterEqual(histogram.percentile(q), expected)
+            self.assertLessEqual(histogram.percentile(q), expected * 1.091)
+        self.assertIsNone(Histogram().percentile(50))
+
+    def test_merge_and_summary(self):
+        total = PipelineTimings()
+        for _ in range(3):
+            timer = StageTimer()
+            with measuring(timer), stage(timings.READ):
+                pass
+            batch = PipelineTimings()
+            batch.add_file(timer)
+            total.merge(batch)
+        total.add(timings.WRITE, 0.5, calls=10)
+
+        self.assertEqual(total.files, 3)
+        self.assertEqual(total.stages[timings.READ].calls, 3)
+        self.assertEqual(total.stages[timings.WRITE].calls, 10)
+
+        summary = total.summary(wall_seconds=2.0).splitlines()
+        self.assertEqual([line.split()[0] for line in summary[1:-1]], ["read", "write", "other", "per"])
+        self.assertEqual(summary[-1], "3 files in 2.00s, 1.5 files/sec")
+
+    def test_process_batch_reports_every_stage(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            files = [DATA / "smallhand.html", DATA / "flop-9way.html"]
+            result = process_batch(files, DATA, Path(temp_dir), ConversionOptions(timings=True))
+
+        self.assertEqual(result.converted, 2)
+        self.assertEqual(result.timings.files, 2)
+        self.assertEqual(set(result.timings.stages), set(timings.STAGES))
+        self.assertEqual(result.timings.stages[timings.HAND_HISTORY].calls,
+                         sum(len(hand.players) for hand in _hands(files)))
+
+    def test_process_batch_without_timings(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result = process_batch([DATA / "smallhand.html"], DATA, Path(temp_dir))
+        self.assertIsNone(result.timings)
+
+
+def _hands(files):
+    from html_parser import iter_hands_from_html
+    return [hand for file in files for hand in iter_hands_from_html(file.read_text(encoding="utf-8"))]
+
+
+if __name__ == "__main__":
+    unittest.main()
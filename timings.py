@@ -0,0 +1,243 @@
+"""
+Optional per-stage timing of the conversion pipeline.
+
+Each file is measured by a StageTimer: the code of every stage runs inside stage(name), and a stage's time
+excludes the stages nested in it, so the stages of a file add up to its wall time. Workers merge their files
+into a PipelineTimings, which only keeps totals and histograms so it stays small however many files it holds,
+and the main process merges those of every batch into the summary.
+
+Without an active timer, stage() returns a shared no-op context and costs next to nothing.
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List
+
+READ = "read"  # Reading the input file
+HTML = "html"  # Extracting the rows of the hand history table
+DETAILED_INFO = "detailed_info"  # Building the hand and its players from the cells of a row
+HAND_HISTORY = "hand_history"  # parse_hand_history of each player's betting actions
+CONVERT = "convert"  # Formatting the PokerStars text of a hand and streaming it to the output
+WRITE = "write"  # Writing, compressing and moving the output in place
+OTHER = "other"  # Everything else, eg. the manifest checksum
+STAGES = [READ, HTML, DETAILED_INFO, HAND_HISTORY, CONVERT, WRITE, OTHER]
+
+# Histogram buckets grow by 2^(1/8), so percentiles are within 9% of the measured time
+_BUCKET_BASE = 1e-6
+_BUCKETS_PER_DOUBLING = 8
+
+
+@dataclass
+class Histogram:
+    """Counts of durations in logarithmic buckets, which can be merged without keeping every sample."""
+    counts: Dict[int, int] = field(default_factory=dict)  # bucket -> number of durations
+    count: int = 0
+
+    def add(self, seconds: float):
+        bucket = 0
+        if seconds > _BUCKET_BASE:
+            bucket = math.ceil(math.log2(seconds / _BUCKET_BASE) * _BUCKETS_PER_DOUBLING)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+
+    def merge(self, other: "Histogram"):
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += other.count
+
+    def percentile(self, q: float) -> float | None:
+        """
+        Returns:
+        - The upper bound of the bucket holding the q-th percentile (0 < q <= 100), in seconds,
+          or None without any durations.
+        """
+        if not self.count:
+            return None
+
+        rank = q / 100 * self.count
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return _BUCKET_BASE * 2 ** (bucket / _BUCKETS_PER_DOUBLING)
+        return _BUCKET_BASE * 2 ** (max(self.counts) / _BUCKETS_PER_DOUBLING)
+
+
+@dataclass
+class StageStats:
+    seconds: float = 0.0  # Total time spent in the stage
+    calls: int = 0  # Number of times the stage was entered, eg. once per hand or per player
+    per_file: Histogram = field(default_factory=Histogram)  # Time spent in the stage by each file
+
+
+class _Stage:
+    __slots__ = ("timer", "name")
+
+    def __init__(self, timer: "StageTimer", name: str):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.timer._push(self.name)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.timer._pop()
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class StageTimer:
+    """Measures the exclusive time and the number of calls of the stages of one file."""
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self._stages: Dict[str, _Stage] = {}
+        self._stack: List[str] = []
+        self._mark = 0.0
+
+    def stage(self, name: str) -> _Stage:
+        stage = self._stages.get(name)
+        if stage is None:
+            stage = self._stages[name] = _Stage(self, name)
+        return stage
+
+    def _push(self, name: str):
+        now = time.perf_counter()
+        if self._stack:
+            # The enclosing stage stops counting while the nested one runs
+            top = self._stack[-1]
+            self.seconds[top] = self.seconds.get(top, 0.0) + now - self._mark
+        self._stack.append(name)
+        self._mark = now
+
+    def _pop(self):
+        now = time.perf_counter()
+        name = self._stack.pop()
+        self.seconds[name] = self.seconds.get(name, 0.0) + now - self._mark
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self._mark = now
+
+    @property
+    def total(self) -> float:
+        return sum(self.seconds.values())
+
+
+_local = threading.local()
+_active_lock = threading.Lock()
+_active_timers = 0  # Lets stage() skip the thread local lookup while nothing is measured
+
+
+def stage(name: str):
+    """
+    A context manager charging the time spent in it to a stage of the file being measured on this thread.
+    """
+    if not _active_timers:
+        return _NULL_STAGE
+    timer = getattr(_local, "timer", None)
+    return _NULL_STAGE if timer is None else timer.stage(name)
+
+
+@contextmanager
+def measuring(timer: StageTimer | None) -> Iterator[StageTimer | None]:
+    """
+    Makes a StageTimer the one stage() charges on this thread. Time outside any stage is charged to OTHER.
+    Measuring None does nothing, so callers don't need a separate code path when timings are off.
+    """
+    global _active_timers
+    if timer is None:
+        yield None
+        return
+
+    previous = getattr(_local, "timer", None)
+    _local.timer = timer
+    with _active_lock:
+        _active_timers += 1
+    timer._push(OTHER)
+    try:
+        yield timer
+    finally:
+        timer._pop()
+        with _active_lock:
+            _active_timers -= 1
+        _local.timer = previous
+
+
+@dataclass
+class PipelineTimings:
+    """Stage timings of many files, as sent back by the workers and merged in the main process."""
+    stages: Dict[str, StageStats] = field(default_factory=dict)
+    per_file: Histogram = field(default_factory=Histogram)  # Wall time of each file
+    files: int = 0
+    seconds: float = 0.0  # Total wall time of the files
+
+    def add_file(self, timer: StageTimer):
+        for name, seconds in timer.seconds.items():
+            stats = self._stats(name)
+            stats.seconds += seconds
+            stats.calls += timer.calls.get(name, 0)
+            stats.per_file.add(seconds)
+        total = timer.total
+        self.per_file.add(total)
+        self.seconds += total
+        self.files += 1
+
+    def add(self, name: str, seconds: float, calls: int = 1):
+        """Adds time that doesn't belong to a single file, eg. bundled hands written by the main process."""
+        stats = self._stats(name)
+        stats.seconds += seconds
+        stats.calls += calls
+
+    def merge(self, other: "PipelineTimings"):
+        for name, other_stats in other.stages.items():
+            stats = self._stats(name)
+            stats.seconds += other_stats.seconds
+            stats.calls += other_stats.calls
+            stats.per_file.merge(other_stats.per_file)
+        self.per_file.merge(other.per_file)
+        self.files += other.files
+        self.seconds += other.seconds
+
+    def _stats(self, name: str) -> StageStats:
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageStats()
+        return stats
+
+    def summary(self, wall_seconds: float) -> str:
+        """
+        Returns:
+        - A table of the total time, share, calls and per file p50/p95/p99 of every stage,
+          followed by the overall throughput.
+        """
+        stage_seconds = sum(stats.seconds for stats in self.stages.values()) or 1.0
+        names = [name for name in STAGES if name in self.stages] + sorted(set(self.stages) - set(STAGES))
+
+        lines = [f"{'stage':<14}{'total s':>10}{'share':>8}{'calls':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"]
+        for name in names:
+            stats = self.stages[name]
+            lines.append(f"{name:<14}{stats.seconds:>10.3f}{stats.seconds / stage_seconds:>8.1%}{stats.calls:>10}"
+                         + _percentiles(stats.per_file))
+        lines.append(f"{'per file':<14}{self.seconds:>10.3f}{'':>8}{self.files:>10}" + _percentiles(self.per_file))
+
+        rate = self.files / wall_seconds if wall_seconds > 0 else 0.0
+        lines.append(f"{self.files} files in {wall_seconds:.2f}s, {rate:.1f} files/sec")
+        return "\n".join(lines)
+
+
+def _percentiles(histogram: Histogram) -> str:
+    values = [histogram.percentile(q) for q in (50, 95, 99)]
+    return "".join(f"{'-':>10}" if value is None else f"{value * 1000:>10.3f}" for value in values)
@@ -1,10 +1,7 @@
 from datetime import datetime
-from pathlib import Path
+from pathlib import Path, PurePath
 
-import pytz
-import re
-import os
-import fnmatch
+from kst import format_kst, format_korean_timestamp, parse_filename_stamp
 
 def convert_korean_datetime_with_timezone(datetime_str):
     """
@@ -16,47 +13,61 @@ def convert_korean_datetime_with_timezone(datetime_str):
     Returns:
         str: The formatted datetime string in 'YYYY/MM/DD HH:MM:SS ZZZ' with timezone.
     """
-    # Replace Korean AM/PM indicators
-    datetime_str = re.sub(r"오전", "AM", datetime_str)
-    datetime_str = re.sub(r"오후", "PM", datetime_str)
-    dt_obj = datetime.strptime(datetime_str, "%Y-%m-%d %p %I:%M:%S")
-
-    return format_korean_date(dt_obj)
+    return format_korean_timestamp(datetime_str)
 
 def format_korean_date(dt_obj: datetime):
-    # Parse the datetime in Korea Standard Time (KST)
-    kst = pytz.timezone("Asia/Seoul")
-    dt_kst = kst.localize(dt_obj)  # Localize to KST
-
     # Format output in 'YYYY/MM/DD HH:MM:SS ZZZ' (e.g., 2025/02/08 00:00:00 KST)
-    return dt_kst.strftime("%Y/%m/%d %H:%M:%S %Z")
+    return format_kst(dt_obj)
+
+def find_files(directory, pattern="*.html", archives=True, order=None, workers=1):
+    """
+    Yields the files matching the pattern below a directory, as DiscoveredFile objects that carry their size and mtime.
+
+    With archives, the matching members of the zip and tar archives found along the way are yielded too,
+    as ArchiveMember objects, and the directory itself may be an archive.
+    With order LARGEST_FIRST the whole tree is scanned first and the files (and archives) are yielded by size,
+    otherwise (WALK, the default) they are yielded as the directories are scanned.
+    """
+    # Only the main process looks for files, the workers import this module for the date helpers
+    from archives import is_archive, iter_archive
+    from discovery import LARGEST_FIRST, largest_first, scan_files
 
-def find_files(directory, pattern="*.html"):
     directory = Path(directory)
-    for root, _, files in os.walk(directory):
-        for filename in fnmatch.filter(files, pattern):
-            yield Path(root) / filename
+    if archives and is_archive(directory):
+        yield from iter_archive(directory, pattern)
+        return
+
+    files = scan_files(directory, pattern, archives, workers)
+    if order == LARGEST_FIRST:
+        files = largest_first(files)
+
+    for file in files:
+        if file.is_archive:
+            yield from iter_archive(file.path, pattern)
+        else:
+            yield file
 
 
-def extract_datetime_from_filename(filename: Path):
+def extract_datetime_from_filename(filename):
     """
     Extracts the ISO-formatted datetime from a filename.
-    Supports both string and Path objects.
+    Supports string, Path and ArchiveMember objects, and member names with folders.
 
     Parameters:
-        filename (str or Path): The filename containing the datetime stamp.
+        filename (str, Path or ArchiveMember): The filename containing the datetime stamp.
 
     Returns:
         datetime: A datetime object representing the extracted timestamp.
     """
-    filename = filename.stem  # Ensure it's a Path object and remove the extension
+    # Remove the folders and the extension
+    filename = filename.stem if hasattr(filename, "stem") else PurePath(filename).stem
 
     try:
         # Extract the last part after '_', which contains the ISO datetime
         datetime_part = filename.split("_")[-1]
 
         # Directly parse the datetime
-        return datetime.strptime(datetime_part, "%Y-%m-%dT%H-%M-%S")
+        return parse_filename_stamp(datetime_part)
 
     except ValueError:
         return None  # Return None if parsing fails